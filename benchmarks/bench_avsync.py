@@ -0,0 +1,126 @@
+"""Harness de sincronização A/V contra um sink de áudio falso.
+
+FakeAudioSink imita AudioPlayer.position(): o "dispositivo" consome amostras em blocos
+com um relógio levemente desviado do relógio do sistema (como placas de som reais) e
+acompanha mudanças de velocidade. O harness roda o agendamento antigo (relógio de parede)
+e o novo (VideoScheduler + MediaClock) com custo de renderização aleatório e mede o
+desvio entre o pts de cada frame exibido e a posição do áudio.
+
+Uso:
+    python benchmarks/bench_avsync.py [--seconds 6] [--fps 30] [--skew 0.02]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+
+
+class FakeAudioSink:
+    supports_speed = True
+
+    def __init__(self, rate=44100, chunk=1024, skew=0.02, latency=0.03):
+        self.rate, self.chunk, self.skew, self.latency = rate, chunk, skew, latency
+        self.speed = 1.0
+        self._base_pos = 0.0
+        self._base_t = time.perf_counter()
+
+    def _raw(self):
+        return self._base_pos + (time.perf_counter() - self._base_t) * (1.0 + self.skew) * self.speed
+
+    def position(self):
+        frames = int(self._raw() * self.rate) // self.chunk * self.chunk
+        return max(0.0, frames / self.rate - self.latency * self.speed)
+
+    def set_speed(self, speed):
+        self._base_pos = self._raw()
+        self._base_t = time.perf_counter()
+        self.speed = speed
+
+
+def speed_at(elapsed, seconds):
+    # Trecho central em 1.5x para exercitar mudança de velocidade
+    return 1.5 if seconds / 3 <= elapsed < 2 * seconds / 3 else 1.0
+
+
+def render_cost(rng):
+    time.sleep(rng.uniform(0.002, 0.030))
+
+
+def run_legacy(sink, fps, seconds, rng):
+    """Agendamento antigo: next_frame_time no relógio de parede, velocidade só no vídeo."""
+    base_dt = 1.0 / fps
+    frame_no = 0
+    drifts = []
+    start = next_frame_time = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        speed = speed_at(time.perf_counter() - start, seconds)
+        sink.set_speed(1.0)  # áudio antigo não muda de velocidade
+        target_dt = base_dt / speed
+        now = time.perf_counter()
+        if now < next_frame_time:
+            time.sleep(next_frame_time - now)
+        else:
+            behind = now - next_frame_time
+            if behind > target_dt:
+                skip_n = min(int(behind / target_dt), 5)
+                frame_no += skip_n
+                next_frame_time += target_dt * skip_n
+        next_frame_time += target_dt
+        render_cost(rng)
+        drifts.append(frame_no / fps - sink.position())
+        frame_no += 1
+    return drifts
+
+
+def run_master_clock(sink, fps, seconds, rng, tolerance):
+    clock = reprodT.MediaClock(sink)
+    sched = reprodT.VideoScheduler(clock, fps, tolerance)
+    drifts = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        speed = speed_at(time.perf_counter() - start, seconds)
+        if speed != clock.speed:
+            clock.set_speed(speed)
+        wait, drop = sched.plan()
+        if wait > 0:
+            time.sleep(min(wait, 0.05))
+            continue
+        if drop:
+            sched.skip(drop)
+        render_cost(rng)
+        drifts.append(sched.frame_no / fps - sink.position())
+        sched.present()
+    return drifts, sched
+
+
+def report(name, drifts):
+    a = [abs(d) for d in drifts]
+    print(f"{name:14} frames {len(drifts):5d}  drift final {drifts[-1] * 1000:8.1f} ms  "
+          f"máx {max(a) * 1000:8.1f} ms  médio {sum(a) / len(a) * 1000:7.1f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=6.0)
+    ap.add_argument("--fps", type=float, default=30.0)
+    ap.add_argument("--skew", type=float, default=0.02)
+    ap.add_argument("--tolerance-ms", type=float, default=reprodT.AV_SYNC_TOLERANCE * 1000)
+    args = ap.parse_args()
+
+    tol = args.tolerance_ms / 1000.0
+    report("relógio parede", run_legacy(FakeAudioSink(skew=args.skew), args.fps, args.seconds, random.Random(1)))
+    drifts, sched = run_master_clock(FakeAudioSink(skew=args.skew), args.fps, args.seconds, random.Random(1), tol)
+    report("relógio áudio", drifts)
+    print(f"descartes para sincronizar: {sched.dropped}  tolerância: {args.tolerance_ms:.0f} ms")
+    # Desvio nos frames exibidos deve ficar dentro da tolerância + um frame
+    if max(abs(d) for d in drifts[5:]) > tol + 1.0 / args.fps:
+        print("ERRO: desvio acima da tolerância com relógio mestre de áudio")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark do damage tracking por célula (_render_frame_damage) x cache de linhas inteiras.
+
+Cenários sintéticos: "apresentador" (fundo estático, pequena região em movimento) e
+gradiente com ruído (quase tudo muda). Mede bytes por frame e frames/s, e confere com
+um emulador de terminal que a tela final é a mesma nos dois caminhos.
+
+Uso:
+    python benchmarks/bench_damage.py [--cols 120] [--frames 60]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+from bench_render import synthetic_frames  # noqa: E402
+from vt import Screen  # noqa: E402
+
+
+def talking_head(w, h, n, seed=0):
+    """Fundo estático com uma região central que muda a cada frame."""
+    rng = np.random.default_rng(seed)
+    bg = synthetic_frames(w, h, 1, seed)[0]
+    frames = []
+    for i in range(n):
+        f = bg.copy()
+        y0, x0 = h // 3, w // 3 + (i % 5)
+        f[y0:y0 + h // 6, x0:x0 + w // 8] = rng.integers(0, 256, size=3, dtype=np.uint8)
+        frames.append(f)
+    return frames
+
+
+def run_lines(frames, w, h, truecolor, pads):
+    prev, outs = None, []
+    t0 = time.perf_counter()
+    for f in frames:
+        out, prev = reprodT._render_frame(f, w, h, truecolor, prev, *pads, encoder="str")
+        outs.append(out)
+    return time.perf_counter() - t0, outs
+
+
+def run_damage(frames, w, h, truecolor, pads):
+    prev, outs = None, []
+    t0 = time.perf_counter()
+    for f in frames:
+        out, prev = reprodT._render_frame_damage(f, w, h, truecolor, prev, *pads, encoder="str")
+        outs.append(out)
+    return time.perf_counter() - t0, outs
+
+
+def check_same_screen(outs_a, outs_b, cols, rows):
+    sa, sb = Screen(cols, rows), Screen(cols, rows)
+    for a, b in zip(outs_a, outs_b):
+        sa.feed(a)
+        sb.feed(b)
+        if sa.grid != sb.grid:
+            return False
+    return True
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cols", type=int, default=120)
+    ap.add_argument("--frames", type=int, default=60)
+    args = ap.parse_args()
+
+    w, h = reprodT._compute_scaled_wh(16, 9, args.cols)
+    pads = (4, 2)
+    term = (w + 2 * pads[0], h // 2 + 2 * pads[1])
+    scenarios = {
+        "apresentador": talking_head(w, h, args.frames),
+        "ruído": synthetic_frames(w, h, args.frames),
+    }
+    for name, frames in scenarios.items():
+        for truecolor in (True, False):
+            mode = "truecolor" if truecolor else "256"
+            t_l, out_l = run_lines(frames, w, h, truecolor, pads)
+            t_d, out_d = run_damage(frames, w, h, truecolor, pads)
+            if not check_same_screen(out_l, out_d, *term):
+                print(f"[{name}/{mode}] ERRO: tela final difere entre os renderers")
+                sys.exit(1)
+            # O primeiro frame é completo nos dois casos; compara os frames seguintes
+            bl = sum(len(o.encode()) for o in out_l[1:]) / max(1, len(frames) - 1)
+            bd = sum(len(o.encode()) for o in out_d[1:]) / max(1, len(frames) - 1)
+            print(f"[{name:12} {mode:9}] linhas: {bl:9.0f} B/frame {len(frames) / t_l:7.1f} fps | "
+                  f"damage: {bd:9.0f} B/frame {len(frames) / t_d:7.1f} fps | {bl / max(bd, 1):5.1f}x menos bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Benchmark e verificação das saídas gráficas (KittyBackend e SixelBackend).
+
+Cada frame codificado é capturado e decodificado por um decodificador de referência
+independente (parser do APC do Kitty + base64 + zlib; interpretador de Sixel com paleta,
+repetições, $ e -). A imagem decodificada precisa bater com a entrada: RGB idêntico no Kitty,
+índices de paleta idênticos (e cores dentro do arredondamento de 0-100%) no Sixel.
+Depois mede frames/s de codificação e bytes por frame.
+
+Uso:
+    python benchmarks/bench_graphics.py [--cols 120] [--frames 30] [--cell 8 16]
+"""
+import argparse
+import base64
+import os
+import re
+import sys
+import time
+import zlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+from bench_render import synthetic_frames  # noqa: E402
+
+
+def decode_kitty(data):
+    """Decodifica o stream do KittyBackend: retorna (chaves de controle do 1º bloco, RGB)."""
+    blocks = re.findall(rb"\x1b_G([^;]*);([^\x1b]*)\x1b\\", data)
+    assert blocks, "nenhum comando APC do Kitty"
+    keys = dict(kv.split(b"=", 1) for kv in blocks[0][0].split(b","))
+    payload = b""
+    for i, (ctl, chunk) in enumerate(blocks):
+        more = dict(kv.split(b"=", 1) for kv in ctl.split(b",")).get(b"m", b"0")
+        assert more == (b"1" if i < len(blocks) - 1 else b"0"), "m= inconsistente"
+        assert len(chunk) <= 4096, "bloco base64 maior que 4096"
+        payload += chunk
+    raw = base64.b64decode(payload)
+    if keys.get(b"o") == b"z":
+        raw = zlib.decompress(raw)
+    w, h = int(keys[b"s"]), int(keys[b"v"])
+    return keys, np.frombuffer(raw, dtype=np.uint8).reshape(h, w, 3)
+
+
+def decode_sixel(data):
+    """Interpretador de Sixel: retorna (registradores (H, W), paleta {reg: (r%, g%, b%)})."""
+    start = data.index(b"\x1bP")
+    body = data[data.index(b"q", start) + 1:data.rindex(b"\x1b\\")]
+    m = re.match(rb'"(\d+);(\d+);(\d+);(\d+)', body)
+    W, H = int(m.group(3)), int(m.group(4))
+    body = body[m.end():]
+    img = np.full((H + 6, W), -1, dtype=np.int32)
+    pal = {}
+    x = y = 0
+    reg = 0
+    i = 0
+    while i < len(body):
+        c = body[i]
+        if c == ord("#"):
+            m = re.match(rb"#(\d+)(?:;(\d+);(\d+);(\d+);(\d+))?", body[i:])
+            reg = int(m.group(1))
+            if m.group(2):
+                pal[reg] = tuple(int(m.group(k)) for k in (3, 4, 5))
+            i += m.end()
+            continue
+        if c == ord("!"):
+            m = re.match(rb"!(\d+)(.)", body[i:], re.S)
+            n, ch = int(m.group(1)), m.group(2)[0]
+            i += m.end()
+        elif c == ord("$"):
+            x = 0
+            i += 1
+            continue
+        elif c == ord("-"):
+            x = 0
+            y += 6
+            i += 1
+            continue
+        else:
+            n, ch = 1, c
+            i += 1
+        v = ch - 63
+        for k in range(6):
+            if v >> k & 1:
+                img[y + k, x:x + n] = reg
+        x += n
+    return img[:H], pal
+
+
+def verify(w, h, frames, cell):
+    kitty = reprodT.KittyBackend(cell_px=cell, image_id=7)
+    sixel = reprodT.SixelBackend(cell_px=cell)
+    pal = reprodT._sixel_palette()
+    for f in frames[:3]:
+        keys, rgb = decode_kitty(kitty.frame(f, 10, 5))
+        assert keys[b"i"] == b"7" and keys[b"p"] == b"1", "id de imagem/posicionamento não reusado"
+        assert np.array_equal(rgb, f), "Kitty: RGB decodificado difere"
+        regs, spal = decode_sixel(sixel.frame(f, 10, 5))
+        assert (regs >= 0).all(), "Sixel: pixel sem cor"
+        idx = reprodT._ansi256_lut()[reprodT._pack_rgb(f)]
+        used = np.flatnonzero(np.bincount(idx.ravel(), minlength=256))
+        assert np.array_equal(used[regs], idx), "Sixel: índices de paleta diferem"
+        got = np.array([spal[r] for r in range(len(used))]) * 255 / 100
+        assert np.abs(got - pal[used]).max() <= 255 / 100 + 1e-9, "Sixel: cores da paleta diferem"
+    print(f"decodificadores de referência: Kitty e Sixel idênticos à entrada ({w}x{h} px)")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cols", type=int, default=120)
+    ap.add_argument("--frames", type=int, default=30)
+    ap.add_argument("--cell", type=int, nargs=2, default=(8, 16), metavar=("W", "H"),
+                    help="pixels por célula do terminal")
+    args = ap.parse_args()
+
+    cols = args.cols
+    _, rows2 = reprodT._compute_scaled_wh(16, 9, cols)
+    rows = rows2 // 2
+    cell = tuple(args.cell)
+    for backend in (reprodT.KittyBackend(cell_px=cell), reprodT.SixelBackend(cell_px=cell)):
+        cx, cy = backend.cell_pixels
+        w, h = cols * cx, rows * cy
+        frames = synthetic_frames(w, h, args.frames)
+        if backend.name == "kitty":
+            verify(w, h, frames, cell)
+        backend.frame(frames[0], cols, rows)
+        nbytes = 0
+        t0 = time.perf_counter()
+        for f in frames:
+            nbytes += len(backend.frame(f, cols, rows))
+        dt = time.perf_counter() - t0
+        print(f"{backend.name:6} {w}x{h} px  {len(frames) / dt:7.1f} frames/s  "
+              f"{dt / len(frames) * 1000:6.2f} ms/frame  {nbytes / len(frames) / 1024:8.1f} KB/frame")
+    # Referência: renderer ANSI com o mesmo número de células
+    w, h = cols, rows * 2
+    frames = synthetic_frames(w, h, args.frames)
+    prev, nbytes = None, 0
+    t0 = time.perf_counter()
+    for f in frames:
+        out, prev = reprodT._render_frame_damage(f, w, h, True, prev)
+        nbytes += len(out)
+    dt = time.perf_counter() - t0
+    print(f"{'ansi':6} {w}x{h} px  {len(frames) / dt:7.1f} frames/s  "
+          f"{dt / len(frames) * 1000:6.2f} ms/frame  {nbytes / len(frames) / 1024:8.1f} KB/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark da entrega de frames: pipeline em threads (FrameRing + renderização no processo
+principal) x RenderProcess (leitura do pipe e renderização num processo separado, bytes
+prontos num anel em memória compartilhada).
+
+Enquanto os frames são consumidos o mais rápido possível, uma thread de sondagem faz o que
+as threads de áudio fazem (dorme alguns ms sob um lock e acorda) e mede o atraso de cada
+despertar: é a disputa pelo GIL que o processo separado deve eliminar.
+
+Uso:
+    python benchmarks/bench_handoff.py [video.mp4] [--cols 120] [--frames 300] [--period 5]
+
+Sem vídeo usa o primeiro de source/uploads/video. Precisa do ffmpeg (TERMPLAYER_FFMPEG).
+"""
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+
+
+class WakeProbe:
+    """Thread que dorme period segundos sob um lock e anota o atraso de cada despertar."""
+    def __init__(self, period):
+        self.period = period
+        self.late = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                t0 = time.perf_counter()
+                time.sleep(self.period)
+                self.late.append(time.perf_counter() - t0 - self.period)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self):
+        a = np.array(self.late or [0.0]) * 1000
+        return {"wakeups": len(self.late), "late_p50_ms": float(np.percentile(a, 50)),
+                "late_p99_ms": float(np.percentile(a, 99)), "late_max_ms": float(a.max())}
+
+
+def run_threads(path, w, h, fps, frames, truecolor):
+    proc = reprodT._build_ffmpeg_video_proc(path, w, h, fps)
+    ring = reprodT.FrameRing(proc, w, h).start()
+    prev, n, nbytes, t0 = None, 0, 0, None
+    try:
+        while n < frames:
+            item = ring.get()
+            if item is None:
+                break
+            slot, rgb = item
+            try:
+                fg, bg = reprodT._frame_cells(rgb, w, h, truecolor)
+                out = reprodT._compose_damage(fg, bg, truecolor, prev, encoder="bytes")
+                prev = (fg, bg)
+            finally:
+                ring.release(slot)
+            nbytes += len(out)
+            n += 1
+            t0 = t0 or time.perf_counter()
+    finally:
+        ring.stop()
+        proc.kill()
+        proc.wait()
+    return n, nbytes, time.perf_counter() - t0 if t0 else 0.0
+
+
+def run_process(path, w, h, fps, frames, truecolor):
+    worker = reprodT.RenderProcess(reprodT._payload_budget(w, h // 2))
+    n, nbytes, t0 = 0, 0, None
+    try:
+        worker.open(path, w, h, fps, 0.0, 0, truecolor)
+        worker.wait_ready()
+        while n < frames:
+            item = worker.get()
+            if item is None:
+                break
+            nbytes += len(item[1])
+            n += 1
+            t0 = t0 or time.perf_counter()
+    finally:
+        worker.close()
+    return n, nbytes, time.perf_counter() - t0 if t0 else 0.0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("video", nargs="?")
+    ap.add_argument("--cols", type=int, default=120)
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--fps", type=int, default=30, help="taxa pedida ao ffmpeg (os frames são consumidos sem pausa)")
+    ap.add_argument("--period", type=float, default=5.0, help="sono da thread de sondagem em ms")
+    args = ap.parse_args()
+
+    if not reprodT._find_ffmpeg():
+        print("ffmpeg não encontrado")
+        sys.exit(1)
+    path = args.video or next(iter(sorted(glob.glob(os.path.join(reprodT.BASE_DIR, "uploads", "video", "*.mp4")))), None)
+    if not path:
+        print("nenhum vídeo informado nem em source/uploads/video")
+        sys.exit(1)
+    info = reprodT._ffprobe_info(path) or {}
+    w, h = reprodT._compute_scaled_wh(info.get("width") or 16, info.get("height") or 9, args.cols)
+    print(f"{os.path.basename(path)}: {w}x{h}, até {args.frames} frames, sondagem a cada {args.period:g} ms")
+    for truecolor in (True, False):
+        counts = {}
+        for name, fn in (("threads", run_threads), ("processo", run_process)):
+            # fps contado a partir do 1º frame: não inclui subir o ffmpeg nem o processo
+            with WakeProbe(args.period / 1000) as probe:
+                n, nbytes, dt = fn(path, w, h, args.fps, args.frames, truecolor)
+            counts[name] = (n, nbytes)
+            s = probe.summary()
+            print(f"[{'truecolor' if truecolor else '256':9}] {name:8} {(n - 1) / dt if dt else 0.0:7.1f} fps  {nbytes / max(n, 1) / 1024:7.1f} KiB/frame"
+                  f"  atraso do despertar p50 {s['late_p50_ms']:6.2f} ms  p99 {s['late_p99_ms']:6.2f} ms"
+                  f"  máx {s['late_max_ms']:6.2f} ms")
+        if counts["processo"] != counts["threads"]:
+            # Os dois caminhos têm de entregar os mesmos frames (inclusive deltas vazios de cenas paradas)
+            print(f"ERRO: frames/bytes diferentes entre threads {counts['threads']} e processo {counts['processo']}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark da exibição de imagens: decodificação + LANCZOS do original inteiro (como antes)
+x decodificação reduzida (draft do JPEG / reducing_gap) x acerto no cache de imagens renderizadas.
+
+Uso:
+    python benchmarks/bench_image.py [imagem ...] [--cols 120] [--repeat 5]
+
+Sem imagens, gera uma foto sintética de 6000x4000 em JPEG e PNG num diretório temporário.
+Para cada imagem imprime o tempo de cada caminho e o PSNR do redimensionamento reduzido contra
+o de referência (cache isolado num diretório temporário; o cache do usuário não é tocado).
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+
+
+def synthetic_photo(path, w=6000, h=4000, seed=0):
+    """Gradientes suaves com textura e ruído de sensor, salvos no formato da extensão."""
+    from PIL import Image
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+    r = 128 + 100 * np.sin(xx / 700) * np.cos(yy / 500)
+    g = 128 + 100 * np.sin((xx + yy) / 900)
+    b = 128 + 60 * np.cos(xx / 90) * np.sin(yy / 130)
+    img = np.stack([r, g, b], axis=-1) + rng.normal(0, 6, (h, w, 3)).astype(np.float32)
+    Image.fromarray(np.clip(img, 0, 255).astype(np.uint8)).save(path, quality=90)
+
+
+def reference_load(path, cols, max_rows, cx=1, cy=2):
+    """Caminho antigo: LANCZOS direto do tamanho original."""
+    from PIL import Image
+    img = Image.open(path)
+    width = max(2, int(cols))
+    height = max(1, int((img.height * width) / img.width / 2))
+    if max_rows and max_rows > 0:
+        height = min(height, int(max_rows))
+    img = img.resize((width * cx, height * cy), Image.Resampling.LANCZOS).convert("RGB")
+    return np.array(img, dtype=np.uint8), width, height
+
+
+def psnr(a, b):
+    mse = np.mean((a.astype(np.float64) - b) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255 ** 2 / mse)
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("images", nargs="*")
+    ap.add_argument("--cols", type=int, default=120)
+    ap.add_argument("--rows", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_image_")
+    reprodT.IMAGE_CACHE_DIR = os.path.join(tmp, "cache")
+    images = args.images
+    if not images:
+        images = [os.path.join(tmp, "foto.jpg"), os.path.join(tmp, "foto.png")]
+        for p in images:
+            synthetic_photo(p)
+    truecolor = True
+    term = (args.cols, 50)
+    for path in images:
+        ref_t, (ref, _, _) = best(lambda: reference_load(path, args.cols, args.rows), args.repeat)
+        new_t, (arr, _, _) = best(lambda: reprodT._load_image(path, args.cols, args.rows), args.repeat)
+        miss_t, out = best(lambda: reprodT._image_frame(path, args.cols, args.rows, "half", None, truecolor, term),
+                           args.repeat)
+        cache_path = reprodT._image_cache_path(path, args.cols, args.rows, truecolor, "half", "ansi", term)
+        reprodT._store_image_frame(cache_path, out, 64)
+        hit_t, hit = best(lambda: reprodT._load_image_frame(cache_path), args.repeat)
+        if hit != out:
+            print(f"{path}: ERRO: o cache devolveu bytes diferentes")
+            sys.exit(1)
+        print(f"{os.path.basename(path)}: {ref.shape[1]}x{ref.shape[0]} px, {len(out) / 1024:.0f} KiB ANSI")
+        print(f"  decodificação + LANCZOS do original: {ref_t * 1000:8.1f} ms")
+        print(f"  decodificação reduzida + LANCZOS:    {new_t * 1000:8.1f} ms  ({ref_t / new_t:.1f}x,"
+              f" PSNR {psnr(arr, ref):.1f} dB)")
+        print(f"  frame completo sem cache:            {miss_t * 1000:8.1f} ms")
+        print(f"  acerto no cache:                     {hit_t * 1000:8.2f} ms")
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
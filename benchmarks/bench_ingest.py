@@ -0,0 +1,117 @@
+"""Benchmark/verificação da ingestão de frames rawvideo.
+
+Compara o caminho antigo (_read_exact + np.frombuffer) com a leitura por readinto
+em buffer reutilizável (FrameReader) e com o anel de decodificação (FrameRing).
+Um subprocesso gera frames sintéticos determinísticos no stdout, como o ffmpeg faria.
+
+Uso:
+    python benchmarks/bench_ingest.py [--cols 120] [--frames 600]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+
+PRODUCER = r"""
+import sys
+n, size = int(sys.argv[1]), int(sys.argv[2])
+out = sys.stdout.buffer
+base = bytes(range(256)) * (size // 256 + 1)
+for i in range(n):
+    k = i % 256
+    out.write(base[k:k + size])
+"""
+
+
+def spawn(n, size):
+    return subprocess.Popen([sys.executable, "-c", PRODUCER, str(n), str(size)],
+                            stdout=subprocess.PIPE, bufsize=0)
+
+
+def expected_frame(i, w, h):
+    size = w * h * 3
+    return (np.arange(i % 256, i % 256 + size) % 256).astype(np.uint8).reshape(h, w, 3)
+
+
+def ingest_old(proc, w, h):
+    size = w * h * 3
+    while True:
+        raw = reprodT._read_exact(proc, size)
+        if raw is None:
+            return
+        yield np.frombuffer(raw, dtype=np.uint8).reshape((h, w, 3))
+
+
+def ingest_reader(proc, w, h):
+    reader = reprodT.FrameReader(proc.stdout, w, h)
+    while True:
+        f = reader.read()
+        if f is None:
+            return
+        yield f
+
+
+def ingest_ring(proc, w, h):
+    ring = reprodT.FrameRing(proc, w, h).start()
+    while True:
+        item = ring.get()
+        if item is None:
+            return
+        slot, f = item
+        yield f
+        ring.release(slot)
+
+
+def verify(fn, w, h, n):
+    proc = spawn(n, w * h * 3)
+    count = 0
+    for i, f in enumerate(fn(proc, w, h)):
+        if not np.array_equal(f, expected_frame(i, w, h)):
+            raise SystemExit(f"{fn.__name__}: frame {i} difere do esperado")
+        count += 1
+    proc.wait()
+    if count != n:
+        raise SystemExit(f"{fn.__name__}: {count} frames lidos, esperado {n}")
+
+
+def measure(fn, w, h, n):
+    proc = spawn(n, w * h * 3)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    checksum = 0
+    for f in fn(proc, w, h):
+        checksum += int(f[0, 0, 0])
+    dt = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    proc.wait()
+    return dt, peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cols", type=int, default=120)
+    ap.add_argument("--frames", type=int, default=600)
+    args = ap.parse_args()
+
+    w, h = reprodT._compute_scaled_wh(16, 9, args.cols)
+    size = w * h * 3
+    for fn in (ingest_old, ingest_reader, ingest_ring):
+        verify(fn, w, h, 40)
+    print("conteúdo idêntico ao caminho antigo (_read_exact) em todos os modos")
+    print(f"frame {w}x{h} ({size} bytes), {args.frames} frames")
+    for fn in (ingest_old, ingest_reader, ingest_ring):
+        dt, peak = measure(fn, w, h, args.frames)
+        mbs = size * args.frames / dt / 1e6
+        print(f"{fn.__name__:14} {args.frames / dt:9.1f} fps  {mbs:8.1f} MB/s  pico alocado {peak / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark da latência menu → primeiro frame com e sem o cache de metadados.
+
+Reproduz o caminho do menu (probe do preset automático + probe de play_video_file),
+inicia o ffmpeg e mede até o primeiro frame decodificado, para cada vídeo em
+source/uploads/video. "frio" usa um cache vazio; "quente" reaproveita o cache gravado.
+O cache de verdade (source/media_cache.json) não é tocado.
+
+Uso:
+    python benchmarks/bench_probe.py [--runs 5] [--cols 120]
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+
+
+def menu_to_first_frame(path, cols):
+    t0 = time.perf_counter()
+    reprodT._ffprobe_info(path)          # preset automático no menu
+    info = reprodT._ffprobe_info(path)   # play_video_file
+    if info:
+        w, h = reprodT._compute_scaled_wh(info["width"], info["height"], cols)
+    else:
+        w, h = reprodT._probe_scaled_dimensions(path, cols) or reprodT._compute_scaled_wh(0, 0, cols)
+    t_probe = time.perf_counter() - t0
+    proc = reprodT._build_ffmpeg_video_proc(path, w, h, 30)
+    try:
+        frame = reprodT.FrameReader(proc.stdout, w, h).read()
+    finally:
+        proc.kill()
+        proc.wait()
+    if frame is None:
+        raise SystemExit(f"falha ao decodificar {path}")
+    return t_probe, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--cols", type=int, default=120)
+    args = ap.parse_args()
+
+    if not reprodT._find_ffmpeg() or not reprodT._find_ffprobe():
+        raise SystemExit("ffmpeg/ffprobe não encontrados")
+    videos = sorted(glob.glob(os.path.join(reprodT.BASE_DIR, "uploads", "video", "*.mp4")))
+    reprodT.MEDIA_CACHE_FILE = os.path.join(tempfile.mkdtemp(prefix="reprodT_bench_"), "media_cache.json")
+    for path in videos:
+        cold, warm = [], []
+        for _ in range(args.runs):
+            reprodT._MEDIA_CACHE = None
+            if os.path.exists(reprodT.MEDIA_CACHE_FILE):
+                os.remove(reprodT.MEDIA_CACHE_FILE)
+            cold.append(menu_to_first_frame(path, args.cols))
+            reprodT._MEDIA_CACHE = None  # força recarregar do disco, como num novo processo
+            warm.append(menu_to_first_frame(path, args.cols))
+        for name, runs in (("frio", cold), ("quente", warm)):
+            probe = sorted(r[0] for r in runs)[len(runs) // 2] * 1000
+            total = sorted(r[1] for r in runs)[len(runs) // 2] * 1000
+            print(f"{os.path.basename(path):16} {name:6} probe {probe:7.1f} ms  primeiro frame {total:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
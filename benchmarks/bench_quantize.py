@@ -0,0 +1,114 @@
+"""Benchmark da quantização perceptual com histerese temporal (ColorStabilizer).
+
+Para cada combinação de tolerância e histerese, renderiza frames sintéticos com damage
+tracking e mede bytes por frame (e a redução em relação ao estágio desligado), a
+fração de linhas idênticas ao frame anterior (acertos do cache de linhas), o PSNR dos frames
+estabilizados contra os originais e o custo do estágio. Cenas:
+  noise  fundo estático com ruído de sensor e um quadrado em movimento (o caso que a
+         histerese resolve)
+  pan    gradiente que se desloca inteiro a cada frame (pior caso: quase tudo muda de verdade)
+
+Uso:
+    python benchmarks/bench_quantize.py [--cols 120] [--frames 30] [--tolerance 0 4 8 16]
+                                        [--hysteresis 0 4 8 16] [--color truecolor 256]
+                                        [--scene noise pan]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+from bench_render import synthetic_frames  # noqa: E402
+
+
+def noisy_frames(w, h, n, sigma=3.0, seed=0):
+    """Fundo estático (gradiente) com ruído gaussiano por frame e um quadrado em movimento."""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:h, 0:w]
+    base = np.stack([xx * 255 // max(1, w - 1), yy * 255 // max(1, h - 1), (xx + yy) % 256], axis=-1)
+    s = max(2, h // 4)
+    frames = []
+    for i in range(n):
+        f = base + rng.normal(0, sigma, size=base.shape)
+        x = (i * 2) % max(1, w - s)
+        f[h // 3:h // 3 + s, x:x + s] = (230, 40, 40)
+        frames.append(np.clip(f + 0.5, 0, 255).astype(np.uint8))
+    return frames
+
+
+def psnr(a, b):
+    """PSNR (dB) entre dois frames uint8; inf quando idênticos."""
+    mse = np.mean((a.astype(np.float64) - b.astype(np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+
+def measure(frames, w, h, truecolor, tolerance, hysteresis):
+    """bytes/frame, fração de linhas repetidas, PSNR médio e ms do estágio."""
+    stab = reprodT.ColorStabilizer(tolerance, hysteresis)
+    prev_cells, prev_lines = None, None
+    nbytes, same_lines, total_lines, quality, t_stage = 0, 0, 0, [], 0.0
+    for f in frames:
+        t0 = time.perf_counter()
+        g = stab.apply(f) if stab.enabled else f
+        t_stage += time.perf_counter() - t0
+        quality.append(psnr(f, g))
+        out, prev_cells = reprodT._render_frame_damage(g, w, h, truecolor, prev_cells, encoder="bytes")
+        nbytes += len(out)
+        _, lines = reprodT._render_frame(g, w, h, truecolor, None, encoder="bytes")
+        if prev_lines is not None:
+            same_lines += sum(a == b for a, b in zip(lines, prev_lines))
+            total_lines += len(lines)
+        prev_lines = lines
+    finite = [q for q in quality if q != float("inf")]
+    return {
+        "bytes_per_frame": nbytes / len(frames),
+        "line_hits": same_lines / total_lines if total_lines else 0.0,
+        "psnr_db": sum(finite) / len(finite) if finite else float("inf"),
+        "stage_ms": t_stage / len(frames) * 1000 if stab.enabled else 0.0,
+    }
+
+
+def run(cols, n_frames, tolerances, hystereses, colors, scene="noise"):
+    w, h = reprodT._compute_scaled_wh(16, 9, cols)
+    frames = (noisy_frames if scene == "noise" else synthetic_frames)(w, h, n_frames)
+    res = {}
+    for color in colors:
+        truecolor = color == "truecolor"
+        base = None
+        for tol in tolerances:
+            for hys in hystereses:
+                m = measure(frames, w, h, truecolor, tol, hys)
+                if base is None:
+                    base = m["bytes_per_frame"]
+                m["reduction"] = 1 - m["bytes_per_frame"] / base if base else 0.0
+                res[f"{scene}/{color}/tol{tol}/hys{hys}"] = m
+    return res
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cols", type=int, default=120)
+    ap.add_argument("--frames", type=int, default=30)
+    ap.add_argument("--tolerance", type=int, nargs="+", default=[0, 4, 8, 16])
+    ap.add_argument("--hysteresis", type=int, nargs="+", default=[0, 4, 8, 16])
+    ap.add_argument("--color", nargs="+", choices=("truecolor", "256"), default=["truecolor", "256"])
+    ap.add_argument("--scene", nargs="+", choices=("noise", "pan"), default=["noise", "pan"])
+    args = ap.parse_args()
+    # A primeira combinação é a referência da redução: garante o estágio desligado
+    tolerances = [0] + [t for t in args.tolerance if t != 0]
+    hystereses = [0] + [x for x in args.hysteresis if x != 0]
+    res = {}
+    for scene in args.scene:
+        res.update(run(args.cols, args.frames, tolerances, hystereses, args.color, scene))
+    print(f"{'config':32} {'KB/frame':>9} {'redução':>8} {'linhas=':>8} {'PSNR dB':>8} {'estágio ms':>10}")
+    for k, m in res.items():
+        print(f"{k:32} {m['bytes_per_frame'] / 1024:9.1f} {m['reduction']:8.1%} {m['line_hits']:8.1%}"
+              f" {m['psnr_db']:8.1f} {m['stage_ms']:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
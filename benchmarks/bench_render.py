@@ -0,0 +1,81 @@
+"""Benchmark do renderer: laço por pixel (_render_frame_py) x vetorizado (_render_frame),
+e os dois backends do vetorizado: "str" (+ codificação UTF-8 para a saída) x "bytes"
+(tabela de dígitos uint8).
+
+Uso:
+    python benchmarks/bench_render.py [--cols 120] [--frames 30]
+
+Antes de medir, confere que as implementações geram saída idêntica byte a byte
+(truecolor e 256 cores).
+"""
+import functools
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+
+
+def synthetic_frames(w, h, n, seed=0):
+    """Sequência de frames sintéticos: gradiente em movimento com ruído leve."""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:h, 0:w]
+    frames = []
+    for i in range(n):
+        r = (xx * 255 // max(1, w - 1) + i * 3) % 256
+        g = (yy * 255 // max(1, h - 1) + i * 5) % 256
+        b = ((xx + yy + i * 7) * 2) % 256
+        f = np.stack([r, g, b], axis=-1).astype(np.int16)
+        f += rng.integers(-4, 5, size=f.shape, dtype=np.int16)
+        frames.append(np.clip(f, 0, 255).astype(np.uint8))
+    # Um frame estático repetido exercita o cache de linhas
+    frames.append(frames[-1].copy())
+    return frames
+
+
+def run(fn, frames, w, h, truecolor):
+    prev = None
+    outs = []
+    t0 = time.perf_counter()
+    for f in frames:
+        out, prev = fn(f, w, h, truecolor, prev, left_pad=3, top_pad=1)
+        outs.append(out)
+    return time.perf_counter() - t0, outs
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cols", type=int, default=120)
+    ap.add_argument("--frames", type=int, default=30)
+    args = ap.parse_args()
+
+    w, h = reprodT._compute_scaled_wh(16, 9, args.cols)
+    frames = synthetic_frames(w, h, args.frames)
+    print(f"frame {w}x{h} ({h // 2} linhas), {len(frames)} frames")
+    for truecolor in (True, False):
+        mode = "truecolor" if truecolor else "256"
+        t_py, out_py = run(reprodT._render_frame_py, frames, w, h, truecolor)
+        t_np, out_np = run(functools.partial(reprodT._render_frame, encoder="str"), frames, w, h, truecolor)
+        t_b, out_b = run(functools.partial(reprodT._render_frame, encoder="bytes"), frames, w, h, truecolor)
+        t0 = time.perf_counter()
+        for o in out_np:
+            o.encode("utf-8")
+        t_enc = time.perf_counter() - t0
+        if out_py != out_np or [o.encode("utf-8") for o in out_np] != out_b:
+            print(f"[{mode}] ERRO: saída difere da implementação de referência")
+            sys.exit(1)
+        fps_py = len(frames) / t_py
+        fps_np = len(frames) / t_np
+        print(f"[{mode:9}] antes: {fps_py:8.1f} fps  depois: {fps_np:8.1f} fps  ({fps_np / fps_py:.1f}x)")
+        fps_s = len(frames) / (t_np + t_enc)
+        fps_b = len(frames) / t_b
+        print(f"[{mode:9}] backend str+encode: {fps_s:8.1f} fps  bytes: {fps_b:8.1f} fps  ({fps_b / fps_s:.2f}x)")
+    print(f"backend escolhido: truecolor {reprodT._encoder(True)}, 256 cores {reprodT._encoder(False)}")
+
+
+if __name__ == "__main__":
+    main()
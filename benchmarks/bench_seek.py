@@ -0,0 +1,98 @@
+"""Benchmark da latência de seek (pedido → primeiro frame na nova posição).
+
+Para cada vídeo em source/uploads/video monta o índice de keyframes (mede frio e
+quente), sorteia posições e reproduz o caminho de play_video_file: ponto de seek
+no keyframe mais próximo, ffmpeg de vídeo reiniciado com -ss antes do -i e áudio
+PCM reaberto na mesma posição. Compara com -ss no instante exato (sem índice).
+O cache de verdade (source/media_cache.json) não é tocado.
+
+Uso:
+    python benchmarks/bench_seek.py [--seeks 20] [--cols 120] [--budget-ms 300]
+"""
+import argparse
+import glob
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+
+
+def seek_once(path, t, w, h, fps):
+    t0 = time.perf_counter()
+    proc = reprodT._build_ffmpeg_video_proc(path, w, h, fps, start=t)
+    pcm = reprodT.PcmStream.open(path, t)
+    try:
+        frame = reprodT.FrameReader(proc.stdout, w, h).read()
+        t_video = time.perf_counter() - t0
+        pcm.read(4096, timeout=1.0)
+        t_audio = time.perf_counter() - t0
+    finally:
+        pcm.close()
+        proc.kill()
+        proc.wait()
+    if frame is None:
+        raise SystemExit(f"falha ao decodificar {path} em {t:.2f}s")
+    return t_video, t_audio
+
+
+def pct(values, q):
+    v = sorted(values)
+    return v[min(len(v) - 1, int(q * len(v)))] * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seeks", type=int, default=20)
+    ap.add_argument("--cols", type=int, default=120)
+    ap.add_argument("--fps", type=int, default=30)
+    ap.add_argument("--budget-ms", type=float, default=300.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    if not reprodT._find_ffmpeg() or not reprodT._find_ffprobe():
+        raise SystemExit("ffmpeg/ffprobe não encontrados")
+    videos = sorted(glob.glob(os.path.join(reprodT.BASE_DIR, "uploads", "video", "*.mp4")))
+    reprodT.MEDIA_CACHE_FILE = os.path.join(tempfile.mkdtemp(prefix="reprodT_bench_"), "media_cache.json")
+    rnd = random.Random(args.seed)
+    worst = 0.0
+    measured = 0
+    for path in videos:
+        info = reprodT._ffprobe_info(path)
+        if not info or info["duration"] <= 0:
+            continue
+        w, h = reprodT._compute_scaled_wh(info["width"], info["height"], args.cols)
+        fps = reprodT._effective_fps(info, args.fps)
+
+        t0 = time.perf_counter()
+        kfs = reprodT._keyframe_index(path)
+        cold = time.perf_counter() - t0
+        reprodT._MEDIA_CACHE = None
+        t0 = time.perf_counter()
+        reprodT._keyframe_index(path)
+        warm = time.perf_counter() - t0
+        name = os.path.basename(path)
+        print(f"{name:16} índice: {len(kfs or [])} keyframes  frio {cold*1000:7.1f} ms  quente {warm*1000:6.1f} ms")
+
+        targets = [rnd.uniform(0, info["duration"]) for _ in range(args.seeks)]
+        for label, index in (("keyframe", kfs), ("exato", None)):
+            runs = [seek_once(path, reprodT._seek_target(index, t, info["duration"]), w, h, fps) for t in targets]
+            video = [r[0] for r in runs]
+            audio = [r[1] for r in runs]
+            print(f"{name:16} {label:8} vídeo p50 {pct(video, 0.5):6.1f} ms  p95 {pct(video, 0.95):6.1f} ms"
+                  f"  máx {max(video)*1000:6.1f} ms  | vídeo+áudio máx {max(audio)*1000:6.1f} ms")
+            if index is not None:
+                worst = max(worst, max(audio))
+        measured += 1
+    if not measured:
+        # Sem nenhuma medida o orçamento não foi verificado: não pode passar em silêncio
+        raise SystemExit("nenhum vídeo medido (sem vídeos em source/uploads/video ou ffprobe sem metadados)")
+    if worst * 1000 > args.budget_ms:
+        raise SystemExit(f"seek acima do orçamento: {worst*1000:.1f} ms > {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark de inicialização: custo de importar o módulo e tempo até o menu aparecer.
+
+1. python -X importtime -c "import reprodT": tempo acumulado do import, os módulos mais
+   caros e a verificação de que nenhum módulo pesado (numpy, PIL, colorama, backends de
+   áudio) é importado só por carregar o reprodT.
+2. Tempo até o menu: inicia `python reprodT.py` com stdin/stdout em pipe, mede até o
+   prompt do menu aparecer e sai pela opção "Sair".
+
+Sai com código 1 se algum módulo proibido aparecer ou se a mediana passar do orçamento.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 300]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+HEAVY = ("numpy", "PIL", "colorama", "pygame", "pyaudio", "sounddevice", "soundfile")
+PROMPT = "Escolha uma opção".encode("utf-8")
+
+
+def importtime():
+    r = subprocess.run([sys.executable, "-X", "importtime", "-c", "import reprodT"],
+                       cwd=SOURCE, capture_output=True, text=True, check=True)
+    rows = []
+    for line in r.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = [x.strip() for x in line[len("import time:"):].split("|")]
+        rows.append((int(self_us), int(cum_us), name))
+    return rows
+
+
+def time_to_menu():
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "reprodT.py"], cwd=SOURCE, env=env,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    buf = b""
+    try:
+        while PROMPT not in buf:
+            chunk = os.read(proc.stdout.fileno(), 4096)
+            if not chunk:
+                raise SystemExit("o processo terminou antes de mostrar o menu")
+            buf += chunk
+        elapsed = time.perf_counter() - t0
+        proc.stdin.write(b"7\n")
+        proc.stdin.flush()
+        proc.wait(timeout=10)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+    return elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--budget-ms", type=float, default=300.0)
+    args = ap.parse_args()
+
+    rows = importtime()
+    total = next(cum for _, cum, name in rows if name.strip() == "reprodT")
+    print(f"import reprodT: {total/1000:.1f} ms (acumulado)")
+    for self_us, cum_us, name in sorted(rows, reverse=True)[:8]:
+        print(f"  {self_us/1000:6.1f} ms  {name.strip()}")
+    loaded = sorted({name.strip().split(".")[0] for _, _, name in rows} & set(HEAVY))
+    failed = False
+    if loaded:
+        print(f"ERRO: módulos pesados importados no carregamento: {', '.join(loaded)}")
+        failed = True
+
+    times = sorted(time_to_menu() for _ in range(args.runs))
+    median = times[len(times) // 2] * 1000
+    print(f"tempo até o menu: mediana {median:.1f} ms  (mín {times[0]*1000:.1f}, máx {times[-1]*1000:.1f})"
+          f"  orçamento {args.budget_ms:.0f} ms")
+    if median > args.budget_ms:
+        print("ERRO: acima do orçamento")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
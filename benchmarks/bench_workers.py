@@ -0,0 +1,54 @@
+"""Benchmark de escalabilidade da renderização paralela (ParallelRenderer).
+
+Mede frames/s da codificação ANSI em processo único e com 1/2/4/8 workers,
+conferindo que as linhas geradas são idênticas às do renderer em processo.
+
+Uso:
+    python benchmarks/bench_workers.py [--cols 320] [--frames 60] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+from bench_render import synthetic_frames  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cols", type=int, default=320)
+    ap.add_argument("--frames", type=int, default=60)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = ap.parse_args()
+
+    w, h = reprodT._compute_scaled_wh(16, 9, args.cols)
+    frames = synthetic_frames(w, h, args.frames)
+    print(f"frame {w}x{h} ({h // 2} linhas), {len(frames)} frames, {os.cpu_count()} CPUs")
+    for truecolor in (True, False):
+        mode = "truecolor" if truecolor else "256"
+        reference = []
+        t0 = time.perf_counter()
+        for f in frames:
+            fg, bg = reprodT._frame_cells(f, w, h, truecolor)
+            reference.append(reprodT._encode_cells(fg, bg, truecolor))
+        base = len(frames) / (time.perf_counter() - t0)
+        print(f"[{mode:9}] processo único: {base:8.1f} fps")
+        for n in args.workers:
+            r = reprodT.ParallelRenderer(w, h, truecolor, n)
+            try:
+                r.encode(frames[0])  # aquece o pool
+                t0 = time.perf_counter()
+                got = [r.encode(f) for f in frames]
+                fps = len(frames) / (time.perf_counter() - t0)
+            finally:
+                r.close()
+            if got != reference:
+                print(f"[{mode:9}] ERRO: saída com {n} workers difere do renderer em processo")
+                sys.exit(1)
+            print(f"[{mode:9}] {n} workers:      {fps:8.1f} fps  ({fps / base:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Benchmark de codificação + escrita dos frames: caminho antigo x FrameWriter.
+
+Antigo: sys.stdout.write(str) + flush() (TextIOWrapper codifica o frame a cada escrita).
+Novo: str.encode() uma vez + FrameWriter (escrita binária, com e sem DEC 2026).
+Destinos: /dev/null e um pseudo-terminal (pty) esvaziado por uma thread, que se aproxima
+de um emulador de terminal lendo a saída. Antes de medir, confere que os bytes que
+chegam ao pty são os mesmos nos dois caminhos. Por fim escreve os frames num pipe não
+bloqueante esvaziado devagar e confere que o FrameWriter entrega tudo apesar das escritas
+parciais e de EAGAIN.
+
+Uso:
+    python benchmarks/bench_write.py [--cols 120] [--frames 60] [--repeat 5]
+"""
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+import reprodT  # noqa: E402
+from bench_render import synthetic_frames  # noqa: E402
+
+
+def render_all(frames, w, h, truecolor):
+    prev = None
+    outs = []
+    for f in frames:
+        out, prev = reprodT._render_frame_damage(f, w, h, truecolor, prev, encoder="str")
+        outs.append(out)
+    return outs
+
+
+def legacy_writer(fd):
+    stream = io.TextIOWrapper(io.BufferedWriter(io.FileIO(fd, "w", closefd=False)), encoding="utf-8")
+
+    def write(out):
+        stream.write(out)
+        stream.flush()
+    return write
+
+
+def new_writer(fd, sync):
+    writer = reprodT.FrameWriter(fd, sync=sync)
+    return lambda out: writer.write(out.encode("utf-8"))
+
+
+class PtySink:
+    """Pseudo-terminal cujo lado mestre é lido continuamente (opcionalmente guardando os bytes)."""
+    def __init__(self, keep=False):
+        self.master, self.slave = os.openpty()
+        self.keep = keep
+        self.data = bytearray()
+        self.total = 0
+        self._stop = False
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        while True:
+            try:
+                chunk = os.read(self.master, 1 << 16)
+            except OSError:
+                return
+            if not chunk:
+                return
+            self.total += len(chunk)
+            if self.keep:
+                self.data += chunk
+
+    def wait(self, n, timeout=5.0):
+        end = time.perf_counter() + timeout
+        while self.total < n and time.perf_counter() < end:
+            time.sleep(0.001)
+
+    def close(self):
+        os.close(self.slave)
+        os.close(self.master)
+
+
+def nonblocking_pipe(outs, chunk=4096):
+    """FrameWriter num pipe não bloqueante cujo leitor consome aos poucos (força EAGAIN).
+    Retorna (bytes corretos?, segundos, stats do writer).
+    """
+    r, w = os.pipe()
+    os.set_blocking(w, False)
+    got = bytearray()
+
+    def drain():
+        while True:
+            data = os.read(r, chunk)
+            if not data:
+                return
+            got.extend(data)
+            time.sleep(0.0001)
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    writer = reprodT.FrameWriter(w, sync=False)
+    t0 = time.perf_counter()
+    for out in outs:
+        writer.write(out.encode("utf-8"))
+    dt = time.perf_counter() - t0
+    os.close(w)
+    thread.join()
+    os.close(r)
+    expected = b"".join(o.encode("utf-8") for o in outs)
+    return bytes(got) == expected, dt, writer.stats()
+
+
+def set_raw(fd):
+    import tty
+    tty.setraw(fd)
+
+
+def measure(make, outs, fd, repeat):
+    write = make(fd)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for out in outs:
+            write(out)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cols", type=int, default=120)
+    ap.add_argument("--frames", type=int, default=60)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    w = args.cols
+    h = reprodT._compute_scaled_wh(16, 9, w)[1]
+    frames = synthetic_frames(w, h, args.frames)
+    paths = (
+        ("antigo (TextIOWrapper)", legacy_writer),
+        ("FrameWriter", lambda fd: new_writer(fd, False)),
+        ("FrameWriter + 2026", lambda fd: new_writer(fd, True)),
+    )
+    for truecolor in (True, False):
+        outs = render_all(frames, w, h, truecolor)
+        nbytes = sum(len(o.encode("utf-8")) for o in outs) * args.repeat
+        mode = "truecolor" if truecolor else "256"
+
+        # Bytes que chegam ao pty: idênticos (sem 2026)
+        got = []
+        for _, make in paths[:2]:
+            sink = PtySink(keep=True)
+            set_raw(sink.slave)
+            measure(make, outs[:5], sink.slave, 1)
+            sink.wait(sum(len(o.encode("utf-8")) for o in outs[:5]))
+            got.append(bytes(sink.data))
+            sink.close()
+        assert got[0] == got[1], "saída difere entre os caminhos"
+
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        for name, make in paths:
+            dt = measure(make, outs, devnull, args.repeat)
+            print(f"{mode:9} /dev/null {name:24} {nbytes/dt/1e6:8.1f} MB/s  {len(outs)*args.repeat/dt:8.0f} frames/s")
+        os.close(devnull)
+        for name, make in paths:
+            sink = PtySink()
+            set_raw(sink.slave)
+            dt = measure(make, outs, sink.slave, args.repeat)
+            print(f"{mode:9} pty       {name:24} {nbytes/dt/1e6:8.1f} MB/s  {len(outs)*args.repeat/dt:8.0f} frames/s")
+            sink.close()
+        ok, dt, st = nonblocking_pipe(outs)
+        print(f"{mode:9} pipe não bloqueante FrameWriter   {nbytes/args.repeat/dt/1e6:8.1f} MB/s"
+              f"  {st['partial_writes']} escritas parciais, {st['eagain']} EAGAIN")
+        if not ok:
+            print("ERRO: bytes perdidos no pipe não bloqueante")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""Suíte de benchmarks por etapa (decodificação, renderização, saída) com resultado em JSON.
+
+Etapas:
+  pipe    throughput do pipe rawvideo do ffmpeg (FrameReader) para cada vídeo em
+          source/uploads/video (pulada, com o motivo no JSON, sem ffmpeg).
+  render  frames/s de _render_frame (frame completo) e _render_frame_damage, com bytes
+          por frame, em várias larguras, truecolor e 256 cores, nos dois backends e em cada
+          modo de renderização (meio bloco, quadrantes, Braille) com o mesmo número de células.
+  write   throughput de FrameWriter para /dev/null e para um pty.
+  quantize  bytes por frame, redução e PSNR do ColorStabilizer (tolerância/histerese 0 e 8)
+          numa cena estática com ruído (ver bench_quantize.py).
+
+O JSON (padrão: benchmarks/results/<commit>.json) traz o commit, versões e máquina.
+--compare ANTIGO.json imprime a razão novo/antigo das métricas e sai com código 1 se
+alguma piorar mais que --threshold.
+
+Uso:
+    python benchmarks/suite.py [--cols 60 120 200] [--frames 30] [--out arquivo.json]
+                               [--compare antigo.json] [--threshold 0.10] [--only render write]
+                               [--modes half quadrant braille]
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "source"))
+import numpy as np  # noqa: E402
+import reprodT  # noqa: E402
+from bench_render import synthetic_frames  # noqa: E402
+from bench_write import PtySink, set_raw  # noqa: E402
+import bench_quantize  # noqa: E402
+
+# Métricas em que maior é melhor; as demais (ms, bytes) são melhores quando menores
+HIGHER_IS_BETTER = ("fps", "mb_s", "psnr_db", "reduction", "line_hits")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "desconhecido"
+
+
+def bench_pipe(cols, max_frames):
+    if not reprodT._find_ffmpeg():
+        return {"skipped": "ffmpeg não encontrado"}
+    videos = sorted(glob.glob(os.path.join(reprodT.BASE_DIR, "uploads", "video", "*.mp4")))
+    if not videos:
+        return {"skipped": "nenhum vídeo em source/uploads/video"}
+    res = {}
+    for path in videos:
+        info = reprodT._ffprobe_info(path) or {}
+        w, h = reprodT._compute_scaled_wh(info.get("width", 0), info.get("height", 0), cols)
+        try:
+            proc = reprodT._build_ffmpeg_video_proc(path, w, h, 0)
+        except OSError as e:
+            return {"skipped": f"falha ao iniciar o ffmpeg: {e}"}
+        reader = reprodT.FrameReader(proc.stdout, w, h)
+        n = 0
+        t0 = time.perf_counter()
+        try:
+            while n < max_frames and reader.read() is not None:
+                n += 1
+        finally:
+            proc.kill()
+            proc.wait()
+        dt = time.perf_counter() - t0
+        res[os.path.basename(path)] = {
+            "width": w, "height": h, "frames": n,
+            "fps": n / dt if dt else 0.0,
+            "mb_s": n * w * h * 3 / dt / 1e6 if dt else 0.0,
+        }
+    return res
+
+
+def bench_render(cols_list, n_frames, modes=("half",)):
+    res = {}
+    for cols, mode in ((c, m) for c in cols_list for m in modes):
+        w, h = reprodT._compute_scaled_wh(16, 9, cols)
+        # Mesmo número de células em todos os modos; só os pixels por célula mudam
+        cx, cy = reprodT.RENDER_MODES[mode]
+        w, h = w * cx, (h // 2) * cy
+        frames = synthetic_frames(w, h, n_frames)
+        for truecolor in (True, False):
+            for encoder in reprodT.ENCODERS:
+                # Chaves do meio bloco sem o modo, comparáveis com resultados antigos
+                key = f"{cols}/{'truecolor' if truecolor else '256'}/{encoder}"
+                if mode != "half":
+                    key = f"{cols}/{mode}/{'truecolor' if truecolor else '256'}/{encoder}"
+                entry = {}
+                for name, fn in (("full", reprodT._render_frame), ("damage", reprodT._render_frame_damage)):
+                    fn(frames[0], w, h, truecolor, None, encoder=encoder, mode=mode)  # aquece tabelas/LUT
+                    prev, nbytes = None, 0
+                    t0 = time.perf_counter()
+                    for f in frames:
+                        out, prev = fn(f, w, h, truecolor, prev if name == "damage" else None, encoder=encoder,
+                                       mode=mode)
+                        nbytes += len(out) if isinstance(out, bytes) else len(out.encode("utf-8"))
+                    dt = time.perf_counter() - t0
+                    entry[f"{name}_fps"] = len(frames) / dt
+                    entry[f"{name}_bytes_per_frame"] = nbytes / len(frames)
+                res[key] = entry
+    return res
+
+
+def bench_write(cols, n_frames, repeat):
+    w, h = reprodT._compute_scaled_wh(16, 9, cols)
+    frames = synthetic_frames(w, h, n_frames)
+    res = {}
+    for truecolor in (True, False):
+        prev, outs = None, []
+        for f in frames:
+            out, prev = reprodT._render_frame_damage(f, w, h, truecolor, prev, encoder="bytes")
+            outs.append(out)
+        nbytes = sum(len(o) for o in outs) * repeat
+        targets = [("devnull", None)]
+        if hasattr(os, "openpty"):
+            targets.append(("pty", PtySink))
+        for target, sink_cls in targets:
+            sink = None
+            if sink_cls is None:
+                fd = os.open(os.devnull, os.O_WRONLY)
+            else:
+                sink = sink_cls()
+                set_raw(sink.slave)
+                fd = sink.slave
+            writer = reprodT.FrameWriter(fd)
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                for o in outs:
+                    writer.write(o)
+            dt = time.perf_counter() - t0
+            if sink is None:
+                os.close(fd)
+            else:
+                sink.close()
+            res[f"{target}/{'truecolor' if truecolor else '256'}"] = {
+                "mb_s": nbytes / dt / 1e6, "fps": len(outs) * repeat / dt,
+            }
+    return res
+
+
+def flatten(d, prefix=""):
+    for k, v in d.items():
+        if isinstance(v, dict):
+            yield from flatten(v, f"{prefix}{k}.")
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            yield f"{prefix}{k}", float(v)
+
+
+def compare(new, old, threshold):
+    """Imprime novo/antigo por métrica; retorna as métricas que pioraram além do limite."""
+    old_m = dict(flatten(old.get("results", {})))
+    worse = []
+    for name, value in flatten(new["results"]):
+        # Geometria e contagem de frames descrevem a execução, não o desempenho
+        if name.endswith(("width", "height", "frames")):
+            continue
+        if name not in old_m or old_m[name] == 0:
+            continue
+        ratio = value / old_m[name]
+        better_up = name.rsplit(".", 1)[-1].endswith(HIGHER_IS_BETTER)
+        change = ratio - 1 if better_up else 1 - ratio
+        flag = ""
+        if change < -threshold:
+            flag = "  <-- regressão"
+            worse.append(name)
+        print(f"{name:55} {old_m[name]:12.2f} -> {value:12.2f}  ({ratio:5.2f}x){flag}")
+    return worse
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cols", type=int, nargs="+", default=[60, 120, 200])
+    ap.add_argument("--frames", type=int, default=30)
+    ap.add_argument("--pipe-frames", type=int, default=300)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--only", nargs="+", choices=("pipe", "render", "write", "quantize"))
+    ap.add_argument("--modes", nargs="+", choices=tuple(reprodT.RENDER_MODES), default=list(reprodT.RENDER_MODES))
+    ap.add_argument("--out")
+    ap.add_argument("--compare")
+    ap.add_argument("--threshold", type=float, default=0.10)
+    args = ap.parse_args()
+
+    stages = args.only or ["pipe", "render", "write", "quantize"]
+    commit = git_commit()
+    results = {}
+    if "pipe" in stages:
+        results["pipe"] = bench_pipe(max(args.cols), args.pipe_frames)
+    if "render" in stages:
+        results["render"] = bench_render(args.cols, args.frames, args.modes)
+    if "write" in stages:
+        results["write"] = bench_write(max(args.cols), args.frames, args.repeat)
+    if "quantize" in stages:
+        results["quantize"] = bench_quantize.run(max(args.cols), args.frames, [0, 8], [0, 8],
+                                                 ["truecolor", "256"], "noise")
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "encoder": {"truecolor": reprodT._encoder(True), "256": reprodT._encoder(False)},
+        "params": {"cols": args.cols, "frames": args.frames, "repeat": args.repeat, "modes": args.modes},
+        "results": results,
+    }
+    out = args.out or os.path.join(HERE, "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"resultados gravados em {out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        print(f"comparando com {old.get('commit', '?')} ({args.compare})")
+        worse = compare(report, old, args.threshold)
+        if worse:
+            print(f"{len(worse)} métrica(s) pioraram mais de {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
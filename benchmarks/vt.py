@@ -0,0 +1,86 @@
+"""Emulador mínimo de terminal para validar a saída dos renderers nos benchmarks.
+
+Interpreta apenas o subconjunto de sequências que o reprodT emite (CUP, CUD, CNL, CHA,
+SGR de cores, modos privados ignorados) e mantém uma grade de células (glifo, frente, fundo).
+Dois fluxos de bytes que levam à mesma grade produzem a mesma imagem na tela.
+"""
+import re
+
+_CSI = re.compile(r"\x1b\[([?0-9;]*)([A-Za-z])")
+
+
+class Screen:
+    def __init__(self, cols, rows):
+        self.cols, self.rows = cols, rows
+        self.grid = [[(" ", None, None) for _ in range(cols)] for _ in range(rows)]
+        self.r = self.c = 0
+        self.fg = self.bg = None
+
+    def _sgr(self, params):
+        p = [int(x) if x else 0 for x in params.split(";")] if params else [0]
+        i = 0
+        while i < len(p):
+            if p[i] == 0:
+                self.fg = self.bg = None
+            elif p[i] in (38, 48) and i + 1 < len(p):
+                if p[i + 1] == 2:
+                    color = ("rgb", p[i + 2], p[i + 3], p[i + 4])
+                    i += 4
+                else:
+                    color = ("256", p[i + 2])
+                    i += 2
+                if p[i - (4 if color[0] == "rgb" else 2)] == 38:
+                    self.fg = color
+                else:
+                    self.bg = color
+            i += 1
+
+    def _put(self, ch):
+        if 0 <= self.r < self.rows and 0 <= self.c < self.cols:
+            self.grid[self.r][self.c] = (ch, self.fg, self.bg)
+        self.c += 1
+
+    def feed(self, data):
+        if isinstance(data, (bytes, bytearray)):
+            data = bytes(data).decode("utf-8")
+        pos = 0
+        n = len(data)
+        while pos < n:
+            ch = data[pos]
+            if ch == "\x1b":
+                m = _CSI.match(data, pos)
+                if not m:
+                    raise ValueError(f"sequência não suportada em {pos}: {data[pos:pos + 12]!r}")
+                params, final = m.group(1), m.group(2)
+                pos = m.end()
+                if params.startswith("?"):
+                    continue
+                nums = [int(x) if x else 0 for x in params.split(";")] if params else []
+                if final == "H":
+                    self.r = (nums[0] if nums and nums[0] else 1) - 1
+                    self.c = (nums[1] if len(nums) > 1 and nums[1] else 1) - 1
+                elif final == "B":
+                    self.r += nums[0] if nums and nums[0] else 1
+                elif final == "E":
+                    self.r += nums[0] if nums and nums[0] else 1
+                    self.c = 0
+                elif final == "G":
+                    self.c = (nums[0] if nums and nums[0] else 1) - 1
+                elif final == "m":
+                    self._sgr(params)
+                elif final in "JK":
+                    pass
+                else:
+                    raise ValueError(f"CSI {final} não suportado")
+                continue
+            if ch == "\n":
+                self.r += 1
+                self.c = 0
+            elif ch == "\r":
+                self.c = 0
+            else:
+                self._put(ch)
+            pos += 1
+
+    def snapshot(self):
+        return [row[:] for row in self.grid]
@@ -1,45 +1,88 @@
-import sys, os, subprocess, threading, time, tempfile, atexit, signal, math, json, shutil, wave, struct
-import numpy as np
-from PIL import Image
-import colorama
-from colorama import Fore, Style
-import time
-
-# Inicializa Colorama apenas para mensagens (sem converter/embrulhar stdout)
-try:
-    colorama.just_fix_windows_console()
-    # wrap=False evita interferir na escrita das sequências ANSI dos frames
-    # convert=False e strip=False preservam as sequências ANSI reais (24-bit)
-    colorama.init(autoreset=True, wrap=False, convert=False, strip=False)
-except Exception:
-    pass
-
-# Preferência de backend: no Windows, usar winsound nativo (sem instalação)
-if os.name == 'nt':
-    try:
-        import winsound
-        AUDIO_BACKEND = 'winsound'
-    except ImportError:
-        AUDIO_BACKEND = None
-else:
-    AUDIO_BACKEND = None
-
-# Se não houver backend ainda, tentar third-party em ordem de robustez
-if AUDIO_BACKEND is None:
-    try:
-        import pygame
-        AUDIO_BACKEND = 'pygame'
-    except ImportError:
+import sys, os, subprocess, threading, time, tempfile, atexit, signal, math, json, shutil, wave, struct, zlib, mmap, hashlib, re, select
+from collections import deque
+
+class _LazyModule:
+    """Módulo importado no primeiro acesso a um atributo. Depois disso o nome global passa
+    a apontar para o módulo real, sem custo extra nos laços de renderização.
+    """
+    def __init__(self, name, alias):
+        self._name = name
+        self._alias = alias
+
+    def __getattr__(self, attr):
+        import importlib
+        mod = importlib.import_module(self._name)
+        globals()[self._alias] = mod
+        return getattr(mod, attr)
+
+# numpy, colorama, PIL e os backends de áudio só são importados quando usados de fato:
+# o menu abre sem eles, e a CLI não paga por eles em probe, por exemplo.
+np = _LazyModule("numpy", "np")
+_COLORAMA = None
+
+def _colorama():
+    """Importa e inicializa o Colorama no primeiro uso (apenas para mensagens)."""
+    global _COLORAMA
+    if _COLORAMA is None:
+        import colorama
+        try:
+            colorama.just_fix_windows_console()
+            # wrap=False evita interferir na escrita das sequências ANSI dos frames
+            # convert=False e strip=False preservam as sequências ANSI reais (24-bit)
+            colorama.init(autoreset=True, wrap=False, convert=False, strip=False)
+        except Exception:
+            pass
+        _COLORAMA = colorama
+    return _COLORAMA
+
+class _LazyColor:
+    """Representa colorama.Fore/Style sem importar o módulo até o primeiro acesso."""
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(getattr(_colorama(), self._name), attr)
+
+Fore = _LazyColor("Fore")
+Style = _LazyColor("Style")
+
+AUDIO_BACKEND = None
+_AUDIO_DETECTED = False
+
+def _audio_backend():
+    """Detecta (uma vez) o backend de áudio disponível. Chamado ao criar o primeiro AudioPlayer."""
+    global AUDIO_BACKEND, _AUDIO_DETECTED
+    if _AUDIO_DETECTED:
+        return AUDIO_BACKEND
+    backend = None
+    # Preferência de backend: no Windows, usar winsound nativo (sem instalação)
+    if os.name == 'nt':
+        try:
+            import winsound
+            backend = 'winsound'
+        except ImportError:
+            backend = None
+    # Se não houver backend ainda, tentar third-party em ordem de robustez
+    if backend is None:
+        # Sem o banner "Hello from the pygame community" no meio do menu
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
         try:
-            import pyaudio
-            AUDIO_BACKEND = 'pyaudio'
+            import pygame
+            backend = 'pygame'
         except ImportError:
             try:
-                import sounddevice as sd
-                import soundfile as sf
-                AUDIO_BACKEND = 'sounddevice'
+                import pyaudio
+                backend = 'pyaudio'
             except ImportError:
-                AUDIO_BACKEND = None
+                try:
+                    import sounddevice as sd
+                    import soundfile as sf
+                    backend = 'sounddevice'
+                except ImportError:
+                    backend = None
+    AUDIO_BACKEND = backend
+    _AUDIO_DETECTED = True
+    return backend
 
 def _base_dir():
     """Base para recursos empacotados.
@@ -57,9 +100,14 @@ def _base_dir():
 BASE_DIR = _base_dir()
 EXE_DIR = os.path.dirname(getattr(sys, 'executable', sys.argv[0])) if getattr(sys, 'frozen', False) else None
 SETTINGS_FILE = os.path.join(BASE_DIR, "settings.json")
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
 
 def load_settings():
-    defaults = {"cols": 100, "fps_limit": 60, "max_rows": 0, "audio_enabled": True, "preset_auto": False}
+    defaults = {"cols": 100, "fps_limit": 60, "max_rows": 0, "audio_enabled": True, "preset_auto": False,
+                "render_workers": 0, "av_sync_tolerance_ms": 80, "ansi_cache_mb": 512,
+                "adaptive_quality": True, "render_mode": "half", "graphics": "ansi",
+                "color_tolerance": 0, "color_hysteresis": 0, "decode_process": False,
+                "image_cache_mb": 64}
     if os.path.isfile(SETTINGS_FILE):
         try:
             with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
@@ -83,12 +131,15 @@ def save_settings(settings):
         except Exception:
             print(f"[AVISO] Não foi possível salvar configurações: {e}")
 
-def _find_ffmpeg():
-    # Override via variável de ambiente
-    env = os.environ.get("TERMPLAYER_FFMPEG")
-    if env and os.path.isfile(env):
-        return env
+# ---------- Descoberta do ffmpeg/ffprobe ----------
+TOOLCHAIN_CACHE_FILE = os.path.join(CACHE_DIR, "toolchain.json")
+_TOOLCHAIN = None
+_TOOLCHAIN_LOCK = threading.Lock()
 
+def _tool_candidates(tool):
+    """Caminhos candidatos para o binário (ffmpeg ou ffprobe), em ordem de prioridade.
+    Retorna (locais, genéricos): os locais vêm antes do PATH, os genéricos depois.
+    """
     script_dir = os.path.dirname(os.path.abspath(__file__))
     parent_dir = os.path.dirname(script_dir)
     base_dir = BASE_DIR
@@ -97,231 +148,213 @@ def _find_ffmpeg():
     # Priorizar binários locais específicos por OS
     local_candidates = []
     if os.name == "nt":
+        exe = tool + ".exe"
         # PyInstaller base_dir e diretório do executável (quando congelado)
-        if base_dir:
-            local_candidates += [
-                os.path.join(base_dir, "ffmpeg-win", "ffmpeg.exe"),
-                os.path.join(base_dir, "ffmpeg-win", "bin", "ffmpeg.exe"),
-            ]
-        if exe_dir:
+        for d in (base_dir, exe_dir):
+            if d:
+                local_candidates += [
+                    os.path.join(d, "ffmpeg-win", exe),
+                    os.path.join(d, "ffmpeg-win", "bin", exe),
+                ]
+        # Também considerar diretórios na raiz do projeto (pai de source)
+        for d in (script_dir, parent_dir):
             local_candidates += [
-                os.path.join(exe_dir, "ffmpeg-win", "ffmpeg.exe"),
-                os.path.join(exe_dir, "ffmpeg-win", "bin", "ffmpeg.exe"),
+                os.path.join(d, "ffmpeg-win", exe),
+                os.path.join(d, "ffmpeg-win", "bin", exe),
+                os.path.join(d, "ffmpeg-win", "ffmpeg-8.0-essentials_build", "bin", exe),
+                os.path.join(d, "ffmpeg-8.0", "bin", exe),
+                os.path.join(d, "bin", exe),
+                os.path.join(d, exe),
             ]
-        local_candidates += [
-            os.path.join(script_dir, "ffmpeg-win", "ffmpeg.exe"),
-            os.path.join(script_dir, "ffmpeg-win", "bin", "ffmpeg.exe"),
-            os.path.join(script_dir, "ffmpeg-win", "ffmpeg-8.0-essentials_build", "bin", "ffmpeg.exe"),
-            os.path.join(script_dir, "ffmpeg-8.0", "bin", "ffmpeg.exe"),
-            os.path.join(script_dir, "bin", "ffmpeg.exe"),
-            os.path.join(script_dir, "ffmpeg.exe"),
-            # Também considerar diretórios na raiz do projeto (pai de source)
-            os.path.join(parent_dir, "ffmpeg-win", "ffmpeg.exe"),
-            os.path.join(parent_dir, "ffmpeg-win", "bin", "ffmpeg.exe"),
-            os.path.join(parent_dir, "ffmpeg-win", "ffmpeg-8.0-essentials_build", "bin", "ffmpeg.exe"),
-            os.path.join(parent_dir, "ffmpeg-8.0", "bin", "ffmpeg.exe"),
-            os.path.join(parent_dir, "bin", "ffmpeg.exe"),
-            os.path.join(parent_dir, "ffmpeg.exe"),
-        ]
     elif sys.platform == "darwin":
-        if base_dir:
-            local_candidates += [
-                os.path.join(base_dir, "ffmpeg-mac", "ffmpeg"),
-                os.path.join(base_dir, "ffmpeg-mac", "bin", "ffmpeg"),
-            ]
-        if exe_dir:
+        for d in (base_dir, exe_dir):
+            if d:
+                local_candidates += [
+                    os.path.join(d, "ffmpeg-mac", tool),
+                    os.path.join(d, "ffmpeg-mac", "bin", tool),
+                ]
+        for d in (script_dir, parent_dir):
             local_candidates += [
-                os.path.join(exe_dir, "ffmpeg-mac", "ffmpeg"),
-                os.path.join(exe_dir, "ffmpeg-mac", "bin", "ffmpeg"),
+                os.path.join(d, "ffmpeg-mac", tool),
+                os.path.join(d, "ffmpeg-mac", "bin", tool),
+                os.path.join(d, "bin", tool),
+                os.path.join(d, tool),
             ]
-        local_candidates += [
-            os.path.join(script_dir, "ffmpeg-mac", "ffmpeg"),
-            os.path.join(script_dir, "ffmpeg-mac", "bin", "ffmpeg"),
-            os.path.join(script_dir, "bin", "ffmpeg"),
-            os.path.join(script_dir, "ffmpeg"),
-            os.path.join(parent_dir, "ffmpeg-mac", "ffmpeg"),
-            os.path.join(parent_dir, "ffmpeg-mac", "bin", "ffmpeg"),
-            os.path.join(parent_dir, "bin", "ffmpeg"),
-            os.path.join(parent_dir, "ffmpeg"),
-        ]
     else:
         # Linux e outros Unix
-        if base_dir:
+        for d in (base_dir, exe_dir):
+            if d:
+                local_candidates += [
+                    os.path.join(d, "ffmpeg-linux", tool),
+                    os.path.join(d, "ffmpeg-linux", "bin", tool),
+                    os.path.join(d, "ffmpeg-linux", "ffmpeg-master-latest-linux64-lgpl", tool),
+                ]
+        for d in (script_dir, parent_dir):
             local_candidates += [
-                os.path.join(base_dir, "ffmpeg-linux", "ffmpeg"),
-                os.path.join(base_dir, "ffmpeg-linux", "bin", "ffmpeg"),
-                os.path.join(base_dir, "ffmpeg-linux", "ffmpeg-master-latest-linux64-lgpl", "ffmpeg"),
+                os.path.join(d, "ffmpeg-linux", tool),
+                os.path.join(d, "ffmpeg-linux", "bin", tool),
+                os.path.join(d, "ffmpeg-linux", "ffmpeg-master-latest-linux64-lgpl", tool),
+                os.path.join(d, "bin", tool),
+                os.path.join(d, tool),
             ]
-        if exe_dir:
-            local_candidates += [
-                os.path.join(exe_dir, "ffmpeg-linux", "ffmpeg"),
-                os.path.join(exe_dir, "ffmpeg-linux", "bin", "ffmpeg"),
-                os.path.join(exe_dir, "ffmpeg-linux", "ffmpeg-master-latest-linux64-lgpl", "ffmpeg"),
+
+    # Outros caminhos genéricos que possam existir no projeto
+    generic = []
+    for d in (script_dir, parent_dir):
+        for sub in (("ffmpeg-8.0", "bin"), ("ffmpeg-8.0",), ("ffmpeg", "bin"), ("ffmpeg",)):
+            generic += [
+                os.path.join(d, *sub, tool),
+                os.path.join(d, *sub, tool + ".exe"),
             ]
-        local_candidates += [
-            os.path.join(script_dir, "ffmpeg-linux", "ffmpeg"),
-            os.path.join(script_dir, "ffmpeg-linux", "bin", "ffmpeg"),
-            os.path.join(script_dir, "ffmpeg-linux", "ffmpeg-master-latest-linux64-lgpl", "ffmpeg"),
-            os.path.join(script_dir, "bin", "ffmpeg"),
-            os.path.join(script_dir, "ffmpeg"),
-            os.path.join(parent_dir, "ffmpeg-linux", "ffmpeg"),
-            os.path.join(parent_dir, "ffmpeg-linux", "bin", "ffmpeg"),
-            os.path.join(parent_dir, "ffmpeg-linux", "ffmpeg-master-latest-linux64-lgpl", "ffmpeg"),
-            os.path.join(parent_dir, "bin", "ffmpeg"),
-            os.path.join(parent_dir, "ffmpeg"),
-        ]
+    return local_candidates, generic
 
+def _resolve_tool(tool, env_var):
+    # Override via variável de ambiente
+    env = os.environ.get(env_var)
+    if env and os.path.isfile(env):
+        return env
+    local_candidates, generic = _tool_candidates(tool)
     # Verificar candidatos locais primeiro
     for c in local_candidates:
         if os.path.isfile(c):
             return c
-
     # PATH como fallback
-    p = shutil.which("ffmpeg") or shutil.which("ffmpeg.exe")
+    p = shutil.which(tool) or shutil.which(tool + ".exe")
     if p:
         return p
-
-    # Outros caminhos genéricos que possam existir no projeto
-    generic = [
-        os.path.join(script_dir, "ffmpeg-8.0", "bin", "ffmpeg"),
-        os.path.join(script_dir, "ffmpeg-8.0", "bin", "ffmpeg.exe"),
-        os.path.join(script_dir, "ffmpeg-8.0", "ffmpeg"),
-        os.path.join(script_dir, "ffmpeg-8.0", "ffmpeg.exe"),
-        os.path.join(script_dir, "ffmpeg", "bin", "ffmpeg"),
-        os.path.join(script_dir, "ffmpeg", "bin", "ffmpeg.exe"),
-        os.path.join(script_dir, "ffmpeg", "ffmpeg"),
-        os.path.join(script_dir, "ffmpeg", "ffmpeg.exe"),
-        os.path.join(parent_dir, "ffmpeg-8.0", "bin", "ffmpeg"),
-        os.path.join(parent_dir, "ffmpeg-8.0", "bin", "ffmpeg.exe"),
-        os.path.join(parent_dir, "ffmpeg-8.0", "ffmpeg"),
-        os.path.join(parent_dir, "ffmpeg-8.0", "ffmpeg.exe"),
-        os.path.join(parent_dir, "ffmpeg", "bin", "ffmpeg"),
-        os.path.join(parent_dir, "ffmpeg", "bin", "ffmpeg.exe"),
-        os.path.join(parent_dir, "ffmpeg", "ffmpeg"),
-        os.path.join(parent_dir, "ffmpeg", "ffmpeg.exe"),
-    ]
     for c in generic:
         if os.path.isfile(c):
             return c
     return None
 
-def _find_ffprobe():
-    env = os.environ.get("TERMPLAYER_FFPROBE")
-    if env and os.path.isfile(env):
-        return env
+def _file_sig(path):
+    try:
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+    except OSError:
+        return None
 
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(script_dir)
-    base_dir = BASE_DIR
-    exe_dir = EXE_DIR
+def _evict_cache_dir(cache_dir, ext, budget_mb, keep=None):
+    """Remove de cache_dir os arquivos *ext menos usados recentemente até o total caber no
+    orçamento (MB). keep nunca é removido (a entrada recém-gravada).
+    """
+    try:
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(ext):
+                p = os.path.join(cache_dir, name)
+                st = os.stat(p)
+                entries.append((st.st_mtime, st.st_size, p))
+    except OSError:
+        return
+    total = sum(e[1] for e in entries)
+    budget = max(0, int(budget_mb)) * 1024 * 1024
+    for _, size, p in sorted(entries):
+        if total <= budget:
+            break
+        if keep and os.path.abspath(p) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(p)
+            total -= size
+        except OSError:
+            pass
 
-    # Priorizar binários locais específicos por OS
-    local_candidates = []
-    if os.name == "nt":
-        if base_dir:
-            local_candidates += [
-                os.path.join(base_dir, "ffmpeg-win", "ffprobe.exe"),
-                os.path.join(base_dir, "ffmpeg-win", "bin", "ffprobe.exe"),
-            ]
-        if exe_dir:
-            local_candidates += [
-                os.path.join(exe_dir, "ffmpeg-win", "ffprobe.exe"),
-                os.path.join(exe_dir, "ffmpeg-win", "bin", "ffprobe.exe"),
-            ]
-        local_candidates += [
-            os.path.join(script_dir, "ffmpeg-win", "ffprobe.exe"),
-            os.path.join(script_dir, "ffmpeg-win", "bin", "ffprobe.exe"),
-            os.path.join(script_dir, "ffmpeg-win", "ffmpeg-8.0-essentials_build", "bin", "ffprobe.exe"),
-            os.path.join(script_dir, "ffmpeg-8.0", "bin", "ffprobe.exe"),
-            os.path.join(script_dir, "bin", "ffprobe.exe"),
-            os.path.join(script_dir, "ffprobe.exe"),
-            os.path.join(parent_dir, "ffmpeg-win", "ffprobe.exe"),
-            os.path.join(parent_dir, "ffmpeg-win", "bin", "ffprobe.exe"),
-            os.path.join(parent_dir, "ffmpeg-win", "ffmpeg-8.0-essentials_build", "bin", "ffprobe.exe"),
-            os.path.join(parent_dir, "ffmpeg-8.0", "bin", "ffprobe.exe"),
-            os.path.join(parent_dir, "bin", "ffprobe.exe"),
-            os.path.join(parent_dir, "ffprobe.exe"),
-        ]
-    elif sys.platform == "darwin":
-        if base_dir:
-            local_candidates += [
-                os.path.join(base_dir, "ffmpeg-mac", "ffprobe"),
-                os.path.join(base_dir, "ffmpeg-mac", "bin", "ffprobe"),
-            ]
-        if exe_dir:
-            local_candidates += [
-                os.path.join(exe_dir, "ffmpeg-mac", "ffprobe"),
-                os.path.join(exe_dir, "ffmpeg-mac", "bin", "ffprobe"),
-            ]
-        local_candidates += [
-            os.path.join(script_dir, "ffmpeg-mac", "ffprobe"),
-            os.path.join(script_dir, "ffmpeg-mac", "bin", "ffprobe"),
-            os.path.join(script_dir, "bin", "ffprobe"),
-            os.path.join(script_dir, "ffprobe"),
-            os.path.join(parent_dir, "ffmpeg-mac", "ffprobe"),
-            os.path.join(parent_dir, "ffmpeg-mac", "bin", "ffprobe"),
-            os.path.join(parent_dir, "bin", "ffprobe"),
-            os.path.join(parent_dir, "ffprobe"),
-        ]
-    else:
-        # Linux e outros Unix
-        if base_dir:
-            local_candidates += [
-                os.path.join(base_dir, "ffmpeg-linux", "ffprobe"),
-                os.path.join(base_dir, "ffmpeg-linux", "bin", "ffprobe"),
-                os.path.join(base_dir, "ffmpeg-linux", "ffmpeg-master-latest-linux64-lgpl", "ffprobe"),
-            ]
-        if exe_dir:
-            local_candidates += [
-                os.path.join(exe_dir, "ffmpeg-linux", "ffprobe"),
-                os.path.join(exe_dir, "ffmpeg-linux", "bin", "ffprobe"),
-                os.path.join(exe_dir, "ffmpeg-linux", "ffmpeg-master-latest-linux64-lgpl", "ffprobe"),
-            ]
-        local_candidates += [
-            os.path.join(script_dir, "ffmpeg-linux", "ffprobe"),
-            os.path.join(script_dir, "ffmpeg-linux", "bin", "ffprobe"),
-            os.path.join(script_dir, "ffmpeg-linux", "ffmpeg-master-latest-linux64-lgpl", "ffprobe"),
-            os.path.join(script_dir, "bin", "ffprobe"),
-            os.path.join(script_dir, "ffprobe"),
-            os.path.join(parent_dir, "ffmpeg-linux", "ffprobe"),
-            os.path.join(parent_dir, "ffmpeg-linux", "bin", "ffprobe"),
-            os.path.join(parent_dir, "ffmpeg-linux", "ffmpeg-master-latest-linux64-lgpl", "ffprobe"),
-            os.path.join(parent_dir, "bin", "ffprobe"),
-            os.path.join(parent_dir, "ffprobe"),
-        ]
+def _toolchain_key():
+    """Tudo que influencia a resolução: overrides, diretórios de busca e PATH."""
+    return {
+        "env": [os.environ.get("TERMPLAYER_FFMPEG", ""), os.environ.get("TERMPLAYER_FFPROBE", "")],
+        "dirs": [BASE_DIR, EXE_DIR or "", os.path.dirname(os.path.abspath(__file__))],
+        "path": os.environ.get("PATH", ""),
+    }
 
-    for c in local_candidates:
-        if os.path.isfile(c):
-            return c
+def _load_toolchain_cache(key):
+    try:
+        with open(TOOLCHAIN_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("key") != key:
+            return None
+        for tool in ("ffmpeg", "ffprobe"):
+            p = data.get(tool)
+            # Resultados negativos não são confiáveis (binário pode ter sido instalado depois)
+            if not p or _file_sig(p) != data.get(tool + "_sig"):
+                return None
+        return data
+    except Exception:
+        return None
 
-    # PATH como fallback
-    p = shutil.which("ffprobe") or shutil.which("ffprobe.exe")
-    if p:
-        return p
+def _save_toolchain_cache(tc):
+    if os.environ.get("TERMPLAYER_NO_TOOLCHAIN_CACHE"):
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = TOOLCHAIN_CACHE_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(tc, f, indent=1)
+        os.replace(tmp, TOOLCHAIN_CACHE_FILE)
+    except Exception:
+        pass
 
-    # Outros caminhos genéricos no projeto
-    generic = [
-        os.path.join(script_dir, "ffmpeg-8.0", "bin", "ffprobe"),
-        os.path.join(script_dir, "ffmpeg-8.0", "bin", "ffprobe.exe"),
-        os.path.join(script_dir, "ffmpeg-8.0", "ffprobe"),
-        os.path.join(script_dir, "ffmpeg-8.0", "ffprobe.exe"),
-        os.path.join(script_dir, "ffmpeg", "bin", "ffprobe"),
-        os.path.join(script_dir, "ffmpeg", "bin", "ffprobe.exe"),
-        os.path.join(script_dir, "ffmpeg", "ffprobe"),
-        os.path.join(script_dir, "ffmpeg", "ffprobe.exe"),
-        os.path.join(parent_dir, "ffmpeg-8.0", "bin", "ffprobe"),
-        os.path.join(parent_dir, "ffmpeg-8.0", "bin", "ffprobe.exe"),
-        os.path.join(parent_dir, "ffmpeg-8.0", "ffprobe"),
-        os.path.join(parent_dir, "ffmpeg-8.0", "ffprobe.exe"),
-        os.path.join(parent_dir, "ffmpeg", "bin", "ffprobe"),
-        os.path.join(parent_dir, "ffmpeg", "bin", "ffprobe.exe"),
-        os.path.join(parent_dir, "ffmpeg", "ffprobe"),
-        os.path.join(parent_dir, "ffmpeg", "ffprobe.exe"),
-    ]
-    for c in generic:
-        if os.path.isfile(c):
-            return c
-    return None
+def _toolchain():
+    """Resolve ffmpeg e ffprobe juntos, uma vez por processo.
+    O resultado também fica em cache/toolchain.json e é revalidado (overrides, PATH,
+    tamanho/mtime dos binários) antes de ser reutilizado em outra execução.
+    """
+    global _TOOLCHAIN
+    with _TOOLCHAIN_LOCK:
+        if _TOOLCHAIN is not None:
+            return _TOOLCHAIN
+        key = _toolchain_key()
+        tc = None
+        if not os.environ.get("TERMPLAYER_NO_TOOLCHAIN_CACHE"):
+            tc = _load_toolchain_cache(key)
+        if tc is None:
+            ffmpeg = _resolve_tool("ffmpeg", "TERMPLAYER_FFMPEG")
+            ffprobe = _resolve_tool("ffprobe", "TERMPLAYER_FFPROBE")
+            tc = {"key": key, "ffmpeg": ffmpeg, "ffprobe": ffprobe,
+                  "ffmpeg_sig": _file_sig(ffmpeg) if ffmpeg else None,
+                  "ffprobe_sig": _file_sig(ffprobe) if ffprobe else None}
+            if ffmpeg and ffprobe:
+                _save_toolchain_cache(tc)
+        _TOOLCHAIN = tc
+        return tc
+
+def _toolchain_capabilities():
+    """Versão, hwaccels e filtros do ffmpeg encontrado (consultados uma vez e guardados no cache)."""
+    tc = _toolchain()
+    if "caps" in tc:
+        return tc["caps"]
+    caps = {"version": "", "hwaccels": [], "filters": []}
+    fff = tc.get("ffmpeg")
+    if fff:
+        def run(*args):
+            try:
+                r = subprocess.run([fff, "-hide_banner", *args], stdout=subprocess.PIPE,
+                                   stderr=subprocess.DEVNULL, timeout=10)
+                return r.stdout.decode("utf-8", errors="ignore").splitlines()
+            except Exception:
+                return []
+        first = run("-version")[:1]
+        caps["version"] = first[0].strip() if first else ""
+        caps["hwaccels"] = [l.strip() for l in run("-hwaccels")[1:] if l.strip()]
+        filters = []
+        for l in run("-filters"):
+            # Linhas no formato " TSC scale  V->V  Descrição"
+            parts = l.split()
+            if len(parts) >= 3 and "->" in parts[2]:
+                filters.append(parts[1])
+        caps["filters"] = filters
+    with _TOOLCHAIN_LOCK:
+        tc["caps"] = caps
+        if tc.get("ffmpeg") and tc.get("ffprobe"):
+            _save_toolchain_cache(tc)
+    return caps
+
+def _find_ffmpeg():
+    return _toolchain()["ffmpeg"]
+
+def _find_ffprobe():
+    return _toolchain()["ffprobe"]
 
 def _enable_windows_ansi():
     if os.name == "nt":
@@ -387,33 +420,193 @@ def _show_cursor():
     sys.stdout.write("\x1b[?25h\x1b[0m")
     sys.stdout.flush()
 
+# ---------- Saída dos frames ----------
+# DEC 2026 (synchronized output): o terminal só apresenta o frame inteiro no fim do bloco.
+# Terminais sem suporte ignoram o modo privado desconhecido.
+SYNC_BEGIN = b"\x1b[?2026h"
+SYNC_END = b"\x1b[?2026l"
+
+class FrameWriter:
+    """Escreve frames já codificados em bytes direto no descritor (os.write), sem TextIOWrapper.
+    Trata escritas parciais e EAGAIN (fd não bloqueante): o frame sai inteiro mesmo quando o
+    terminal ou o pipe está cheio. No Windows, ou quando o stream não tem descritor, usa o
+    buffer binário do stream (ou escrita de texto como último recurso).
+    """
+    def __init__(self, stream=None, sync=True):
+        self.stream = stream if stream is not None else sys.stdout
+        self.sync = sync
+        self.fd = None
+        self.bytes_written = 0
+        self.partial_writes = 0
+        self.eagain = 0
+        if isinstance(self.stream, int):
+            self.fd = self.stream
+            return
+        try:
+            # Texto pendente (limpeza de tela, cursor) sai antes do primeiro frame
+            self.stream.flush()
+        except Exception:
+            pass
+        if os.name != "nt":
+            try:
+                self.fd = self.stream.fileno()
+            except Exception:
+                self.fd = None
+
+    def write(self, data):
+        """Escreve um frame (bytes, ou str codificada uma única vez em UTF-8)."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if self.sync and data:
+            data = b"".join((SYNC_BEGIN, data, SYNC_END))
+        if self.fd is not None:
+            self._write_fd(data)
+        else:
+            buf = getattr(self.stream, "buffer", None)
+            if buf is not None:
+                buf.write(data)
+                buf.flush()
+            else:
+                self.stream.write(data.decode("utf-8"))
+                self.stream.flush()
+        self.bytes_written += len(data)
+        return len(data)
+
+    def _write_fd(self, data):
+        view = memoryview(data)
+        off = 0
+        while off < len(view):
+            try:
+                n = os.write(self.fd, view[off:])
+            except BlockingIOError:
+                # Terminal/pipe cheio: espera o fd aceitar escrita de novo
+                self.eagain += 1
+                select.select([], [self.fd], [])
+                continue
+            except InterruptedError:
+                continue
+            if off + n < len(view):
+                self.partial_writes += 1
+            off += n
+
+    def stats(self):
+        return {"bytes_written": self.bytes_written, "partial_writes": self.partial_writes,
+                "eagain": self.eagain}
+
+# ---------- Cache de metadados (ffprobe) ----------
+MEDIA_CACHE_FILE = os.path.join(BASE_DIR, "media_cache.json")
+MEDIA_CACHE_MAX_ENTRIES = 512
+_MEDIA_CACHE = None
+_MEDIA_CACHE_LOCK = threading.RLock()
+
+def _media_cache():
+    global _MEDIA_CACHE
+    if _MEDIA_CACHE is None:
+        data = {}
+        if os.path.isfile(MEDIA_CACHE_FILE):
+            try:
+                with open(MEDIA_CACHE_FILE, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    data = {}
+            except Exception:
+                data = {}
+        _MEDIA_CACHE = data
+    return _MEDIA_CACHE
+
+def _save_media_cache():
+    try:
+        cache = _media_cache()
+        while len(cache) > MEDIA_CACHE_MAX_ENTRIES:
+            cache.pop(next(iter(cache)))
+        tmp = MEDIA_CACHE_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1)
+        os.replace(tmp, MEDIA_CACHE_FILE)
+    except Exception:
+        pass
+
+def _media_entry(path, create=False):
+    """Entrada do cache para o arquivo, válida apenas se tamanho e mtime não mudaram."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = os.path.abspath(path)
+    with _MEDIA_CACHE_LOCK:
+        cache = _media_cache()
+        e = cache.get(key)
+        if e is not None and (e.get("size") != st.st_size or e.get("mtime_ns") != st.st_mtime_ns):
+            e = None
+        if e is None:
+            if not create:
+                return None
+            e = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        # Reinsere no fim: ordem do dict = ordem de uso (descarte dos mais antigos)
+        cache.pop(key, None)
+        cache[key] = e
+        return e
+
+def _ffprobe_probe(path):
+    """Executa o ffprobe e extrai os metadados usados pelo player."""
+    fp = _find_ffprobe()
+    if not fp:
+        return None
+    out = subprocess.check_output([
+        fp,"-v","error","-show_entries",
+        "stream=codec_type,codec_name,width,height,avg_frame_rate:format=duration","-of","json",path
+    ], stderr=subprocess.DEVNULL)
+    j = json.loads(out.decode("utf-8",errors="ignore"))
+    streams = j.get("streams",[])
+    video = [s for s in streams if s.get("codec_type") == "video"]
+    if not video:
+        return None
+    s = video[0]
+    w = int(s.get("width",0))
+    h = int(s.get("height",0))
+    fr = s.get("avg_frame_rate","0/1")
+    try:
+        num,den = fr.split("/")
+        fps = float(num)/float(den) if float(den)!=0 else 0.0
+    except Exception:
+        fps = 0.0
+    try:
+        duration = float(j.get("format",{}).get("duration",0.0))
+    except Exception:
+        duration = 0.0
+    return {
+        "width": w, "height": h, "fps": fps, "duration": duration,
+        "has_audio": any(s.get("codec_type") == "audio" for s in streams),
+        "codec": s.get("codec_name",""),
+    }
+
 def _ffprobe_info(path):
+    """Metadados do vídeo (width, height, fps, duration, has_audio, codec).
+    Consulta o cache em disco (chave: caminho, tamanho, mtime) antes de chamar o ffprobe.
+    """
     try:
-        fp = _find_ffprobe()
-        if not fp:
-            return None
-        out = subprocess.check_output([
-            fp,"-v","error","-select_streams","v:0","-show_entries","stream=width,height,avg_frame_rate","-of","json",path
-        ], stderr=subprocess.DEVNULL)
-        j = json.loads(out.decode("utf-8",errors="ignore"))
-        streams = j.get("streams",[])
-        if not streams:
+        with _MEDIA_CACHE_LOCK:
+            e = _media_entry(path)
+            if e is not None and "info" in e:
+                return dict(e["info"])
+        info = _ffprobe_probe(path)
+        if info is None:
             return None
-        s = streams[0]
-        w = int(s.get("width",0))
-        h = int(s.get("height",0))
-        fr = s.get("avg_frame_rate","0/1")
-        try:
-            num,den = fr.split("/")
-            fps = float(num)/float(den) if float(den)!=0 else 0.0
-        except Exception:
-            fps = 0.0
-        return {"width":w,"height":h,"fps":fps}
+        with _MEDIA_CACHE_LOCK:
+            e = _media_entry(path, create=True)
+            if e is not None:
+                e["info"] = info
+                _save_media_cache()
+        return dict(info)
     except Exception:
         return None
 
 def _probe_scaled_dimensions(path, cols):
     try:
+        with _MEDIA_CACHE_LOCK:
+            e = _media_entry(path)
+            if e is not None and str(int(cols)) in e.get("scaled", {}):
+                return tuple(e["scaled"][str(int(cols))])
         fff = _find_ffmpeg()
         if not fff:
             return None
@@ -430,11 +623,72 @@ def _probe_scaled_dimensions(path, cols):
             w = int(m.group(1)); h = int(m.group(2))
             if h % 2 == 1:
                 h += 1
+            with _MEDIA_CACHE_LOCK:
+                e = _media_entry(path, create=True)
+                if e is not None:
+                    e.setdefault("scaled", {})[str(int(cols))] = [w, h]
+                    _save_media_cache()
             return w, h
         return None
     except Exception:
         return None
 
+def _keyframe_probe(path):
+    """Timestamps (s) dos keyframes do vídeo, lidos dos pacotes pelo ffprobe (sem decodificar)."""
+    fp = _find_ffprobe()
+    if not fp:
+        return None
+    out = subprocess.check_output([
+        fp,"-v","error","-select_streams","v:0",
+        "-show_entries","packet=pts_time,flags","-of","csv=p=0",path
+    ], stderr=subprocess.DEVNULL)
+    times = []
+    for line in out.decode("utf-8", errors="ignore").splitlines():
+        parts = line.strip().split(",")
+        if len(parts) >= 2 and "K" in parts[1]:
+            try:
+                times.append(round(float(parts[0]), 6))
+            except ValueError:
+                pass
+    return sorted(times)
+
+def _keyframe_index(path):
+    """Índice de keyframes do vídeo, guardado no cache de metadados junto com o probe."""
+    try:
+        with _MEDIA_CACHE_LOCK:
+            e = _media_entry(path)
+            if e is not None and "keyframes" in e:
+                return list(e["keyframes"])
+        times = _keyframe_probe(path)
+        if not times:
+            return None
+        with _MEDIA_CACHE_LOCK:
+            e = _media_entry(path, create=True)
+            if e is not None:
+                e["keyframes"] = times
+                _save_media_cache()
+        return times
+    except Exception:
+        return None
+
+def _seek_target(keyframes, t, duration=0.0, current=None):
+    """Ponto de seek para t: o keyframe mais próximo (decodificação começa sem descartar frames).
+    Com current (posição antes do seek) o keyframe tem de ficar do lado para onde o usuário
+    pulou; se o mais próximo não ficar, usa t exato (-ss preciso, um pouco mais lento).
+    """
+    if duration > 0:
+        t = min(t, max(0.0, duration - 1.0))
+    t = max(0.0, t)
+    if not keyframes:
+        return t
+    import bisect
+    i = bisect.bisect_left(keyframes, t)
+    near = keyframes[max(0, i-1):i+1]
+    k = max(0.0, min(near, key=lambda k: abs(k - t)))
+    if current is not None and ((t > current and k <= current) or (t < current and k >= current)):
+        return t
+    return k
+
 def _normalize_path(p):
     if not p:
         return p
@@ -471,19 +725,24 @@ def _cap_dimensions_by_rows(w, h, max_rows):
         pass
     return w, h
 
-def _build_ffmpeg_video_proc(path, w, h, fps_limit):
+def _build_ffmpeg_video_proc(path, w, h, fps_limit, start=0.0):
     fff = _find_ffmpeg()
     if not fff:
         return None
-    args = [
-        fff,"-loglevel","error","-i",path,
+    args = [fff,"-loglevel","error"]
+    if start and start > 0:
+        # -ss antes do -i: busca no demuxer (rápida quando start cai num keyframe)
+        args += ["-ss",f"{float(start):.3f}"]
+    args += [
+        "-i",path,
         "-f","rawvideo","-pix_fmt","rgb24",
         "-vf",f"scale={w}:{h}",
     ]
     if fps_limit>0:
         args += ["-r",str(int(fps_limit))]
     args += ["-"]
-    return subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    # bufsize=0: stdout é o pipe cru, então readinto grava direto nos buffers dos frames
+    return subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0)
 
 def _convert_audio_to_wav(path):
     tmpdir = tempfile.mkdtemp(prefix="reprodT_")
@@ -495,11 +754,130 @@ def _convert_audio_to_wav(path):
     subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     return wav, tmpdir
 
+def _trim_wav(src, start, dst):
+    """Copia o WAV a partir de start segundos (seek para backends que só tocam arquivos)."""
+    with wave.open(src, 'rb') as wi:
+        rate = wi.getframerate()
+        wi.setpos(min(wi.getnframes(), max(0, int(start * rate))))
+        with wave.open(dst, 'wb') as wo:
+            wo.setnchannels(wi.getnchannels())
+            wo.setsampwidth(wi.getsampwidth())
+            wo.setframerate(rate)
+            while True:
+                data = wi.readframes(65536)
+                if not data:
+                    break
+                wo.writeframes(data)
+    return dst
+
+AUDIO_RATE = 44100
+AUDIO_CHANNELS = 2
+
+def _build_ffmpeg_audio_proc(path, start=0.0):
+    """ffmpeg decodificando o áudio para PCM s16le no stdout (sem arquivo temporário)."""
+    fff = _find_ffmpeg()
+    if not fff:
+        return None
+    args = [fff,"-loglevel","error"]
+    if start and start > 0:
+        args += ["-ss",f"{float(start):.3f}"]
+    args += ["-i",path,"-vn","-ac",str(AUDIO_CHANNELS),"-ar",str(AUDIO_RATE),"-f","s16le","-"]
+    return subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0)
+
+class PcmStream:
+    """PCM s16le lido de um pipe do ffmpeg para um buffer limitado por uma thread própria.
+    Os backends de áudio consomem com read(); a thread só lê adiante até max_seconds.
+    """
+    sampwidth = 2
+
+    def __init__(self, proc, rate=AUDIO_RATE, channels=AUDIO_CHANNELS, max_seconds=2.0):
+        self.proc = proc
+        self.rate = rate
+        self.channels = channels
+        self.frame_size = channels * self.sampwidth
+        self.max_bytes = int(rate * max_seconds) * self.frame_size
+        self._buf = bytearray()
+        self._off = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.eof = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def open(cls, path, start=0.0):
+        proc = _build_ffmpeg_audio_proc(path, start)
+        if proc is None:
+            raise RuntimeError("ffmpeg não encontrado")
+        return cls(proc)
+
+    def _run(self):
+        stream = self.proc.stdout
+        while True:
+            with self._cond:
+                while len(self._buf) - self._off >= self.max_bytes and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            try:
+                chunk = stream.read(65536)
+            except Exception:
+                chunk = b""
+            with self._cond:
+                if not chunk:
+                    self.eof = True
+                    self._cond.notify_all()
+                    return
+                if self._off > len(self._buf) // 2:
+                    del self._buf[:self._off]
+                    self._off = 0
+                self._buf += chunk
+                self._cond.notify_all()
+
+    def read(self, nbytes, timeout=None):
+        """Lê até nbytes (múltiplo do tamanho de frame). Espera dados por até timeout segundos
+        (timeout=0: não bloqueia). Retorna b"" se não houver dados.
+        """
+        with self._cond:
+            if timeout != 0:
+                deadline = None if timeout is None else time.perf_counter() + timeout
+                while len(self._buf) - self._off < nbytes and not self.eof and not self._closed:
+                    left = None if deadline is None else deadline - time.perf_counter()
+                    if left is not None and left <= 0:
+                        break
+                    self._cond.wait(left)
+            n = min(nbytes, len(self._buf) - self._off)
+            n -= n % self.frame_size
+            data = bytes(self._buf[self._off:self._off+n])
+            self._off += n
+            if n:
+                self._cond.notify_all()
+            return data
+
+    @property
+    def finished(self):
+        with self._cond:
+            return self.eof and len(self._buf) == self._off
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        try:
+            self.proc.kill()
+        except Exception:
+            pass
+
+SEEK_STEP = 10.0
+
 class KeyInput:
     def __init__(self):
         self.pause = False
         self.speed = 1.0
         self.quit = False
+        # Pedido de seek pendente: ("rel", segundos) ou ("pct", porcentagem)
+        self.seek = None
+        self.overlay = False
         self._running = True
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._use_keyboard = False
@@ -521,6 +899,14 @@ class KeyInput:
                     self.speed = min(2.0, round(self.speed+0.1,2))
                 elif name in ("down","downarrow"):
                     self.speed = max(0.5, round(self.speed-0.1,2))
+                elif name in ("left","leftarrow"):
+                    self.seek = ("rel", -SEEK_STEP)
+                elif name in ("right","rightarrow"):
+                    self.seek = ("rel", SEEK_STEP)
+                elif len(name) == 1 and name.isdigit():
+                    self.seek = ("pct", int(name)*10)
+                elif name == "i":
+                    self.overlay = not self.overlay
                 elif name == "q":
                     self.quit = True
             self._kb.on_press(on_key, suppress=False)
@@ -536,10 +922,18 @@ class KeyInput:
                             self.pause = not self.pause
                         elif ch == b"q":
                             self.quit = True
+                        elif ch == b"i":
+                            self.overlay = not self.overlay
                         elif ch == b"H":
                             self.speed = min(2.0, round(self.speed+0.1,2))
                         elif ch == b"P":
                             self.speed = max(0.5, round(self.speed-0.1,2))
+                        elif ch == b"K":
+                            self.seek = ("rel", -SEEK_STEP)
+                        elif ch == b"M":
+                            self.seek = ("rel", SEEK_STEP)
+                        elif ch.isdigit():
+                            self.seek = ("pct", int(ch)*10)
                     time.sleep(0.02)
             else:
                 import termios, tty, sys, select
@@ -555,29 +949,64 @@ class KeyInput:
                                 self.pause = not self.pause
                             elif ch == "q":
                                 self.quit = True
+                            elif ch == "i":
+                                self.overlay = not self.overlay
+                            elif ch.isdigit():
+                                self.seek = ("pct", int(ch)*10)
                             elif ch == "\x1b":
                                 seq = sys.stdin.read(2)
                                 if seq == "[A":
                                     self.speed = min(2.0, round(self.speed+0.1,2))
                                 elif seq == "[B":
                                     self.speed = max(0.5, round(self.speed-0.1,2))
+                                elif seq == "[D":
+                                    self.seek = ("rel", -SEEK_STEP)
+                                elif seq == "[C":
+                                    self.seek = ("rel", SEEK_STEP)
                 finally:
                     termios.tcsetattr(fd, termios.TCSADRAIN, old)
 
+    def take_seek(self):
+        """Consome o pedido de seek pendente (ou None)."""
+        req, self.seek = self.seek, None
+        return req
+
     def stop(self):
         self._running = False
 
+def _resample_pcm(data, dtype, channels, n_out):
+    """Reamostragem por vizinho mais próximo de PCM intercalado (mudança de velocidade do áudio)."""
+    x = np.frombuffer(data, dtype=dtype).reshape(-1, channels)
+    if x.shape[0] == 0 or n_out <= 0:
+        return b""
+    idx = np.minimum((np.arange(n_out) * (x.shape[0] / n_out)).astype(np.intp), x.shape[0]-1)
+    return x[idx].tobytes()
+
 class AudioPlayer:
-    """Reprodutor de áudio com fallback para PyAudio ou sounddevice."""
-    def __init__(self, wav_path):
+    """Reprodutor de áudio com fallback para PyAudio ou sounddevice.
+    Toca um WAV (wav_path) ou PCM em streaming do ffmpeg (pcm, um PcmStream; só pyaudio/sounddevice).
+    Informa a posição de reprodução (position()) para servir de relógio mestre do vídeo.
+    """
+    def __init__(self, wav_path=None, pcm=None):
         self.wav_path = wav_path
+        self.pcm = pcm
         self.paused = False
         # Alias de compatibilidade com código legado
         self._paused = self.paused
         self.stop_requested = False
         self.thread = None
         self.lock = threading.Lock()
-        self.backend = AUDIO_BACKEND
+        self.backend = _audio_backend()
+        # Relógio: frames da fonte já entregues ao dispositivo, taxa e latência de saída
+        self.rate = 0
+        self.speed = 1.0
+        self.frames_played = 0
+        self.latency = 0.0
+        self.finished = False
+        self._started_at = None
+        self._restarted = False
+        # Só os backends com thread própria conseguem tocar em outra velocidade
+        self.supports_speed = self.backend in ('pyaudio', 'sounddevice')
         # PyAudio
         self.wf = None
         self.pa = None
@@ -587,42 +1016,79 @@ class AudioPlayer:
         self.sd_data = None
         # Pygame não usa thread própria
 
+    @staticmethod
+    def supports_pcm():
+        """Se o backend detectado toca PCM em streaming (PcmStream) em vez de arquivo WAV."""
+        return _audio_backend() in ('pyaudio', 'sounddevice')
+
     # ---------- PyAudio ----------
     def _playback_thread_pyaudio(self):
         import pyaudio as pa
-        self.wf = wave.open(self.wav_path, 'rb')
         self.pa = pa.PyAudio()
+        if self.pcm is not None:
+            channels, sampwidth, rate = self.pcm.channels, self.pcm.sampwidth, self.pcm.rate
+            frame_size = channels * sampwidth
+            read_frames = lambda n: self.pcm.read(n * frame_size, timeout=0.5)
+        else:
+            self.wf = wave.open(self.wav_path, 'rb')
+            channels, sampwidth, rate = self.wf.getnchannels(), self.wf.getsampwidth(), self.wf.getframerate()
+            read_frames = self.wf.readframes
         self.stream = self.pa.open(
-            format=self.pa.get_format_from_width(self.wf.getsampwidth()),
-            channels=self.wf.getnchannels(),
-            rate=self.wf.getframerate(),
+            format=self.pa.get_format_from_width(sampwidth),
+            channels=channels,
+            rate=rate,
             output=True
         )
+        dtype = {1: np.uint8, 2: np.int16, 4: np.int32}.get(sampwidth)
+        with self.lock:
+            self.rate = rate
+            try:
+                self.latency = float(self.stream.get_output_latency())
+            except Exception:
+                self.latency = 0.0
         chunk = 1024
         while True:
             with self.lock:
                 if self.stop_requested:
                     break
-                if self.paused:
-                    time.sleep(0.05)
-                    continue
-            data = self.wf.readframes(chunk)
+                paused = self.paused
+                speed = self.speed
+            if paused:
+                time.sleep(0.05)
+                continue
+            if speed == 1.0 or dtype is None:
+                data = read_frames(chunk)
+                n_src = len(data) // (sampwidth*channels)
+            else:
+                data = read_frames(max(1, int(round(chunk*speed))))
+                n_src = len(data) // (sampwidth*channels)
+                data = _resample_pcm(data, dtype, channels, int(round(n_src/speed)))
             if not data:
+                if self.pcm is not None and not self.pcm.finished:
+                    # Buffer vazio momentaneamente (ffmpeg atrasado): aguardar mais dados
+                    continue
                 break
             self.stream.write(data)
+            with self.lock:
+                self.frames_played += n_src
+        with self.lock:
+            self.finished = True
         self.stream.stop_stream()
         self.stream.close()
         self.pa.terminate()
-        self.wf.close()
+        if self.wf is not None:
+            self.wf.close()
 
     # ---------- SoundDevice ----------
     def _playback_thread_sounddevice(self):
         import sounddevice as sd, soundfile as sf
         data, sr = sf.read(self.wav_path, dtype='float32')
+        data = data.reshape(len(data), -1)
         self.sd_data = data
         self.sd_event = threading.Event()
+        with self.lock:
+            self.rate = sr
         current_frame = 0
-        chunk_samples = 1024
         def callback(outdata, frames, time_info, status):
             nonlocal current_frame
             if status:
@@ -636,17 +1102,106 @@ class AudioPlayer:
                 if self.paused:
                     outdata[:] = 0
                     return
-            end = current_frame + frames
-            if end > len(data):
-                outdata[:len(data)-current_frame] = data[current_frame:].reshape(-1,1)
-                outdata[len(data)-current_frame:] = 0
-                raise sd.CallbackStop
+                speed = self.speed
+            n_src = frames if speed == 1.0 else max(1, int(round(frames*speed)))
+            src = data[current_frame:current_frame+n_src]
+            if speed == 1.0 or len(src) == 0:
+                outdata[:len(src)] = src
+                outdata[len(src):] = 0
             else:
-                outdata[:] = data[current_frame:end].reshape(-1,1)
-            current_frame = end
-        with sd.OutputStream(samplerate=sr, channels=1, callback=callback, finished_callback=self.sd_event.set):
+                idx = np.minimum((np.arange(frames) * (n_src / frames)).astype(np.intp), len(src)-1)
+                outdata[:] = src[idx]
+            current_frame += len(src)
+            with self.lock:
+                self.frames_played = current_frame
+            if len(src) < n_src:
+                raise sd.CallbackStop
+        def finished():
+            with self.lock:
+                self.finished = True
+            self.sd_event.set()
+        with sd.OutputStream(samplerate=sr, channels=data.shape[1], callback=callback, finished_callback=finished) as stream:
+            with self.lock:
+                try:
+                    self.latency = float(stream.latency)
+                except Exception:
+                    self.latency = 0.0
+            self.sd_event.wait()
+
+    def _playback_thread_sounddevice_pcm(self):
+        import sounddevice as sd
+        pcm = self.pcm
+        self.sd_event = threading.Event()
+        with self.lock:
+            self.rate = pcm.rate
+        frame_size = pcm.frame_size
+        played = 0
+        def callback(outdata, frames, time_info, status):
+            nonlocal played
+            with self.lock:
+                if self.stop_requested:
+                    raise sd.CallbackStop
+                if self.paused:
+                    outdata[:] = b"\x00" * len(outdata)
+                    return
+                speed = self.speed
+            n_src = frames if speed == 1.0 else max(1, int(round(frames*speed)))
+            # Callback de tempo real: nunca bloquear; falta de dados vira silêncio
+            data = pcm.read(n_src * frame_size, timeout=0)
+            got = len(data) // frame_size
+            if speed != 1.0 and got:
+                data = _resample_pcm(data, np.int16, pcm.channels, max(1, int(round(got/speed))))
+            n = min(len(data), len(outdata))
+            outdata[:n] = data[:n]
+            outdata[n:] = b"\x00" * (len(outdata) - n)
+            played += got
+            with self.lock:
+                self.frames_played = played
+            if not got and pcm.finished:
+                raise sd.CallbackStop
+        def finished():
+            with self.lock:
+                self.finished = True
+            self.sd_event.set()
+        with sd.RawOutputStream(samplerate=pcm.rate, channels=pcm.channels, dtype='int16',
+                                callback=callback, finished_callback=finished) as stream:
+            with self.lock:
+                try:
+                    self.latency = float(stream.latency)
+                except Exception:
+                    self.latency = 0.0
             self.sd_event.wait()
 
+    # ---------- Relógio ----------
+    def position(self):
+        """Posição atual do áudio em segundos de mídia, ou None se desconhecida/encerrada."""
+        with self.lock:
+            if self.finished or self.stop_requested:
+                return None
+            if self.backend in ('pyaudio', 'sounddevice'):
+                if not self.rate:
+                    return 0.0 if self.thread is not None else None
+                return max(0.0, self.frames_played/self.rate - self.latency*self.speed)
+            if self.backend == 'pygame':
+                try:
+                    import pygame
+                    if not self.paused and not pygame.mixer.music.get_busy():
+                        return None
+                    ms = pygame.mixer.music.get_pos()
+                    return ms/1000.0 if ms >= 0 else None
+                except Exception:
+                    return None
+            if self.backend == 'winsound':
+                # winsound recomeça do início ao retomar: posição só é conhecida antes da 1ª pausa
+                if self._started_at is None or self._restarted or self.paused:
+                    return None
+                return time.perf_counter() - self._started_at
+            return None
+
+    def set_speed(self, speed):
+        with self.lock:
+            self.speed = float(speed)
+
     # ---------- Interface comum ----------
     def start(self):
         if self.thread is not None:
@@ -669,7 +1224,7 @@ class AudioPlayer:
         if self.backend == 'pyaudio':
             target = self._playback_thread_pyaudio
         elif self.backend == 'sounddevice':
-            target = self._playback_thread_sounddevice
+            target = self._playback_thread_sounddevice_pcm if self.pcm is not None else self._playback_thread_sounddevice
         elif self.backend == 'winsound':
             try:
                 import winsound
@@ -677,6 +1232,7 @@ class AudioPlayer:
                 with self.lock:
                     self.paused = False
                     self._paused = self.paused
+                    self._started_at = time.perf_counter()
             except Exception as e:
                 try:
                     print(Fore.RED + f"[AudioPlayer] Falha ao iniciar winsound: {e}" + Style.RESET_ALL)
@@ -719,6 +1275,7 @@ class AudioPlayer:
                         winsound.PlaySound(self.wav_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
                         self.paused = False
                         self._paused = False
+                        self._restarted = True
                     return
                 except Exception:
                     pass
@@ -739,6 +1296,7 @@ class AudioPlayer:
                 try:
                     import winsound
                     winsound.PlaySound(self.wav_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+                    self._restarted = True
                 except Exception:
                     pass
             self.paused = False
@@ -764,45 +1322,571 @@ class AudioPlayer:
             return
         if self.backend == 'sounddevice' and self.sd_event:
             self.sd_event.set()
+        if self.pcm is not None:
+            self.pcm.close()
         if self.thread:
             self.thread.join()
             self.thread = None
 
-def _render_frame(rgb, width, height, truecolor, prev_lines_cache, left_pad=0, top_pad=0):
-    rows = height//2
-    lines = []
-    for y in range(rows):
-        y0 = y*2
-        y1 = y*2+1
-        row_top = rgb[y0]
-        row_bot = rgb[y1] if y1<height else np.zeros_like(row_top)
-        sb = []
-        last_fg = None
-        last_bg = None
-        for x in range(width):
-            rt = row_top[x]
-            rb = row_bot[x]
-            if truecolor:
-                fg = (int(rt[0]), int(rt[1]), int(rt[2]))
-                bg = (int(rb[0]), int(rb[1]), int(rb[2]))
-                if fg != last_fg:
-                    sb.append(_ansi_fg_true(*fg))
-                    last_fg = fg
-                if bg != last_bg:
-                    sb.append(_ansi_bg_true(*bg))
-                    last_bg = bg
-            else:
-                fgc = _rgb_to_ansi256(int(rt[0]),int(rt[1]),int(rt[2]))
-                bgc = _rgb_to_ansi256(int(rb[0]),int(rb[1]),int(rb[2]))
-                if fgc != last_fg:
-                    sb.append(_ansi_fg_256(fgc))
-                    last_fg = fgc
-                if bgc != last_bg:
-                    sb.append(_ansi_bg_256(bgc))
-                    last_bg = bgc
-            sb.append("\u2584")
-        line = "".join(sb)
-        lines.append(line)
+# ---------- Sincronização A/V ----------
+class MediaClock:
+    """Relógio mestre da reprodução (em segundos de mídia).
+    Segue a posição informada pelo áudio; sem áudio utilizável (ausente, encerrado,
+    ou velocidade que o backend não acompanha) usa o relógio de parede a partir da última posição.
+    """
+    def __init__(self, audio=None):
+        self.audio = audio
+        self.speed = 1.0
+        self.paused = False
+        self.source = "wall"
+        # Posição de mídia em que o áudio atual começou (seek reinicia o áudio nesse ponto)
+        self.offset = 0.0
+        self._base_pos = 0.0
+        self._base_t = time.perf_counter()
+
+    def _wall(self):
+        if self.paused:
+            return self._base_pos
+        return self._base_pos + (time.perf_counter() - self._base_t) * self.speed
+
+    def _rebase(self, pos):
+        self._base_pos = pos
+        self._base_t = time.perf_counter()
+
+    def now(self):
+        pos = None
+        if self.audio is not None and (self.speed == 1.0 or self.audio.supports_speed):
+            pos = self.audio.position()
+        if pos is None:
+            self.source = "wall"
+            return self._wall()
+        self.source = "audio"
+        pos += self.offset
+        # Mantém a base do relógio de parede alinhada para uma troca de fonte sem saltos
+        self._rebase(pos)
+        return pos
+
+    def seek(self, pos, audio=None):
+        """Reposiciona o relógio em pos (s), seguindo o áudio reiniciado nesse ponto."""
+        self.audio = audio
+        self.offset = float(pos)
+        self._rebase(self.offset)
+        if audio is not None and audio.supports_speed and self.speed != 1.0:
+            audio.set_speed(self.speed)
+
+    def set_speed(self, speed):
+        self._rebase(self._wall())
+        self.speed = float(speed)
+        if self.audio is not None and self.audio.supports_speed:
+            self.audio.set_speed(speed)
+
+    def pause(self):
+        self._rebase(self._wall())
+        self.paused = True
+
+    def resume(self):
+        self._base_t = time.perf_counter()
+        self.paused = False
+
+AV_SYNC_TOLERANCE = 0.08
+
+class VideoScheduler:
+    """Agenda os frames de vídeo contra o MediaClock.
+    Frame n tem pts = n/fps: se está adiantado, espera (hold); se atrasou mais que a
+    tolerância, descarta frames até alcançar o relógio.
+    """
+    def __init__(self, clock, fps, tolerance=AV_SYNC_TOLERANCE):
+        self.clock = clock
+        self.frame_dt = 1.0 / max(1e-6, float(fps))
+        self.tolerance = float(tolerance)
+        self.frame_no = 0
+        self.presented = 0
+        self.dropped = 0
+        self.max_drift = 0.0
+        self._drift_sum = 0.0
+        self.last_drift = 0.0
+
+    def plan(self):
+        """Retorna (espera, descartes): segundos (de parede) a aguardar e frames a descartar."""
+        master = self.clock.now()
+        drift = self.frame_no * self.frame_dt - master
+        if drift > 0:
+            return drift / max(self.clock.speed, 1e-6), 0
+        if -drift > self.tolerance:
+            return 0.0, int(-drift / self.frame_dt)
+        return 0.0, 0
+
+    def skip(self, n):
+        self.frame_no += n
+        self.dropped += n
+
+    def seek(self, frame_no):
+        """Próximo frame a exibir passa a ser frame_no (após um seek; não conta como descarte)."""
+        self.frame_no = int(frame_no)
+
+    def present(self):
+        """Registra a exibição do frame atual (drift medido contra o relógio mestre)."""
+        drift = self.frame_no * self.frame_dt - self.clock.now()
+        self.last_drift = drift
+        self.max_drift = max(self.max_drift, abs(drift))
+        self._drift_sum += abs(drift)
+        self.presented += 1
+        self.frame_no += 1
+
+    def stats(self):
+        return {
+            "clock": self.clock.source,
+            "presented": self.presented,
+            "sync_dropped": self.dropped,
+            "drift_max": self.max_drift,
+            "drift_mean": self._drift_sum / self.presented if self.presented else 0.0,
+        }
+
+# Degraus de qualidade do governador: (fração das colunas, truecolor, divisor de FPS).
+# Do mais barato visualmente ao mais agressivo: cor 256, metade do FPS, menos colunas.
+QUALITY_LEVELS = [
+    (1.0, True, 1),
+    (1.0, False, 1),
+    (1.0, False, 2),
+    (0.75, False, 2),
+    (0.5, False, 2),
+    (0.5, False, 3),
+]
+
+class QualityGovernor:
+    """Controle em malha fechada da qualidade para cumprir o prazo de cada frame.
+    Mede decodificação (espera pelo ring), renderização, escrita e bytes por frame; a carga
+    é o tempo ocupado sobre o orçamento do frame (média móvel). Histerese: desce um degrau
+    após down_frames frames seguidos acima de down_load (ou atrasados), sobe só depois de
+    up_hold segundos abaixo de up_load; subir e cair logo em seguida dobra esse tempo.
+    """
+    def __init__(self, frame_dt, truecolor=True, enabled=True, down_load=0.9, up_load=0.55,
+                 down_frames=12, up_hold=3.0):
+        levels = []
+        for scale, tc, div in QUALITY_LEVELS:
+            lv = (scale, tc and truecolor, div)
+            if lv not in levels:
+                levels.append(lv)
+        self.levels = levels
+        self.frame_dt = frame_dt
+        self.enabled = enabled
+        self.down_load, self.up_load = down_load, up_load
+        self.down_frames = down_frames
+        self.up_hold = self._base_hold = up_hold
+        self.level = 0
+        self.changes = 0
+        self.load = 0.0
+        self.ewma = {"decode": 0.0, "render": 0.0, "write": 0.0, "bytes": 0.0}
+        self._over = 0
+        self._under_since = None
+        self._last_up = None
+
+    @property
+    def state(self):
+        return self.levels[self.level]
+
+    @property
+    def fps_div(self):
+        return self.state[2]
+
+    def record(self, decode, render, write, nbytes, late=False, speed=1.0):
+        """Registra um frame exibido. Retorna True se o degrau de qualidade mudou."""
+        a = 0.2
+        for k, v in (("decode", decode), ("render", render), ("write", write), ("bytes", nbytes)):
+            self.ewma[k] += a * (v - self.ewma[k])
+        budget = self.frame_dt * self.fps_div / max(speed, 1e-6)
+        self.load += a * ((decode + render + write) / budget - self.load)
+        if not self.enabled:
+            return False
+        now = time.perf_counter()
+        if late or self.load > self.down_load:
+            self._over += 1
+            self._under_since = None
+        else:
+            self._over = 0
+        if self._over >= self.down_frames and self.level < len(self.levels) - 1:
+            if self._last_up is not None and now - self._last_up < self.up_hold * 2:
+                # Subida recente não se sustentou: espera mais antes de tentar de novo
+                self.up_hold = min(self.up_hold * 2, 60.0)
+            self._change(self.level + 1)
+            return True
+        if self.load < self.up_load and self.level > 0:
+            if self._under_since is None:
+                self._under_since = now
+            elif now - self._under_since >= self.up_hold:
+                self._last_up = now
+                self._change(self.level - 1)
+                return True
+        elif self.load >= self.up_load:
+            self._under_since = None
+        if self._last_up is not None and now - self._last_up > 30.0:
+            self.up_hold = self._base_hold
+        return False
+
+    def _change(self, level):
+        self.level = level
+        self.changes += 1
+        self._over = 0
+        self._under_since = None
+
+    def describe(self, fps):
+        """Degrau escolhido, para o HUD."""
+        scale, tc, div = self.state
+        return (f"Q{self.level}/{len(self.levels)-1}{'' if self.enabled else ' fixo'}"
+                f" {'24-bit' if tc else '256'} {fps/div:.0f}fps")
+
+# ---------- Instrumentação por frame ----------
+TRACE_FIELDS = ("t", "frame", "read", "wait", "reshape", "render", "write", "sleep",
+                "dropped", "bytes", "drift", "level")
+
+class FrameTrace:
+    """Anel pré-alocado (NumPy) com as medidas de cada frame exibido: tempos por etapa (s),
+    frames descartados antes dele, bytes emitidos, drift A/V e degrau de qualidade.
+    Um único escritor (o laço de reprodução) e nenhum lock: a linha é gravada antes de o
+    contador avançar, e os leitores (HUD, dump) só copiam linhas já completas.
+    """
+    def __init__(self, capacity=1024):
+        self.buf = np.zeros((max(1, int(capacity)), len(TRACE_FIELDS)), dtype=np.float64)
+        self.n = 0
+        self._t0 = time.perf_counter()
+
+    def record(self, frame, read, wait, reshape, render, write, sleep, dropped, nbytes, drift, level):
+        self.buf[self.n % len(self.buf)] = (time.perf_counter() - self._t0, frame, read, wait, reshape,
+                                             render, write, sleep, dropped, nbytes, drift, level)
+        self.n += 1
+
+    def rows(self, last=None):
+        """Cópia das linhas em ordem cronológica (as last mais recentes, se informado)."""
+        cap = len(self.buf)
+        n = min(self.n, cap, last or cap)
+        idx = (np.arange(self.n - n, self.n) % cap)
+        return self.buf[idx]
+
+    def summary(self, last=60):
+        r = self.rows(last)
+        if len(r) == 0:
+            return None
+        m = dict(zip(TRACE_FIELDS, r.mean(axis=0).tolist()))
+        m["dropped"] = float(r[:, TRACE_FIELDS.index("dropped")].sum())
+        return m
+
+    def hud(self, cols, rows, gov, fps):
+        """Linha do HUD: médias dos últimos frames e a etapa que limita a reprodução."""
+        m = self.summary()
+        if m is None:
+            return ""
+        stages = {"decodificação": m["wait"], "render": m["reshape"] + m["render"], "terminal": m["write"]}
+        bound = max(stages, key=stages.get)
+        if m["sleep"] > sum(stages.values()):
+            bound = "folga"
+        ms = lambda k: f"{m[k]*1000:.1f}"
+        return (f" {cols}x{rows} {gov.describe(fps)} | ler {ms('read')} esp {ms('wait')} cél {ms('reshape')}"
+                f" ren {ms('render')} esc {ms('write')} dorm {ms('sleep')} ms | {m['bytes']/1024:.1f}KB"
+                f" | desc {m['dropped']:.0f} | drift {m['drift']*1000:+.0f}ms | {bound} ")
+
+    def dump(self, path):
+        """Grava o trace em CSV ou JSON (pela extensão). Só as últimas len(buf) linhas se o anel deu a volta."""
+        r = self.rows()
+        if path.lower().endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"fields": list(TRACE_FIELDS), "frames": r.tolist(),
+                           "total_frames": self.n, "summary": self.summary(last=len(r))}, f)
+        else:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(",".join(TRACE_FIELDS) + "\n")
+                for row in r.tolist():
+                    f.write(",".join(f"{v:.6g}" for v in row) + "\n")
+
+def _restart_video(ring, proc, npath, w, h, fps, start):
+    """Para o decodificador atual e reinicia o ffmpeg em start segundos. Retorna (proc, ring)."""
+    ring.stop()
+    try:
+        proc.kill()
+    except Exception:
+        pass
+    proc = _build_ffmpeg_video_proc(npath, w, h, fps, start=start)
+    if proc is None:
+        return None, None
+    return proc, FrameRing(proc, w, h).start()
+
+# ---------- Renderização vetorizada ----------
+_HALF_BLOCK = "\u2584"
+_RENDER_TABLES = None
+
+# Modos de renderização: pixels (largura, altura) por célula de terminal.
+# half: ▄ com 2 pixels por célula; quadrant: blocos de quadrante (2x2); braille: pontos (2x4).
+RENDER_MODES = {"half": (1, 2), "quadrant": (2, 2), "braille": (2, 4)}
+RENDER_MODE_NAMES = {"half": "Meio bloco (▄)", "quadrant": "Quadrantes (2x2)", "braille": "Braille (2x4)"}
+# Glifos indexados pelo código guardado nos bits 32+ da chave de frente (0 = ▄ do modo half):
+# 1-16 quadrantes pela máscara (1=sup. esq., 2=sup. dir., 4=inf. esq., 8=inf. dir.),
+# 17-272 Braille pela máscara de pontos (U+2800 + máscara).
+_QUADRANT_GLYPHS = " \u2598\u259d\u2580\u2596\u258c\u259e\u259b\u2597\u259a\u2590\u259c\u2584\u2599\u259f\u2588"
+_GLYPHS = [_HALF_BLOCK] + list(_QUADRANT_GLYPHS) + [chr(0x2800 + m) for m in range(256)]
+_GLYPH_BASE = {"half": 0, "quadrant": 1, "braille": 17}
+# Peso de cada pixel da célula (ordem linha/coluna) na máscara do glifo
+_GLYPH_WEIGHTS = {
+    "quadrant": (1, 2, 4, 8),
+    "braille": (0x01, 0x08, 0x02, 0x10, 0x04, 0x20, 0x40, 0x80),
+}
+
+def _render_tables():
+    """Tabelas pré-computadas (construídas uma única vez) usadas pelo renderer.
+    Sequências de escape viram consultas em arrays de objetos indexados por canal/cor.
+    """
+    global _RENDER_TABLES
+    if _RENDER_TABLES is None:
+        dec = [str(i) for i in range(256)]
+        _RENDER_TABLES = {
+            "fg_true_r": np.array(["\x1b[38;2;" + d + ";" for d in dec], dtype=object),
+            "bg_true_r": np.array(["\x1b[48;2;" + d + ";" for d in dec], dtype=object),
+            "mid": np.array([d + ";" for d in dec], dtype=object),
+            "end": np.array([d + "m" for d in dec], dtype=object),
+            "fg_256": np.array([_ansi_fg_256(c) for c in range(256)], dtype=object),
+            "bg_256": np.array([_ansi_bg_256(c) for c in range(256)], dtype=object),
+            # Quantização 256 por canal e para tons de cinza (mesma regra de _rgb_to_ansi256)
+            "six": np.array([int((x/255)*5+0.5) for x in range(256)], dtype=np.intp),
+            "gray": np.array([_rgb_to_ansi256(v, v, v) for v in range(256)], dtype=np.intp),
+            # Número de dígitos decimais (modelo de custo em bytes do renderer com damage tracking)
+            "ndig": np.array([len(d) for d in dec], dtype=np.intp),
+            "glyphs": np.array(_GLYPHS, dtype=object),
+            "glyph_len": np.array([len(g.encode("utf-8")) for g in _GLYPHS], dtype=np.intp),
+        }
+    return _RENDER_TABLES
+
+_ANSI256_LUT = None
+_ANSI256_LUT_FILE = os.path.join(CACHE_DIR, "ansi256_lut_v1.npy")
+
+def _build_ansi256_lut():
+    """Constrói a LUT 24-bit → ANSI-256 (2^24 entradas uint8, indexada por 0xRRGGBB)."""
+    t = _render_tables()
+    six = t["six"].astype(np.uint8)
+    lut = (16 + 36*six[:, None, None] + 6*six[None, :, None] + six[None, None, :]).reshape(-1)
+    # Diagonal de cinzas (r == g == b) usa a rampa 232-255
+    diag = np.arange(256, dtype=np.uint32) * 0x010101
+    lut[diag] = t["gray"].astype(np.uint8)
+    return lut
+
+def _ansi256_lut():
+    """Retorna a LUT ANSI-256, carregando do cache em disco (mmap) ou construindo uma única vez."""
+    global _ANSI256_LUT
+    if _ANSI256_LUT is not None:
+        return _ANSI256_LUT
+    lut = None
+    if os.path.isfile(_ANSI256_LUT_FILE):
+        try:
+            arr = np.load(_ANSI256_LUT_FILE, mmap_mode="r", allow_pickle=False)
+            if arr.dtype == np.uint8 and arr.shape == (1 << 24,):
+                lut = arr
+        except Exception:
+            lut = None
+    if lut is None:
+        lut = _build_ansi256_lut()
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = _ANSI256_LUT_FILE + ".tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, lut, allow_pickle=False)
+            os.replace(tmp, _ANSI256_LUT_FILE)
+        except Exception:
+            pass
+    _ANSI256_LUT = lut
+    return lut
+
+def _pack_rgb(px):
+    """(..., 3) uint8 → inteiros 0xRRGGBB (uint32)."""
+    px = px.astype(np.uint32)
+    return (px[..., 0] << 16) | (px[..., 1] << 8) | px[..., 2]
+
+def _rgb_to_ansi256_np(rgb):
+    """Versão vetorizada de _rgb_to_ansi256: um único gather na LUT para o frame inteiro."""
+    return _ansi256_lut()[_pack_rgb(rgb)]
+
+def _frame_cells(rgb, width, height, truecolor, mode="half"):
+    """Converte o frame RGB em chaves de cor por célula (frente = pixel de cima, fundo = de baixo).
+    Truecolor: inteiro 0xRRGGBB; 256 cores: índice da paleta.
+    Nos modos quadrant/braille (width x height em pixels do modo) ver _fit_cells.
+    """
+    if mode != "half":
+        return _fit_cells(rgb, width, height, truecolor, mode)
+    rows = height//2
+    top = rgb[0:rows*2:2, :width]
+    bot = rgb[1:rows*2:2, :width]
+    fg, bg = _pack_rgb(top), _pack_rgb(bot)
+    if truecolor:
+        return fg, bg
+    lut = _ansi256_lut()
+    return lut[fg], lut[bg]
+
+def _fit_cells(rgb, width, height, truecolor, mode):
+    """Melhor ajuste de duas cores por célula nos modos de glifo, vetorizado no frame inteiro.
+    Os pixels de cada célula são divididos no meio da faixa do canal de maior variação; cada
+    grupo vira a média de suas cores (frente = pixels acesos do glifo, fundo = o resto).
+    A frente é uint64 com o código do glifo nos bits 32+ (ver _split_glyphs), de modo que
+    comparar chaves também detecta troca de glifo.
+    """
+    cx, cy = RENDER_MODES[mode]
+    cols, rows = width//cx, height//cy
+    k = cx*cy
+    # Eixo 0 = pixel dentro da célula: as reduções viram operações elemento a elemento
+    v = (rgb[:rows*cy, :cols*cx].reshape(rows, cy, cols, cx, 3).transpose(1, 3, 0, 2, 4)
+         .reshape(k, rows, cols, 3).astype(np.int16))
+    lo = v.min(axis=0)
+    hi = v.max(axis=0)
+    axis = (hi - lo).argmax(axis=2)[:, :, None]
+    mid = np.take_along_axis(lo + hi, axis, axis=2)[..., 0]
+    chan = np.take_along_axis(v, np.broadcast_to(axis[None, :, :, :], (k, rows, cols, 1)), axis=3)[..., 0]
+    on = 2*chan > mid
+    n_on = on.sum(axis=0, dtype=np.int32)[..., None]
+    n_off = k - n_on
+    total = v.sum(axis=0, dtype=np.int32)
+    sum_on = (v * on[..., None]).sum(axis=0, dtype=np.int32)
+    back = (total - sum_on + n_off//2) // n_off
+    front = np.where(n_on > 0, (sum_on + n_on//2) // np.maximum(n_on, 1), back)
+    code = np.tensordot(np.array(_GLYPH_WEIGHTS[mode], dtype=np.intp), on, axes=(0, 0)) + _GLYPH_BASE[mode]
+    fg, bg = _pack_rgb(front.astype(np.uint8)), _pack_rgb(back.astype(np.uint8))
+    if not truecolor:
+        lut = _ansi256_lut()
+        fg, bg = lut[fg], lut[bg]
+    return fg.astype(np.uint64) | (code.astype(np.uint64) << np.uint64(32)), bg
+
+def _split_glyphs(fg):
+    """Separa a chave de frente em (cor, códigos de glifo); glifos None = ▄ em todas as células."""
+    if fg.dtype != np.uint64:
+        return fg, None
+    return (fg & np.uint64(0xFFFFFFFF)).astype(np.uint32), (fg >> np.uint64(32)).astype(np.intp)
+
+def _change_masks(fg, bg):
+    """Máscaras (linhas, colunas) de células cuja cor de frente/fundo difere da célula à esquerda."""
+    fg_chg = np.ones(fg.shape, dtype=bool)
+    bg_chg = np.ones(bg.shape, dtype=bool)
+    np.not_equal(fg[:, 1:], fg[:, :-1], out=fg_chg[:, 1:])
+    np.not_equal(bg[:, 1:], bg[:, :-1], out=bg_chg[:, 1:])
+    return fg_chg, bg_chg
+
+def _cell_tokens(fg, bg, truecolor, fg_mask, bg_mask, glyphs=None):
+    """Array de objetos com o texto de cada célula: escapes (onde a máscara pede) + glifo."""
+    t = _render_tables()
+    fk = fg[fg_mask]
+    bk = bg[bg_mask]
+    if truecolor:
+        fesc = t["fg_true_r"][(fk >> 16) & 255] + t["mid"][(fk >> 8) & 255] + t["end"][fk & 255]
+        besc = t["bg_true_r"][(bk >> 16) & 255] + t["mid"][(bk >> 8) & 255] + t["end"][bk & 255]
+    else:
+        fesc = t["fg_256"][fk]
+        besc = t["bg_256"][bk]
+    ftok = np.full(fg.shape, "", dtype=object)
+    btok = np.full(bg.shape, "", dtype=object)
+    ftok[fg_mask] = fesc
+    btok[bg_mask] = besc
+
+    chg = fg_mask | bg_mask
+    if glyphs is None:
+        cells = np.full(fg.shape, _HALF_BLOCK, dtype=object)
+        cells[chg] = ftok[chg] + btok[chg] + _HALF_BLOCK
+    else:
+        cells = t["glyphs"][glyphs]
+        cells[chg] = ftok[chg] + btok[chg] + cells[chg]
+    return cells
+
+def _encode_cells(fg, bg, truecolor):
+    """Gera as linhas ANSI a partir das chaves de cor das células.
+    As máscaras de mudança de cor são calculadas por linha inteira; só as células
+    onde frente/fundo mudam recebem sequência de escape.
+    """
+    rows, width = fg.shape
+    if rows == 0 or width == 0:
+        return [""]*rows
+    fg, glyphs = _split_glyphs(fg)
+    fg_chg, bg_chg = _change_masks(fg, bg)
+    cells = _cell_tokens(fg, bg, truecolor, fg_chg, bg_chg, glyphs)
+    return ["".join(r) for r in cells.tolist()]
+
+# ---------- Backend de bytes (tabela de dígitos + indexação NumPy) ----------
+# Cada célula ocupa uma faixa de largura fixa num buffer uint8: peças (escape com os dígitos
+# de um canal, glifo) são copiadas de tabelas [valor, byte] por fancy indexing e uma máscara
+# marca os bytes válidos; a compactação pela máscara produz o frame sem objetos por célula.
+_BYTE_TABLES = None
+
+def _byte_tables():
+    """Tabelas uint8 [valor 0-255, byte] (com máscara de bytes válidos) de cada peça."""
+    global _BYTE_TABLES
+    if _BYTE_TABLES is None:
+        def table_of(pieces):
+            width = max(len(p) for p in pieces)
+            tab = np.zeros((len(pieces), width), dtype=np.uint8)
+            valid = np.zeros((len(pieces), width), dtype=bool)
+            for i, p in enumerate(pieces):
+                tab[i, :len(p)] = np.frombuffer(p, dtype=np.uint8)
+                valid[i, :len(p)] = True
+            return tab, valid
+        def table(fmt):
+            return table_of([fmt.format(i).encode("ascii") for i in range(256)])
+        _BYTE_TABLES = {
+            "fg_true_r": table("\x1b[38;2;{};"),
+            "bg_true_r": table("\x1b[48;2;{};"),
+            "mid": table("{};"),
+            "end": table("{}m"),
+            "fg_256": table("\x1b[38;5;{}m"),
+            "bg_256": table("\x1b[48;5;{}m"),
+            "glyph": np.frombuffer(_HALF_BLOCK.encode("utf-8"), dtype=np.uint8),
+            "glyphs": table_of([g.encode("utf-8") for g in _GLYPHS]),
+        }
+    return _BYTE_TABLES
+
+def _cell_bytes(fg, bg, truecolor, fg_mask, bg_mask, glyphs=None):
+    """Equivalente em bytes de _cell_tokens: (buffer uint8, offsets) com a célula i
+    (ordem linha/coluna) em buf[offs[i]:offs[i+1]].
+    """
+    t = _byte_tables()
+    f = fg.ravel()
+    b = bg.ravel()
+    fm = fg_mask.ravel()[:, None]
+    bm = bg_mask.ravel()[:, None]
+    if truecolor:
+        segs = [("fg_true_r", (f >> 16) & 255, fm), ("mid", (f >> 8) & 255, fm), ("end", f & 255, fm),
+                ("bg_true_r", (b >> 16) & 255, bm), ("mid", (b >> 8) & 255, bm), ("end", b & 255, bm)]
+    else:
+        segs = [("fg_256", f, fm), ("bg_256", b, bm)]
+    glyph = t["glyph"] if glyphs is None else t["glyphs"][0]
+    width = sum(t[name][0].shape[1] for name, _, _ in segs) + (glyph.size if glyphs is None else glyph.shape[1])
+    n = f.size
+    scratch = np.empty((n, width), dtype=np.uint8)
+    valid = np.empty((n, width), dtype=bool)
+    c = 0
+    for name, keys, mask in segs:
+        tab, ok = t[name]
+        k = tab.shape[1]
+        keys = keys.astype(np.intp, copy=False)
+        scratch[:, c:c+k] = tab[keys]
+        np.logical_and(ok[keys], mask, out=valid[:, c:c+k])
+        c += k
+    if glyphs is None:
+        scratch[:, c:] = glyph
+        valid[:, c:] = True
+    else:
+        g = glyphs.ravel()
+        scratch[:, c:] = glyph[g]
+        valid[:, c:] = t["glyphs"][1][g]
+    offs = np.zeros(n+1, dtype=np.int64)
+    np.cumsum(valid.sum(axis=1), out=offs[1:])
+    return scratch[valid], offs
+
+def _encode_cells_bytes(fg, bg, truecolor):
+    """Como _encode_cells, mas gera as linhas já em bytes UTF-8."""
+    rows, width = fg.shape
+    if rows == 0 or width == 0:
+        return [b""]*rows
+    fg, glyphs = _split_glyphs(fg)
+    fg_chg, bg_chg = _change_masks(fg, bg)
+    buf, offs = _cell_bytes(fg, bg, truecolor, fg_chg, bg_chg, glyphs)
+    data = buf.tobytes()
+    bounds = offs[::width].tolist()
+    return [data[bounds[r]:bounds[r+1]] for r in range(rows)]
+
+def _compose_frame(lines, prev_lines_cache, left_pad=0, top_pad=0):
+    """Monta a saída do frame reaproveitando linhas idênticas ao frame anterior.
+    Linhas em bytes (backend de bytes) geram a saída em bytes.
+    """
     out = []
     out.append("\x1b[H")
     if top_pad and top_pad > 0:
@@ -817,16 +1901,1111 @@ def _render_frame(rgb, width, height, truecolor, prev_lines_cache, left_pad=0, t
             out.append(line)
             out.append("\n")
     out.append("\x1b[0m")
-    return "".join(out), lines
+    if lines and isinstance(lines[0], bytes):
+        return b"".join(p if isinstance(p, bytes) else p.encode("ascii") for p in out)
+    return "".join(out)
+
+ENCODERS = ("str", "bytes")
+ENCODER_CACHE_FILE = os.path.join(CACHE_DIR, "encoder.json")
+_ENCODER = {}
+_ENCODER_LOCK = threading.Lock()
+
+def _select_encoder(truecolor, width=120, height=68, repeat=3):
+    """Micro-benchmark dos dois backends num frame ruidoso no modo de cor pedido (incluindo a
+    codificação para bytes que a saída exige). Retorna o nome do mais rápido.
+    """
+    rgb = np.random.default_rng(0).integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    fg, bg = _frame_cells(rgb, width, height, truecolor)
+    best = None
+    for name in ENCODERS:
+        _encode_lines(fg, bg, truecolor, name)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            lines = _encode_lines(fg, bg, truecolor, name)
+            if name == "str":
+                "".join(lines).encode("utf-8")
+        elapsed = time.perf_counter() - t0
+        if best is None or elapsed < best[1]:
+            best = (name, elapsed)
+    return best[0]
+
+def _encoder_cache_key():
+    """O vencedor muda com o interpretador, o numpy e o próprio código de codificação."""
+    return [sys.version, np.__version__, _file_sig(os.path.abspath(__file__))]
+
+def _load_encoder_cache():
+    try:
+        with open(ENCODER_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("key") == _encoder_cache_key():
+            return {m: e for m, e in data.get("encoders", {}).items() if e in ENCODERS}
+    except Exception:
+        pass
+    return {}
+
+def _save_encoder_cache(encoders):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = ENCODER_CACHE_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": _encoder_cache_key(), "encoders": encoders}, f, indent=1)
+        os.replace(tmp, ENCODER_CACHE_FILE)
+    except Exception:
+        pass
+
+def _encoder(truecolor=True):
+    """Backend de codificação para o modo de cor (truecolor ou 256 cores): TERMPLAYER_ENCODER
+    (str/bytes) ou o vencedor de _select_encoder para aquele modo. A medição roda uma vez e fica
+    em cache/encoder.json; play_video_file resolve os dois modos antes de começar a tocar.
+    """
+    mode = "truecolor" if truecolor else "256"
+    enc = _ENCODER.get(mode)
+    if enc is None:
+        with _ENCODER_LOCK:
+            if not _ENCODER:
+                forced = os.environ.get("TERMPLAYER_ENCODER", "").strip().lower()
+                if forced in ENCODERS:
+                    _ENCODER.update({"truecolor": forced, "256": forced})
+                else:
+                    _ENCODER.update(_load_encoder_cache())
+            if mode not in _ENCODER:
+                _ENCODER[mode] = _select_encoder(truecolor)
+                _save_encoder_cache(_ENCODER)
+            enc = _ENCODER[mode]
+    return enc
+
+def _encode_lines(fg, bg, truecolor, encoder=None):
+    if (encoder or _encoder(truecolor)) == "bytes":
+        return _encode_cells_bytes(fg, bg, truecolor)
+    return _encode_cells(fg, bg, truecolor)
+
+def _render_frame(rgb, width, height, truecolor, prev_lines_cache, left_pad=0, top_pad=0, encoder=None, mode="half"):
+    """Frame completo com cache de linhas. A saída é str ou bytes conforme o backend
+    (encoder: "str", "bytes" ou None para o escolhido na inicialização).
+    """
+    fg, bg = _frame_cells(rgb, width, height, truecolor, mode)
+    lines = _encode_lines(fg, bg, truecolor, encoder)
+    return _compose_frame(lines, prev_lines_cache, left_pad, top_pad), lines
+
+# ---------- Damage tracking (atualização só das células alteradas) ----------
+_GLYPH_BYTES = len(_HALF_BLOCK.encode("utf-8"))
+
+def _escape_costs(fg, bg, truecolor):
+    """Tamanho em bytes das sequências de frente/fundo de cada célula."""
+    nd = _render_tables()["ndig"]
+    if truecolor:
+        # \x1b[38;2;R;G;Bm → 10 bytes fixos + dígitos
+        fl = 10 + nd[(fg >> 16) & 255] + nd[(fg >> 8) & 255] + nd[fg & 255]
+        bl = 10 + nd[(bg >> 16) & 255] + nd[(bg >> 8) & 255] + nd[bg & 255]
+    else:
+        # \x1b[38;5;Nm → 8 bytes fixos + dígitos
+        fl = 8 + nd[fg]
+        bl = 8 + nd[bg]
+    return fl, bl
+
+def _ndigits(n):
+    return len(str(int(n)))
+
+def _compose_damage(fg, bg, truecolor, prev_cells, left_pad=0, top_pad=0, encoder=None, force_rows=None):
+    """Monta o frame reescrevendo só os trechos de células que mudaram desde prev_cells.
+    Para cada linha alterada um modelo de custo (bytes) escolhe entre trechos posicionados
+    com CSI n G e a reescrita da linha inteira. Sem prev_cells (ou com outra geometria),
+    gera o frame completo. force_rows lista linhas reescritas por inteiro mesmo sem mudança
+    (a tela foi sobrescrita por fora, ex.: o HUD). A saída é str ou bytes conforme o backend
+    (ver _render_frame).
+    """
+    encoder = encoder or _encoder(truecolor)
+    rows, width = fg.shape
+    if prev_cells is None or prev_cells[0].shape != fg.shape or width == 0:
+        return _compose_frame(_encode_lines(fg, bg, truecolor, encoder), None, left_pad, top_pad)
+    pfg, pbg = prev_cells
+    dirty = (fg != pfg) | (bg != pbg)
+    if force_rows:
+        dirty[[r for r in force_rows if 0 <= r < rows]] = True
+    dirty_rows = np.flatnonzero(dirty.any(axis=1))
+    if dirty_rows.size == 0:
+        return b"" if encoder == "bytes" else ""
+
+    fg, glyphs = _split_glyphs(fg)
+    sub_fg = fg[dirty_rows]
+    sub_bg = bg[dirty_rows]
+    sub_gl = glyphs[dirty_rows] if glyphs is not None else None
+    d = dirty[dirty_rows]
+    nrows = dirty_rows.size
+    fg_chg, bg_chg = _change_masks(sub_fg, sub_bg)
+    fl, bl = _escape_costs(sub_fg, sub_bg, truecolor)
+    # Custo de cada célula dentro de um trecho contínuo e custo extra quando ela inicia um trecho
+    glyph_bytes = _GLYPH_BYTES if sub_gl is None else _render_tables()["glyph_len"][sub_gl]
+    base = glyph_bytes + fg_chg*fl + bg_chg*bl
+    extra = (~fg_chg)*fl + (~bg_chg)*bl
+    csum = np.zeros((nrows, width+1), dtype=np.int64)
+    np.cumsum(base, axis=1, out=csum[:, 1:])
+
+    col0 = int(left_pad) + 1 if left_pad and left_pad > 0 else 1
+    row0 = int(top_pad) + 1 if top_pad and top_pad > 0 else 1
+    move_g = 3 + _ndigits(col0 + width)
+    row_nos = dirty_rows + row0
+    cup = np.array([4 + _ndigits(r) + _ndigits(col0 + width) for r in row_nos.tolist()], dtype=np.int64)
+
+    # Trechos contínuos de células alteradas, em ordem de linha/coluna
+    run_start = d.copy()
+    run_start[:, 1:] &= ~d[:, :-1]
+    run_end = d.copy()
+    run_end[:, :-1] &= ~d[:, 1:]
+    sr, sx = np.nonzero(run_start)
+    _, ex = np.nonzero(run_end)
+    ex = ex + 1
+    # Une trechos vizinhos na mesma linha quando reemitir o intervalo custa menos que reposicionar
+    same_row = sr[1:] == sr[:-1]
+    gap_cost = csum[sr[1:], sx[1:]] - csum[sr[1:], ex[:-1]]
+    brk = ~same_row | (gap_cost > move_g + extra[sr[1:], sx[1:]])
+    seg_r = sr[np.r_[True, brk]]
+    seg_s = sx[np.r_[True, brk]]
+    seg_e = ex[np.r_[brk, True]]
+    first = np.r_[True, seg_r[1:] != seg_r[:-1]]
+    seg_cost = csum[seg_r, seg_e] - csum[seg_r, seg_s] + extra[seg_r, seg_s] + np.where(first, 0, move_g)
+    span_cost = np.bincount(seg_r, weights=seg_cost, minlength=nrows) + cup
+    full_cost = csum[:, width] + cup
+    use_span = span_cost < full_cost
+
+    keep = use_span[seg_r]
+    seg_r, seg_s, seg_e, first = seg_r[keep], seg_s[keep], seg_e[keep], first[keep]
+    fg_mask = fg_chg
+    bg_mask = bg_chg
+    fg_mask[seg_r, seg_s] = True
+    bg_mask[seg_r, seg_s] = True
+    spans = {}
+    for r, a, b, f in zip(seg_r.tolist(), seg_s.tolist(), seg_e.tolist(), first.tolist()):
+        spans.setdefault(r, []).append((a, b, f))
+    if encoder == "bytes":
+        buf, offs = _cell_bytes(sub_fg, sub_bg, truecolor, fg_mask, bg_mask, sub_gl)
+        data = buf.tobytes()
+        offs = offs.tolist()
+        out = []
+        for k, row_no in enumerate(row_nos.tolist()):
+            base_i = k * width
+            if k in spans:
+                for a, b, f in spans[k]:
+                    out.append(b"\x1b[%d;%dH" % (row_no, col0 + a) if f else b"\x1b[%dG" % (col0 + a))
+                    out.append(data[offs[base_i + a]:offs[base_i + b]])
+            else:
+                out.append(b"\x1b[%d;%dH" % (row_no, col0))
+                out.append(data[offs[base_i]:offs[base_i + width]])
+        out.append(b"\x1b[0m")
+        return b"".join(out)
+
+    tokens = _cell_tokens(sub_fg, sub_bg, truecolor, fg_mask, bg_mask, sub_gl).tolist()
+    out = []
+    for k, row_no in enumerate(row_nos.tolist()):
+        toks = tokens[k]
+        if k in spans:
+            for a, b, f in spans[k]:
+                out.append(f"\x1b[{row_no};{col0 + a}H" if f else f"\x1b[{col0 + a}G")
+                out.append("".join(toks[a:b]))
+        else:
+            out.append(f"\x1b[{row_no};{col0}H")
+            out.append("".join(toks))
+    out.append("\x1b[0m")
+    return "".join(out)
+
+def _render_frame_damage(rgb, width, height, truecolor, prev_cells, left_pad=0, top_pad=0, encoder=None, mode="half"):
+    """Como _render_frame, mas com damage tracking por célula.
+    Retorna (saída, cells); cells deve ser passado como prev_cells no frame seguinte.
+    """
+    cells = _frame_cells(rgb, width, height, truecolor, mode)
+    return _compose_damage(cells[0], cells[1], truecolor, prev_cells, left_pad, top_pad, encoder), cells
+
+# ---------- Quantização perceptual e histerese temporal de cor ----------
+# Passo relativo de cada canal: o olho distingue menos variações de azul e de vermelho que de verde
+_TOLERANCE_WEIGHTS = (1.25, 1.0, 2.0)
+# Pesos de luminância (x256) da diferença usada na histerese
+_HYSTERESIS_WEIGHTS = (77, 150, 29)
+
+class ColorStabilizer:
+    """Estágio opcional antes do renderer que reduz o volume de escapes em vídeo ruidoso.
+    hysteresis mantém, em cada pixel, a última cor aceita enquanto a cor nova diferir dela
+    menos que o limiar (diferença ponderada pela luminância), então mais células e linhas
+    repetem o frame anterior; o erro fica limitado ao limiar. tolerance arredonda em seguida
+    cada canal para múltiplos do passo (escalado por _TOLERANCE_WEIGHTS), alongando as
+    sequências de células com a mesma cor. A histerese vem antes do arredondamento para que
+    o ruído perto de uma fronteira de passo não alterne entre dois níveis.
+    Quando pelo menos bypass_ratio dos pixels mudam além do limiar (movimento de câmera), a
+    histerese é pulada naquele frame: segurar o resto só fragmenta os trechos e aumentava os
+    bytes em até 27% numa panorâmica em 256 cores. Com limiar alto (16) um movimento lento
+    fica todo abaixo dele e ainda custa ~7% a mais nesse caso: por isso vem desligada (0).
+    """
+    def __init__(self, tolerance=0, hysteresis=0, bypass_ratio=0.5):
+        self.tolerance = max(0, int(tolerance))
+        self.hysteresis = max(0, int(hysteresis))
+        self.bypass_ratio = bypass_ratio
+        self.bypassed = 0
+        self.ref = None
+        self.lut = None
+        if self.tolerance > 1:
+            v = np.arange(256)
+            self.lut = np.empty((3, 256), dtype=np.uint8)
+            for c, wgt in enumerate(_TOLERANCE_WEIGHTS):
+                step = max(1, int(round(self.tolerance * wgt)))
+                self.lut[c] = np.minimum(255, (v + step // 2) // step * step)
+
+    @property
+    def enabled(self):
+        return self.lut is not None or self.hysteresis > 0
+
+    def reset(self):
+        """Esquece as cores aceitas (seek, nova geometria)."""
+        self.ref = None
+
+    def apply(self, rgb):
+        """Retorna o frame estabilizado (novo array; rgb não é alterado)."""
+        src = rgb
+        if self.hysteresis > 0:
+            ref = self.ref
+            if ref is None or ref.shape != rgb.shape:
+                ref = self.ref = rgb.copy()
+            else:
+                d = np.abs(rgb.astype(np.int32) - ref)
+                wr, wg, wb = _HYSTERESIS_WEIGHTS
+                accept = (d[..., 0]*wr + d[..., 1]*wg + d[..., 2]*wb) >= self.hysteresis * 256
+                if accept.mean() >= self.bypass_ratio:
+                    # Movimento (pan, corte de cena): segurar os poucos pixels parados só fragmenta
+                    # os trechos e pode aumentar os bytes. O frame passa inteiro.
+                    np.copyto(ref, rgb)
+                    self.bypassed += 1
+                else:
+                    np.copyto(ref, rgb, where=accept[..., None])
+            src = ref
+        if self.lut is None:
+            return src.copy()
+        out = np.empty_like(src)
+        for c in range(3):
+            np.take(self.lut[c], src[..., c], out=out[..., c])
+        return out
+
+# ---------- Renderização paralela (faixas de linhas em processos) ----------
+_BAND_SHM = None
+_BAND_FRAME = None
+
+def _attach_shm(name):
+    """Anexa um bloco multiprocessing.shared_memory criado por outro processo (sem rastreá-lo)."""
+    from multiprocessing import shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 não tem track=
+        return shared_memory.SharedMemory(name=name)
+
+def _band_worker_init(shm_name, shape):
+    """Inicializador dos workers: anexa o bloco de memória compartilhada do frame."""
+    global _BAND_SHM, _BAND_FRAME
+    _BAND_SHM = _attach_shm(shm_name)
+    _BAND_FRAME = np.ndarray(shape, dtype=np.uint8, buffer=_BAND_SHM.buf)
+
+def _encode_band(r0, r1, width, truecolor, mode="half"):
+    """Codifica as linhas de terminal [r0, r1) do frame compartilhado."""
+    cy = RENDER_MODES[mode][1]
+    rgb = _BAND_FRAME[r0*cy:r1*cy]
+    fg, bg = _frame_cells(rgb, width, (r1-r0)*cy, truecolor, mode)
+    return _encode_cells(fg, bg, truecolor)
+
+class ParallelRenderer:
+    """Codifica o frame em faixas horizontais num pool de processos.
+    O frame é copiado uma vez para um bloco multiprocessing.shared_memory; cada worker
+    lê sua faixa direto do bloco e devolve as linhas ANSI, remontadas em ordem.
+    Desligado por padrão (render_workers = 0): o ganho depende de núcleos livres e a cópia +
+    IPC por frame custa caro; com 1 CPU benchmarks/bench_workers.py mede 0.7-1.07x.
+    """
+    def __init__(self, w, h, truecolor, workers, mode="half"):
+        import multiprocessing
+        from multiprocessing import shared_memory
+        from concurrent.futures import ProcessPoolExecutor
+        self.w, self.h = w, h
+        self.truecolor = truecolor
+        self.mode = mode
+        self.workers = max(1, int(workers))
+        rows = h//RENDER_MODES[mode][1]
+        n = max(1, min(self.workers, rows))
+        edges = [rows*i//n for i in range(n+1)]
+        self.bands = [(edges[i], edges[i+1]) for i in range(n) if edges[i] < edges[i+1]]
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, w*h*3))
+        self.frame = np.ndarray((h, w, 3), dtype=np.uint8, buffer=self.shm.buf)
+        try:
+            # spawn: o pool sobe com KeyInput, áudio e FrameRing já rodando, e um fork copiaria
+            # locks presos por essas threads para os filhos
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_band_worker_init,
+                                            initargs=(self.shm.name, (h, w, 3)),
+                                            mp_context=multiprocessing.get_context("spawn"))
+        except Exception:
+            self._release_shm()
+            raise
+
+    def encode(self, rgb):
+        """Retorna as linhas ANSI do frame (mesmo resultado de _encode_cells)."""
+        np.copyto(self.frame, rgb[:self.h, :self.w])
+        futures = [self.pool.submit(_encode_band, r0, r1, self.w, self.truecolor, self.mode) for r0, r1 in self.bands]
+        lines = []
+        for f in futures:
+            lines.extend(f.result())
+        return lines
+
+    def render(self, rgb, prev_lines_cache, left_pad=0, top_pad=0):
+        """Equivalente a _render_frame usando o pool."""
+        lines = self.encode(rgb)
+        return _compose_frame(lines, prev_lines_cache, left_pad, top_pad), lines
+
+    def _release_shm(self):
+        self.frame = None
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except Exception:
+            pass
+
+    def close(self):
+        try:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+        except Exception:
+            pass
+        self._release_shm()
+
+def _render_frame_py(rgb, width, height, truecolor, prev_lines_cache, left_pad=0, top_pad=0):
+    """Implementação de referência (laço por pixel).
+    Mantida para validar e medir o renderer vetorizado (ver benchmarks/).
+    """
+    rows = height//2
+    lines = []
+    for y in range(rows):
+        y0 = y*2
+        y1 = y*2+1
+        row_top = rgb[y0]
+        row_bot = rgb[y1] if y1<height else np.zeros_like(row_top)
+        sb = []
+        last_fg = None
+        last_bg = None
+        for x in range(width):
+            rt = row_top[x]
+            rb = row_bot[x]
+            if truecolor:
+                fg = (int(rt[0]), int(rt[1]), int(rt[2]))
+                bg = (int(rb[0]), int(rb[1]), int(rb[2]))
+                if fg != last_fg:
+                    sb.append(_ansi_fg_true(*fg))
+                    last_fg = fg
+                if bg != last_bg:
+                    sb.append(_ansi_bg_true(*bg))
+                    last_bg = bg
+            else:
+                fgc = _rgb_to_ansi256(int(rt[0]),int(rt[1]),int(rt[2]))
+                bgc = _rgb_to_ansi256(int(rb[0]),int(rb[1]),int(rb[2]))
+                if fgc != last_fg:
+                    sb.append(_ansi_fg_256(fgc))
+                    last_fg = fgc
+                if bgc != last_bg:
+                    sb.append(_ansi_bg_256(bgc))
+                    last_bg = bgc
+            sb.append("\u2584")
+        line = "".join(sb)
+        lines.append(line)
+    return _compose_frame(lines, prev_lines_cache, left_pad, top_pad), lines
+
+# ---------- Saídas gráficas (protocolo Kitty / Sixel) ----------
+GRAPHICS_BACKENDS = ("auto", "ansi", "kitty", "sixel")
+GRAPHICS_NAMES = {"auto": "Automático", "ansi": "ANSI (blocos)", "kitty": "Kitty graphics", "sixel": "Sixel"}
+_GRAPHICS = None
+_CELL_PIXELS = None
+
+def _query_terminal(seq, timeout=0.25):
+    """Envia seq ao terminal e lê a resposta até a do DA1 (ESC [ ? ... c), que todo terminal VT
+    responde e por isso marca o fim. Só em POSIX com stdin/stdout num tty; senão retorna b"".
+    """
+    if os.name == "nt":
+        return b""
+    try:
+        import termios, select
+        fd_in, fd_out = sys.stdin.fileno(), sys.stdout.fileno()
+        if not (os.isatty(fd_in) and os.isatty(fd_out)):
+            return b""
+        old = termios.tcgetattr(fd_in)
+    except Exception:
+        return b""
+    resp = b""
+    try:
+        new = termios.tcgetattr(fd_in)
+        new[3] &= ~(termios.ECHO | termios.ICANON)
+        new[6][termios.VMIN] = 0
+        new[6][termios.VTIME] = 0
+        termios.tcsetattr(fd_in, termios.TCSANOW, new)
+        os.write(fd_out, seq + b"\x1b[c")
+        deadline = time.perf_counter() + timeout
+        while True:
+            left = deadline - time.perf_counter()
+            if left <= 0 or not select.select([fd_in], [], [], left)[0]:
+                break
+            chunk = os.read(fd_in, 1024)
+            if not chunk:
+                break
+            resp += chunk
+            if resp.endswith(b"c") and b"\x1b[?" in resp:
+                break
+    except Exception:
+        pass
+    finally:
+        try:
+            termios.tcsetattr(fd_in, termios.TCSANOW, old)
+        except Exception:
+            pass
+    return resp
+
+def _parse_terminal_reply(resp):
+    """(kitty, sixel, tamanho da célula em pixels ou None) a partir da resposta de _query_terminal."""
+    kitty = b"\x1b_Gi=31;OK" in resp
+    m = re.search(rb"\x1b\[\?([\d;]*)c", resp)
+    sixel = bool(m) and "4" in m.group(1).decode("ascii").split(";")
+    m = re.search(rb"\x1b\[6;(\d+);(\d+)t", resp)
+    cell = (int(m.group(2)), int(m.group(1))) if m and int(m.group(1)) and int(m.group(2)) else None
+    return kitty, sixel, cell
+
+def _cell_pixel_size():
+    """Tamanho (largura, altura) em pixels de uma célula do terminal; None se desconhecido."""
+    if _CELL_PIXELS is not None:
+        return _CELL_PIXELS
+    try:
+        import fcntl, termios
+        rows, cols, xp, yp = struct.unpack("HHHH", fcntl.ioctl(sys.stdout.fileno(), termios.TIOCGWINSZ, b"\0"*8))
+        if rows and cols and xp and yp:
+            return xp // cols, yp // rows
+    except Exception:
+        pass
+    return None
+
+def _detect_graphics():
+    """Protocolo de imagem do terminal: "kitty", "sixel" ou "ansi" (memoizado).
+    Ordem: TERMPLAYER_GRAPHICS, variáveis de ambiente de terminais conhecidos e, num tty POSIX,
+    a consulta do protocolo Kitty (a=q) e do tamanho da célula (CSI 16 t) seguidas de DA1
+    (atributo 4 = Sixel).
+    """
+    global _GRAPHICS, _CELL_PIXELS
+    if _GRAPHICS is not None:
+        return _GRAPHICS
+    forced = os.environ.get("TERMPLAYER_GRAPHICS", "").strip().lower()
+    term = os.environ.get("TERM", "").lower()
+    prog = os.environ.get("TERM_PROGRAM", "").lower()
+    if forced in GRAPHICS_BACKENDS and forced != "auto":
+        kind = forced
+    elif term == "xterm-kitty" or os.environ.get("KITTY_WINDOW_ID") or prog in ("wezterm", "ghostty"):
+        kind = "kitty"
+    else:
+        kitty, sixel, cell = _parse_terminal_reply(
+            _query_terminal(b"\x1b_Gi=31,s=1,v=1,a=q,t=d,f=24;AAAA\x1b\\\x1b[16t"))
+        if cell:
+            _CELL_PIXELS = cell
+        kind = "kitty" if kitty else "sixel" if sixel else "ansi"
+    _GRAPHICS = kind
+    return kind
+
+class KittyBackend:
+    """Frames pelo protocolo gráfico do Kitty: RGB comprimido com zlib (o=z), em base64
+    fatiado em blocos de até 4096 bytes. O mesmo id de imagem e de posicionamento é reusado
+    a cada frame, então o terminal substitui a imagem em vez de acumular novas. A imagem é
+    escalada pelo terminal para a área de células (c=, r=), o que permite mandar meia
+    resolução da célula e economizar banda.
+    """
+    name = "kitty"
+
+    def __init__(self, cell_px=None, image_id=None, chunk=4096, level=1):
+        cw, ch = cell_px or _cell_pixel_size() or (8, 16)
+        self.cell_pixels = (max(1, cw // 2), max(2, ch // 2))
+        self.image_id = image_id or (os.getpid() & 0xFFFFFF) or 1
+        self.chunk = chunk - chunk % 4
+        self.level = level
+
+    def begin(self):
+        return b""
+
+    def frame(self, rgb, cols, rows, left_pad=0, top_pad=0):
+        import base64
+        h, w = rgb.shape[:2]
+        data = base64.b64encode(zlib.compress(np.ascontiguousarray(rgb).tobytes(), self.level))
+        n = self.chunk
+        chunks = [data[i:i+n] for i in range(0, len(data), n)] or [b""]
+        # z=-1: a imagem fica sob o texto, então o HUD continua legível por cima do vídeo
+        head = b"a=T,f=24,o=z,s=%d,v=%d,i=%d,p=1,c=%d,r=%d,C=1,q=2,z=-1" % (w, h, self.image_id, cols, rows)
+        out = [b"\x1b[%d;%dH" % (top_pad + 1, left_pad + 1)]
+        last = len(chunks) - 1
+        for i, c in enumerate(chunks):
+            ctl = head + b",m=%d" % (i < last) if i == 0 else b"m=%d" % (i < last)
+            out.append(b"\x1b_G" + ctl + b";" + c + b"\x1b\\")
+        return b"".join(out)
+
+    def end(self, clear=True):
+        """Apaga a imagem (clear=False a deixa na tela, como numa imagem estática)."""
+        return b"\x1b_Ga=d,d=I,i=%d,q=2\x1b\\" % self.image_id if clear else b""
+
+_SIXEL_PALETTE = None
+_SIXEL_RLE = {}
+
+def _sixel_palette():
+    """RGB (256, 3) de cada índice produzido por _ansi256_lut: cubo 6x6x6 uniforme (mesma
+    quantização da LUT) e rampa de cinzas 232-255.
+    """
+    global _SIXEL_PALETTE
+    if _SIXEL_PALETTE is None:
+        pal = np.zeros((256, 3), dtype=np.uint8)
+        v = np.arange(6) * 51
+        pal[16:232] = np.stack(np.meshgrid(v, v, v, indexing="ij"), axis=-1).reshape(-1, 3)
+        pal[232:] = (8 + np.arange(24) * 247 / 24 + 0.5).astype(np.uint8)[:, None]
+        _SIXEL_PALETTE = pal
+    return _SIXEL_PALETTE
+
+def _sixel_rle_table(width):
+    """Tabela uint8 (com máscara de válidos) de b"!n" para n = 0..width (repetição Sixel)."""
+    tab = _SIXEL_RLE.get(width)
+    if tab is None:
+        pieces = [b"!%d" % n for n in range(width + 1)]
+        tw = max(len(p) for p in pieces)
+        t = np.zeros((width + 1, tw), dtype=np.uint8)
+        ok = np.zeros((width + 1, tw), dtype=bool)
+        for n, p in enumerate(pieces):
+            t[n, :len(p)] = np.frombuffer(p, dtype=np.uint8)
+            ok[n, :len(p)] = True
+        tab = _SIXEL_RLE[width] = (t, ok)
+    return tab
+
+def _sixel_encode(idx, palette):
+    """Codifica uma imagem de índices de paleta (H, W) em Sixel (DCS completo, bytes).
+    Só as cores usadas viram registradores. Os bits de cada (faixa de 6 linhas, cor, coluna)
+    são montados de uma vez com indexação NumPy e as repetições (!n) saem de um RLE vetorizado.
+    """
+    H, W = idx.shape
+    used = np.flatnonzero(np.bincount(idx.ravel(), minlength=256))
+    remap = np.zeros(256, dtype=np.intp)
+    remap[used] = np.arange(used.size)
+    ci = remap[idx]
+    nb = (H + 5) // 6
+    P = used.size
+    # Uma linha de saída por par (faixa, cor) presente, em ordem de faixa e registrador
+    key = (np.arange(H) // 6)[:, None] * P + ci
+    present = np.bincount(key.ravel(), minlength=nb * P) > 0
+    row_of = np.cumsum(present) - 1
+    band, reg = np.divmod(np.flatnonzero(present), P)
+    R = band.size
+    sel = np.zeros((R, W), dtype=np.uint8)
+    xs = np.arange(W)
+    for k in range(6):
+        sel[row_of[key[k::6]], xs] |= np.uint8(1 << k)
+
+    # Trechos de mesmo valor por linha; o vazio final ("?") de cada linha é descartado
+    start = np.ones(sel.shape, dtype=bool)
+    np.not_equal(sel[:, 1:], sel[:, :-1], out=start[:, 1:])
+    rr, rx = np.nonzero(start)
+    value = sel[rr, rx]
+    row_end = np.r_[rr[1:] != rr[:-1], True]
+    length = np.r_[rx[1:], 0] - rx
+    length[row_end] = W - rx[row_end]
+    keep = ~(row_end & (value == 0))
+    rr, length, char = rr[keep], length[keep], value[keep] + 63
+
+    # Cada trecho numa faixa fixa: "!n" (trechos >= 4) + até 3 cópias do caractere
+    tab, ok = _sixel_rle_table(W)
+    tw = tab.shape[1]
+    long_run = length >= 4
+    scratch = np.empty((rr.size, tw + 3), dtype=np.uint8)
+    valid = np.zeros((rr.size, tw + 3), dtype=bool)
+    scratch[:, :tw] = tab[length]
+    valid[:, :tw] = ok[length] & long_run[:, None]
+    scratch[:, tw:] = char[:, None]
+    reps = np.where(long_run, 1, length)
+    valid[:, tw:] = np.arange(3)[None, :] < reps[:, None]
+    data = scratch[valid].tobytes()
+    offs = np.zeros(R + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rr, weights=valid.sum(axis=1), minlength=R).astype(np.int64), out=offs[1:])
+
+    pal = palette[used].astype(np.int32) * 100 // 255
+    out = [b'\x1bP0;1;0q"1;1;%d;%d' % (W, H)]
+    out.extend(b"#%d;2;%d;%d;%d" % (i, r, g, b) for i, (r, g, b) in enumerate(pal.tolist()))
+    offs = offs.tolist()
+    band = band.tolist()
+    for i, c in enumerate(reg.tolist()):
+        out.append(b"#%d" % c)
+        out.append(data[offs[i]:offs[i+1]])
+        if i + 1 < R:
+            out.append(b"$" if band[i+1] == band[i] else b"-" * (band[i+1] - band[i]))
+    out.append(b"\x1b\\")
+    return b"".join(out)
+
+class SixelBackend:
+    """Frames em Sixel: cores quantizadas pela LUT ANSI-256 (um gather no frame inteiro) e
+    codificadas por _sixel_encode. Sixel desenha pixel a pixel, então o frame usa o tamanho
+    real da célula. O modo 8452 mantém o cursor ao lado da imagem (sem rolar a tela).
+    """
+    name = "sixel"
+
+    def __init__(self, cell_px=None):
+        self.cell_pixels = cell_px or _cell_pixel_size() or (8, 16)
+
+    def begin(self):
+        return b"\x1b[?8452h"
+
+    def frame(self, rgb, cols, rows, left_pad=0, top_pad=0):
+        idx = _ansi256_lut()[_pack_rgb(rgb)]
+        return b"\x1b[%d;%dH" % (top_pad + 1, left_pad + 1) + _sixel_encode(idx, _sixel_palette())
+
+    def end(self, clear=True):
+        return b"\x1b[?8452l"
+
+def _graphics_backend(pref="auto"):
+    """Instância da saída gráfica escolhida (pref ou detecção); None = renderer ANSI."""
+    kind = _detect_graphics() if pref == "auto" else pref
+    if kind == "kitty":
+        return KittyBackend()
+    if kind == "sixel":
+        return SixelBackend()
+    return None
+
+def _read_exact(proc, size):
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = proc.stdout.read(size - len(buf))
+        if not chunk:
+            return None
+        buf.extend(chunk)
+    return bytes(buf)
+
+def _readinto_exact(stream, mv):
+    """Preenche o memoryview inteiro a partir do stream via readinto. Retorna False em EOF."""
+    pos = 0
+    size = len(mv)
+    while pos < size:
+        n = stream.readinto(mv[pos:])
+        if not n:
+            return False
+        pos += n
+    return True
+
+class FrameReader:
+    """Leitura síncrona de frames rawvideo para um único buffer NumPy reutilizável.
+    Nenhuma alocação por frame: o pipe grava direto no buffer via readinto.
+    """
+    def __init__(self, stream, w, h):
+        self.stream = stream
+        self.frame = np.empty((h, w, 3), dtype=np.uint8)
+        self._view = memoryview(self.frame).cast("B")
+
+    def read(self):
+        """Retorna o próximo frame (o mesmo array, sobrescrito a cada leitura) ou None em EOF."""
+        return self.frame if _readinto_exact(self.stream, self._view) else None
+
+    def skip(self, n):
+        """Descarta n frames reaproveitando o buffer. Retorna quantos foram descartados."""
+        for i in range(int(n)):
+            if not _readinto_exact(self.stream, self._view):
+                return i
+        return int(n)
+
+FRAME_RING_SLOTS = 4
+
+class FrameRing:
+    """Pipeline produtor/consumidor de frames decodificados.
+    Uma thread lê o rawvideo do ffmpeg para um anel de buffers NumPy pré-alocados;
+    o laço de renderização consome com get()/release() e descarta frames com drop().
+    """
+    def __init__(self, proc, w, h, slots=FRAME_RING_SLOTS):
+        self.proc = proc
+        self.shape = (h, w, 3)
+        slots = max(2, int(slots))
+        self.buffers = [np.empty(self.shape, dtype=np.uint8) for _ in range(slots)]
+        self._views = [memoryview(b).cast("B") for b in self.buffers]
+        self._free = deque(range(slots))
+        self._ready = deque()
+        # Tempo de leitura do pipe de cada slot (instrumentação: quanto o ffmpeg levou para entregar o frame)
+        self.read_times = [0.0] * slots
+        self._cond = threading.Condition()
+        self._stop = False
+        self.eof = False
+        # Estatísticas
+        self.decoded = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.decode_stall = 0.0   # produtor esperando slot livre (render/escrita lentos)
+        self.render_stall = 0.0   # consumidor esperando frame (decodificação lenta)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        stream = self.proc.stdout
+        while True:
+            with self._cond:
+                if not self._free and not self._stop:
+                    t0 = time.perf_counter()
+                    while not self._free and not self._stop:
+                        self._cond.wait()
+                    self.decode_stall += time.perf_counter() - t0
+                if self._stop:
+                    return
+                idx = self._free.popleft()
+            t0 = time.perf_counter()
+            try:
+                ok = _readinto_exact(stream, self._views[idx])
+            except Exception:
+                ok = False
+            self.read_times[idx] = time.perf_counter() - t0
+            with self._cond:
+                if not ok:
+                    self._free.appendleft(idx)
+                    self.eof = True
+                    self._cond.notify_all()
+                    return
+                self._ready.append(idx)
+                self.decoded += 1
+                self.max_depth = max(self.max_depth, len(self._ready))
+                self._cond.notify_all()
+
+    def get(self):
+        """Próximo frame decodificado como (slot, array); None quando o stream termina."""
+        with self._cond:
+            if not self._ready and not self.eof and not self._stop:
+                t0 = time.perf_counter()
+                while not self._ready and not self.eof and not self._stop:
+                    self._cond.wait()
+                self.render_stall += time.perf_counter() - t0
+            if not self._ready:
+                return None
+            idx = self._ready.popleft()
+            return idx, self.buffers[idx]
+
+    def release(self, idx):
+        with self._cond:
+            self._free.append(idx)
+            self._cond.notify_all()
+
+    def drop(self, n):
+        """Descarta até n frames já decodificados (sem esperar). Retorna quantos foram descartados."""
+        with self._cond:
+            k = min(int(n), len(self._ready))
+            for _ in range(k):
+                self._free.append(self._ready.popleft())
+            self.dropped += k
+            if k:
+                self._cond.notify_all()
+            return k
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "depth": len(self._ready),
+                "max_depth": self.max_depth,
+                "slots": len(self.buffers),
+                "decoded": self.decoded,
+                "dropped": self.dropped,
+                "decode_stall": self.decode_stall,
+                "render_stall": self.render_stall,
+            }
+
+# ---------- Processo de decodificação e renderização (anel em memória compartilhada) ----------
+# Cabeçalho int64 no início do bloco: controle (escrito pelo processo principal) e
+# estatísticas (escritas pelo worker). Cada processo só escreve os próprios campos.
+(_RP_STOP, _RP_GENERATION, _RP_TRUECOLOR, _RP_FPS_DIV, _RP_MIN_FRAME, _RP_DIRTY_TOP, _RP_CONSUMED,
+ _RP_PUBLISHED, _RP_DECODED, _RP_DROPPED, _RP_MAX_DEPTH, _RP_DECODE_STALL_NS) = range(12)
+_RP_HEADER = 16
+# Cabeçalho de cada slot: sequência, geração, frame de origem, bytes (ou marcador),
+# descartes por atraso antes dele, leitura do pipe (ns) e renderização (ns)
+_RP_SLOT_FIELDS = 7
+_RP_EOF = -1        # fim do stream da geração
+_RP_OVERFLOW = -2   # payload maior que o slot: vai pela fila de transbordo
+
+def _payload_budget(cols, rows, bitmap=None):
+    """Bytes por slot que cobrem um frame inteiro de cols x rows células.
+    ANSI: pior caso de duas cores truecolor + glifo + posicionamento por célula.
+    Saída gráfica: RGB da área em pixels mais a folga do base64; o Sixel raramente passa disso.
+    """
+    if bitmap is not None:
+        cw, ch = bitmap.cell_pixels
+        return cols * rows * cw * ch * 3 * 3 // 2 + 65536
+    return cols * rows * 64 + rows * 32 + 4096
+
+def _render_process_main(shm_name, slots, slot_size, free, ready, commands, overflow):
+    """Laço do worker de RenderProcess: a cada job ("open") inicia o ffmpeg, lê, estabiliza e
+    renderiza os frames e publica os bytes no anel, em ordem de sequência. Um job de geração
+    nova interrompe o stream atual; None encerra.
+    """
+    shm = _attach_shm(shm_name)
+    ctl = np.ndarray((_RP_HEADER,), dtype=np.int64, buffer=shm.buf)
+    heads = np.ndarray((slots, _RP_SLOT_FIELDS), dtype=np.int64, buffer=shm.buf, offset=_RP_HEADER * 8)
+    base = (_RP_HEADER + slots * _RP_SLOT_FIELDS) * 8
+    payload = [shm.buf[base + i * slot_size:base + (i + 1) * slot_size] for i in range(slots)]
+    seq = 0
+
+    def publish(gen, frame_no, data, late, read_ns, render_ns):
+        """Grava um slot; False se um job novo (ou stop) chegou enquanto esperava slot livre."""
+        nonlocal seq
+        t0 = time.perf_counter_ns()
+        while not free.acquire(timeout=0.05):
+            if ctl[_RP_STOP] or ctl[_RP_GENERATION] != gen:
+                ctl[_RP_DECODE_STALL_NS] += time.perf_counter_ns() - t0
+                return False
+        ctl[_RP_DECODE_STALL_NS] += time.perf_counter_ns() - t0
+        i = seq % slots
+        n = _RP_EOF if data is None else len(data)
+        if n > slot_size:
+            overflow.put(data)
+            n = _RP_OVERFLOW
+        elif n > 0:
+            payload[i][:n] = data
+        heads[i] = (seq, gen, frame_no, n, late, read_ns, render_ns)
+        seq += 1
+        ctl[_RP_PUBLISHED] = seq
+        ctl[_RP_MAX_DEPTH] = max(int(ctl[_RP_MAX_DEPTH]), seq - int(ctl[_RP_CONSUMED]))
+        ready.release()
+        return True
+
+    try:
+        job = commands.get()
+        while job is not None:
+            # Jobs enfileirados por seeks seguidos: só o mais recente importa
+            while job is not None and job["gen"] != ctl[_RP_GENERATION]:
+                job = commands.get()
+            if job is None:
+                break
+            gen = job["gen"]
+            w, h, mode = job["w"], job["h"], job["mode"]
+            bitmap = job["bitmap"]
+            cx, cy = bitmap.cell_pixels if bitmap is not None else RENDER_MODES[mode]
+            stab = ColorStabilizer(job["tolerance"], job["hysteresis"])
+            stab = stab if stab.enabled else None
+            proc = _build_ffmpeg_video_proc(job["path"], w, h, job["fps"], start=job["start"])
+            reader = FrameReader(proc.stdout, w, h) if proc is not None else None
+            frame_no = job["start_frame"]
+            prev_cells = None
+            truecolor = None
+            dirty_top = int(ctl[_RP_DIRTY_TOP])
+            late = 0
+            try:
+                while not ctl[_RP_STOP] and ctl[_RP_GENERATION] == gen:
+                    t0 = time.perf_counter_ns()
+                    try:
+                        rgb = reader.read() if reader is not None else None
+                    except Exception:
+                        rgb = None
+                    t1 = time.perf_counter_ns()
+                    if rgb is None:
+                        publish(gen, frame_no, None, late, 0, 0)
+                        break
+                    ctl[_RP_DECODED] += 1
+                    n = frame_no
+                    frame_no += 1
+                    if n < ctl[_RP_MIN_FRAME]:
+                        # Atrasado: descarta antes de renderizar (os deltas seguem o último frame publicado)
+                        ctl[_RP_DROPPED] += 1
+                        late += 1
+                        continue
+                    if n % max(1, int(ctl[_RP_FPS_DIV])):
+                        continue
+                    if stab is not None:
+                        rgb = stab.apply(rgb)
+                    if bitmap is not None:
+                        data = bitmap.frame(rgb, w // cx, h // cy, job["left_pad"], job["top_pad"])
+                    else:
+                        tc = bool(ctl[_RP_TRUECOLOR])
+                        if tc != truecolor:
+                            truecolor, prev_cells = tc, None
+                        # HUD desenhado sobre a 1ª linha: força reescrevê-la
+                        force = (0,) if ctl[_RP_DIRTY_TOP] != dirty_top else None
+                        dirty_top = int(ctl[_RP_DIRTY_TOP])
+                        cells = _frame_cells(rgb, w, h, truecolor, mode)
+                        data = _compose_damage(cells[0], cells[1], truecolor, prev_cells, job["left_pad"],
+                                               job["top_pad"], encoder=job["encoders"][truecolor], force_rows=force)
+                        if not isinstance(data, bytes):
+                            data = data.encode("utf-8")
+                        prev_cells = cells
+                    if not publish(gen, n, data, late, t1 - t0, time.perf_counter_ns() - t1):
+                        break
+                    late = 0
+            finally:
+                if proc is not None:
+                    try:
+                        proc.kill()
+                        proc.wait()
+                    except Exception:
+                        pass
+            job = commands.get() if not ctl[_RP_STOP] else None
+    finally:
+        for mv in payload:
+            mv.release()
+        payload = heads = ctl = None
+        shm.close()
 
-def _read_exact(proc, size):
-    buf = bytearray()
-    while len(buf) < size:
-        chunk = proc.stdout.read(size - len(buf))
-        if not chunk:
+class RenderProcess:
+    """Decodificação e renderização num processo separado.
+    O worker lê o rawvideo do ffmpeg, aplica o ColorStabilizer e renderiza (damage tracking ou
+    saída gráfica); os bytes prontos vão para um anel multiprocessing.shared_memory, cada slot
+    com número de sequência, geração (um open() por seek/geometria) e frame de origem.
+    O processo principal só agenda e escreve, então KeyInput e as threads de áudio não
+    disputam o GIL com a leitura do pipe e o renderer.
+    Deltas dependem do frame anterior: descartes por atraso e o divisor de FPS acontecem no
+    worker, antes de renderizar (drop_until e quality).
+    """
+    def __init__(self, slot_size, slots=FRAME_RING_SLOTS):
+        import multiprocessing
+        from multiprocessing import shared_memory
+        ctx = multiprocessing.get_context("spawn")
+        self.slots = max(2, int(slots))
+        self.slot_size = int(slot_size)
+        base = (_RP_HEADER + self.slots * _RP_SLOT_FIELDS) * 8
+        self.shm = shared_memory.SharedMemory(create=True, size=base + self.slots * self.slot_size)
+        self._ctl = np.ndarray((_RP_HEADER,), dtype=np.int64, buffer=self.shm.buf)
+        self._ctl[:] = 0
+        self._ctl[_RP_FPS_DIV] = 1
+        self._heads = np.ndarray((self.slots, _RP_SLOT_FIELDS), dtype=np.int64, buffer=self.shm.buf,
+                                 offset=_RP_HEADER * 8)
+        self._payload = [self.shm.buf[base + i * self.slot_size:base + (i + 1) * self.slot_size]
+                         for i in range(self.slots)]
+        self._free = ctx.Semaphore(self.slots)
+        self._ready = ctx.Semaphore(0)
+        self._commands = ctx.Queue()
+        self._overflow = ctx.Queue()
+        self._seq = 0
+        self._gen = 0
+        self.eof = False
+        self.render_stall = 0.0
+        self.overflows = 0
+        self._proc = ctx.Process(target=_render_process_main, daemon=True,
+                                 args=(self.shm.name, self.slots, self.slot_size, self._free, self._ready,
+                                       self._commands, self._overflow))
+        try:
+            self._proc.start()
+        except Exception:
+            self._release_shm()
+            raise
+
+    def open(self, path, w, h, fps, start, start_frame, truecolor, mode="half", left_pad=0, top_pad=0,
+             bitmap=None, tolerance=0, hysteresis=0):
+        """Troca o stream do worker (início, seek ou nova geometria). Frames da geração
+        anterior ainda no anel são descartados por get().
+        """
+        self._gen += 1
+        self.eof = False
+        self._ctl[_RP_TRUECOLOR] = int(bool(truecolor))
+        self._ctl[_RP_MIN_FRAME] = int(start_frame)
+        # A geração muda antes de o job ser enfileirado: o worker abandona o stream atual e,
+        # se chegar antes do job, só espera por ele na fila
+        self._ctl[_RP_GENERATION] = self._gen
+        self._commands.put({"gen": self._gen, "path": path, "w": w, "h": h, "fps": fps, "start": start,
+                            "start_frame": int(start_frame), "mode": mode, "left_pad": left_pad,
+                            "top_pad": top_pad, "bitmap": bitmap, "tolerance": tolerance,
+                            "hysteresis": hysteresis,
+                            # Escolhidos aqui: o worker (spawn) não refaz o micro-benchmark
+                            "encoders": {tc: _encoder(tc) for tc in (True, False)}})
+        return self
+
+    def wait_ready(self, timeout=3.0):
+        """Espera o primeiro frame da geração atual no anel (ou o fim do stream). False no timeout."""
+        deadline = time.perf_counter() + timeout
+        while self._ctl[_RP_PUBLISHED] <= self._seq:
+            if time.perf_counter() > deadline or not self._proc.is_alive():
+                return False
+            time.sleep(0.005)
+        return True
+
+    def quality(self, truecolor, fps_div):
+        """Degrau do governador: profundidade de cor e divisor de FPS aplicados no worker."""
+        self._ctl[_RP_TRUECOLOR] = int(bool(truecolor))
+        self._ctl[_RP_FPS_DIV] = max(1, int(fps_div))
+
+    def drop_until(self, frame_no):
+        """Pede ao worker que descarte, sem renderizar, os frames anteriores a frame_no."""
+        if frame_no > self._ctl[_RP_MIN_FRAME]:
+            self._ctl[_RP_MIN_FRAME] = int(frame_no)
+
+    def invalidate_top(self):
+        """A 1ª linha da tela foi sobrescrita (HUD): o worker a repinta no próximo frame."""
+        self._ctl[_RP_DIRTY_TOP] += 1
+
+    def get(self):
+        """Próximo frame da geração atual como (frame, bytes, descartes antes dele, leitura, render)
+        ou None no fim do stream (ou se o worker morreu).
+        """
+        if self.eof:
             return None
-        buf.extend(chunk)
-    return bytes(buf)
+        t0 = time.perf_counter()
+        try:
+            while True:
+                if not self._ready.acquire(timeout=0.1):
+                    if not self._proc.is_alive():
+                        self.eof = True
+                        return None
+                    continue
+                i = self._seq % self.slots
+                seq, gen, frame_no, n, late, read_ns, render_ns = self._heads[i].tolist()
+                if seq != self._seq:
+                    raise RuntimeError(f"anel de frames fora de sequência ({seq} != {self._seq})")
+                if n == _RP_OVERFLOW:
+                    data = self._overflow.get()
+                    self.overflows += 1
+                elif n == _RP_EOF:
+                    data = None
+                else:
+                    # n == 0 é um frame válido: nada mudou em relação ao anterior (delta vazio)
+                    data = bytes(self._payload[i][:n])
+                self._seq += 1
+                self._ctl[_RP_CONSUMED] = self._seq
+                self._free.release()
+                if gen != self._gen:
+                    continue
+                if data is None:
+                    self.eof = True
+                    return None
+                return frame_no, data, late, read_ns / 1e9, render_ns / 1e9
+        finally:
+            self.render_stall += time.perf_counter() - t0
+
+    def stats(self):
+        ctl = self._ctl
+        if ctl is None:
+            return dict(self._final)
+        return {
+            "depth": max(0, int(ctl[_RP_PUBLISHED]) - self._seq),
+            "max_depth": int(ctl[_RP_MAX_DEPTH]),
+            "slots": self.slots,
+            "decoded": int(ctl[_RP_DECODED]),
+            "dropped": int(ctl[_RP_DROPPED]),
+            "decode_stall": int(ctl[_RP_DECODE_STALL_NS]) / 1e9,
+            "render_stall": self.render_stall,
+            "overflows": self.overflows,
+        }
+
+    def _release_shm(self):
+        self._ctl = self._heads = None
+        for mv in self._payload:
+            mv.release()
+        self._payload = []
+        try:
+            self.shm.close()
+        except Exception:
+            pass
+        try:
+            self.shm.unlink()
+        except Exception:
+            pass
+
+    def close(self):
+        if self._ctl is None:
+            return
+        self._ctl[_RP_STOP] = 1
+        self._commands.put(None)
+        self._proc.join(timeout=1.0)
+        if self._proc.is_alive():
+            self._proc.terminate()
+            self._proc.join(timeout=1.0)
+        self._final = self.stats()
+        self._release_shm()
 
 def select_file_for_upload():
     try:
@@ -870,47 +3049,130 @@ def upload_file(file_path):
         print(f"Erro no upload: {e}")
         return None
 
-def display_image(image_path, cols, max_rows):
-    """Exibe imagem estática no terminal"""
+# ---------- Cache de imagens renderizadas ----------
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "img")
+_RTI_MAGIC = b"RTI1"
+
+def _image_cache_path(path, cols, max_rows, truecolor, mode, graphics, term_size):
+    """Arquivo do cache para a imagem e parâmetros de exibição. Tamanho/mtime da fonte entram
+    na chave, e também o tamanho do terminal: o padding de centralização vai embutido nos bytes.
+    """
     try:
-        img = Image.open(image_path)
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = json.dumps([os.path.abspath(path), st.st_size, st.st_mtime_ns, int(cols), int(max_rows or 0),
+                      bool(truecolor), mode, graphics, list(term_size)])
+    return os.path.join(IMAGE_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".rti")
 
-        # Redimensionar mantendo proporção
-        width = max(2, int(cols))
-        height = max(1, int((img.height * width) / img.width / 2))
-        if max_rows and max_rows > 0:
-            height = min(height, int(max_rows))
-        if (height*2) % 2 != 0:
-            height += 1
-        img = img.resize((width, height * 2), Image.Resampling.LANCZOS)
-        img = img.convert('RGB')
+def _load_image_frame(cache_path):
+    """Bytes prontos da imagem no cache ou None."""
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if data[:len(_RTI_MAGIC)] != _RTI_MAGIC:
+        return None
+    try:
+        # mtime como último uso: a evicção remove primeiro o que não é exibido há mais tempo
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return data[len(_RTI_MAGIC):]
+
+def _store_image_frame(cache_path, out, budget_mb):
+    try:
+        os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+        tmp = cache_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_RTI_MAGIC)
+            f.write(out)
+        os.replace(tmp, cache_path)
+    except OSError:
+        return
+    _evict_cache_dir(IMAGE_CACHE_DIR, ".rti", budget_mb, keep=cache_path)
+
+def _load_image(image_path, cols, max_rows, cx=1, cy=2):
+    """Abre a imagem e a redimensiona para cols x linhas células de cx x cy pixels, mantendo a
+    proporção. Retorna (array RGB, colunas, linhas).
+    JPEGs são decodificados já reduzidos (draft, escala DCT 1/2..1/8) e as demais imagens são
+    reduzidas por fator inteiro (reducing_gap) antes do LANCZOS, que só trabalha perto do tamanho final.
+    """
+    from PIL import Image
+    img = Image.open(image_path)
+
+    # Redimensionar mantendo proporção
+    width = max(2, int(cols))
+    height = max(1, int((img.height * width) / img.width / 2))
+    if max_rows and max_rows > 0:
+        height = min(height, int(max_rows))
+    if (height*2) % 2 != 0:
+        height += 1
+    size = (width * cx, height * cy)
+    img.draft("RGB", (size[0] * 2, size[1] * 2))
+    img = img.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    img = img.convert('RGB')
+    return np.array(img, dtype=np.uint8), width, height
+
+def _image_frame(image_path, cols, max_rows, render_mode, bitmap, truecolor, term_size):
+    """Bytes da imagem renderizada e centralizada no terminal (ANSI ou saída gráfica)."""
+    cx, cy = bitmap.cell_pixels if bitmap is not None else RENDER_MODES[render_mode]
+    arr, width, height = _load_image(image_path, cols, max_rows, cx, cy)
+
+    # Calcular padding para centralização e usar renderer unificado
+    term_cols, term_rows = term_size
+    left_pad = max(0, (term_cols - width)//2)
+    top_pad = max(0, (term_rows - height)//2)
+
+    if bitmap is not None:
+        return (bitmap.begin() + bitmap.frame(arr, width, height, left_pad, top_pad)
+                + bitmap.end(clear=False) + b"\x1b[%d;1H" % (top_pad + height + 1))
+    out, _ = _render_frame(arr, width * cx, height * cy, truecolor, prev_lines_cache=None,
+                           left_pad=left_pad, top_pad=top_pad, mode=render_mode)
+    return out if isinstance(out, bytes) else out.encode("utf-8")
+
+def display_image(image_path, cols, max_rows, wait=True, render_mode="half", graphics="ansi", cache_mb=64):
+    """Exibe imagem estática no terminal (wait=False não espera Enter). Retorna True se exibiu.
+    graphics ("auto", "kitty", "sixel") usa a saída gráfica do terminal no lugar dos blocos ANSI.
+    Os bytes renderizados ficam num cache em disco (cache_mb de orçamento, 0 = desligado):
+    reexibir a mesma imagem com os mesmos parâmetros não abre nem redimensiona o arquivo.
+    """
+    try:
+        render_mode = render_mode if render_mode in RENDER_MODES else "half"
+        bitmap = _graphics_backend(graphics) if graphics in GRAPHICS_BACKENDS else None
 
         # Detectar suporte a cores
         truecolor = _truecolor_supported()
-        
-        # Calcular padding para centralização e usar renderer unificado
+
         try:
             ts = shutil.get_terminal_size(fallback=(80, 24))
-            term_cols, term_rows = ts.columns, ts.lines
+            term_size = (ts.columns, ts.lines)
         except Exception:
-            term_cols, term_rows = 80, 24
-        left_pad = max(0, (term_cols - width)//2)
-        top_pad = max(0, (term_rows - height)//2)
+            term_size = (80, 24)
+
+        kind = "ansi" if bitmap is None else "%s:%dx%d" % ((bitmap.name,) + tuple(bitmap.cell_pixels))
+        cache_path = (_image_cache_path(image_path, cols, max_rows, truecolor, render_mode, kind, term_size)
+                      if cache_mb and cache_mb > 0 else None)
+        out = _load_image_frame(cache_path) if cache_path else None
+        if out is None:
+            out = _image_frame(image_path, cols, max_rows, render_mode, bitmap, truecolor, term_size)
+            if cache_path:
+                _store_image_frame(cache_path, out, cache_mb)
 
         _clear_screen()
         _hide_cursor()
-
-        arr = np.array(img, dtype=np.uint8)
-        out, _ = _render_frame(arr, width, height*2, truecolor, prev_lines_cache=None, left_pad=left_pad, top_pad=top_pad)
-        sys.stdout.write(out)
-        sys.stdout.flush()
+        FrameWriter().write(out)
         _show_cursor()
         print(f"\nImagem: {os.path.basename(image_path)}")
-        print("Pressione Enter para continuar...")
-        input()
-        
+        if wait:
+            print("Pressione Enter para continuar...")
+            input()
+        return True
+
     except Exception as e:
         print(f"Erro ao exibir imagem: {e}")
+        return False
 
 def _list_files(dir_path, exts):
     try:
@@ -949,7 +3211,14 @@ def settings_menu(settings):
         print(f"  FPS limite: {settings['fps_limit']}")
         print(f"  Áudio: {'Ativado' if settings['audio_enabled'] else 'Desativado'}")
         print(f"  Preset automático: {'Ativado' if settings.get('preset_auto') else 'Desativado'}")
-        print("\n1. Alterar colunas\n2. Alterar altura máxima (linhas)\n3. Alterar FPS limite\n4. Alternar áudio\n5. Alternar preset automático\n6. Voltar")
+        print(f"  Workers de renderização: {settings.get('render_workers', 0) or 'Desativado'}")
+        print(f"  Qualidade adaptativa: {'Ativado' if settings.get('adaptive_quality', True) else 'Desativado'}")
+        print(f"  Modo de renderização: {RENDER_MODE_NAMES.get(settings.get('render_mode'), RENDER_MODE_NAMES['half'])}")
+        print(f"  Saída gráfica: {GRAPHICS_NAMES.get(settings.get('graphics'), GRAPHICS_NAMES['ansi'])}")
+        print(f"  Tolerância / histerese de cor: {settings.get('color_tolerance', 0) or 'Desativado'}"
+              f" / {settings.get('color_hysteresis', 0) or 'Desativado'}")
+        print(f"  Processo de decodificação: {'Ativado' if settings.get('decode_process') else 'Desativado'}")
+        print("\n1. Alterar colunas\n2. Alterar altura máxima (linhas)\n3. Alterar FPS limite\n4. Alternar áudio\n5. Alternar preset automático\n6. Alterar workers de renderização\n7. Alternar qualidade adaptativa\n8. Alterar modo de renderização\n9. Alterar saída gráfica\n10. Alterar tolerância de cor\n11. Alternar processo de decodificação\n12. Voltar")
         ch = input(Fore.BLUE+"Escolha: "+Style.RESET_ALL).strip()
         if ch == '1':
             v = input(Fore.BLUE+"Novo valor de colunas (>=20): "+Style.RESET_ALL).strip()
@@ -982,6 +3251,48 @@ def settings_menu(settings):
             settings['preset_auto'] = not settings.get('preset_auto', False)
         
         elif ch == '6':
+            v = input(Fore.BLUE+"Processos de renderização (0 = desativado): "+Style.RESET_ALL).strip()
+            try:
+                iv = int(v)
+                settings['render_workers'] = max(0, min(iv, os.cpu_count() or 1))
+            except Exception:
+                print("Valor inválido.")
+
+        elif ch == '7':
+            settings['adaptive_quality'] = not settings.get('adaptive_quality', True)
+
+        elif ch == '8':
+            modes = list(RENDER_MODES)
+            for i, m in enumerate(modes, 1):
+                print(f"  {i}. {RENDER_MODE_NAMES[m]}")
+            v = input(Fore.BLUE+"Modo (quadrantes e Braille dão mais detalhe com as mesmas colunas): "+Style.RESET_ALL).strip()
+            try:
+                settings['render_mode'] = modes[int(v) - 1]
+            except Exception:
+                print("Valor inválido.")
+
+        elif ch == '9':
+            for i, g in enumerate(GRAPHICS_BACKENDS, 1):
+                print(f"  {i}. {GRAPHICS_NAMES[g]}")
+            v = input(Fore.BLUE+"Saída (Kitty/Sixel só em terminais com suporte; automático detecta): "+Style.RESET_ALL).strip()
+            try:
+                settings['graphics'] = GRAPHICS_BACKENDS[int(v) - 1]
+            except Exception:
+                print("Valor inválido.")
+
+        elif ch == '10':
+            v = input(Fore.BLUE+"Tolerância (níveis por canal, 0 = desativado): "+Style.RESET_ALL).strip()
+            v2 = input(Fore.BLUE+"Histerese (mantém a cor anterior abaixo desta diferença, 0 = desativado): "+Style.RESET_ALL).strip()
+            try:
+                settings['color_tolerance'] = max(0, min(int(v), 64))
+                settings['color_hysteresis'] = max(0, min(int(v2), 64))
+            except Exception:
+                print("Valor inválido.")
+
+        elif ch == '11':
+            settings['decode_process'] = not settings.get('decode_process', False)
+
+        elif ch == '12':
             save_settings(settings)
             return
         else:
@@ -1006,8 +3317,9 @@ def terminal_ui_loop():
         print("3. Exibir imagem de uploads/img")
         print("4. Configurações")
         print("5. Sobre")
-        print("6. Sair")
-        choice = input(Fore.BLUE+"\nEscolha uma opção (1-6): "+Style.RESET_ALL).strip()
+        print("6. Compilar vídeo (replay instantâneo)")
+        print("7. Sair")
+        choice = input(Fore.BLUE+"\nEscolha uma opção (1-7): "+Style.RESET_ALL).strip()
 
         if choice == '1':
             file_path = select_file_for_upload()
@@ -1033,12 +3345,21 @@ def terminal_ui_loop():
                                 cols, rows, fps = 80, 0, 30
                             else:
                                 cols, rows, fps = 120, 0, 30
-                    play_video_file(uploaded_path, cols, fps, settings['audio_enabled'], rows)
+                    play_video_file(uploaded_path, cols, fps, settings['audio_enabled'], rows,
+                                    render_workers=settings.get('render_workers', 0),
+                                av_tolerance=settings.get('av_sync_tolerance_ms', 80)/1000.0,
+                                adaptive_quality=settings.get('adaptive_quality', True),
+                                render_mode=settings.get('render_mode', 'half'),
+                                graphics=settings.get('graphics', 'ansi'),
+                                color_tolerance=settings.get('color_tolerance', 0),
+                                color_hysteresis=settings.get('color_hysteresis', 0),
+                                decode_process=settings.get('decode_process', False))
                 elif file_ext in ['.png', '.jpg', '.jpeg', '.webp']:
                     cols = settings['cols']
                     rows = settings['max_rows']
                     if settings.get('preset_auto'):
                         try:
+                            from PIL import Image
                             im = Image.open(uploaded_path)
                             w, h = im.size
                             im.close()
@@ -1048,7 +3369,8 @@ def terminal_ui_loop():
                                 cols, rows = 120, 0
                         except Exception:
                             pass
-                    display_image(uploaded_path, cols, rows)
+                    display_image(uploaded_path, cols, rows, render_mode=settings.get('render_mode', 'half'),
+                                  graphics=settings.get('graphics', 'ansi'), cache_mb=settings.get('image_cache_mb', 64))
                 else:
                     print("Tipo de arquivo não suportado.")
             finally:
@@ -1069,7 +3391,15 @@ def terminal_ui_loop():
                             cols, rows, fps = 80, 0, 30
                         else:
                             cols, rows, fps = 120, 0, 30
-                play_video_file(sel, cols, fps, settings['audio_enabled'], rows)
+                play_video_file(sel, cols, fps, settings['audio_enabled'], rows,
+                                render_workers=settings.get('render_workers', 0),
+                                av_tolerance=settings.get('av_sync_tolerance_ms', 80)/1000.0,
+                                adaptive_quality=settings.get('adaptive_quality', True),
+                                render_mode=settings.get('render_mode', 'half'),
+                                graphics=settings.get('graphics', 'ansi'),
+                                color_tolerance=settings.get('color_tolerance', 0),
+                                color_hysteresis=settings.get('color_hysteresis', 0),
+                                decode_process=settings.get('decode_process', False))
 
         elif choice == '3':
             sel = choose_from_directory(img_dir, {'.png', '.jpg', '.jpeg', '.webp'})
@@ -1078,6 +3408,7 @@ def terminal_ui_loop():
                 rows = settings['max_rows']
                 if settings.get('preset_auto'):
                     try:
+                        from PIL import Image
                         im = Image.open(sel)
                         w, h = im.size
                         im.close()
@@ -1087,7 +3418,8 @@ def terminal_ui_loop():
                             cols, rows = 120, 0
                     except Exception:
                         pass
-                display_image(sel, cols, rows)
+                display_image(sel, cols, rows, render_mode=settings.get('render_mode', 'half'),
+                              graphics=settings.get('graphics', 'ansi'), cache_mb=settings.get('image_cache_mb', 64))
 
         elif choice == '4':
             settings_menu(settings)
@@ -1097,18 +3429,49 @@ def terminal_ui_loop():
             time.sleep(10)
 
         elif choice == '6':
+            sel = choose_from_directory(video_dir, {'.mp4'})
+            if sel:
+                cols = settings['cols']
+                fps = settings['fps_limit']
+                rows = settings['max_rows']
+                if settings.get('preset_auto'):
+                    info = _ffprobe_info(sel)
+                    if info:
+                        if info['height'] > info['width']:
+                            cols, rows, fps = 80, 0, 30
+                        else:
+                            cols, rows, fps = 120, 0, 30
+                compile_video(sel, cols, fps, rows, budget_mb=settings.get('ansi_cache_mb', 512),
+                              render_mode=settings.get('render_mode', 'half'))
+                input("Pressione Enter para continuar...")
+
+        elif choice == '7':
             print(Fore.YELLOW+"Saindo..."+Style.RESET_ALL)
             break
         else:
             print("Opção inválida.")
 
-def play_video_file(path, cols, fps_limit, audio_enabled, max_rows):
-    """Reproduz um arquivo de vídeo com fallback robusto de resolução."""
-    npath = _normalize_path(path)
-    if not _find_ffmpeg():
-        sys.stderr.write(Fore.RED+"ffmpeg não encontrado para reproduzir vídeo. Instale ou coloque o binário ao lado do script.\n"+Style.RESET_ALL)
-        return
+def _terminal_size():
+    """(colunas, linhas) do terminal."""
+    try:
+        ts = shutil.get_terminal_size(fallback=(80, 24))
+        return ts.columns, ts.lines
+    except Exception:
+        return 80, 24
 
+def _video_geometry(npath, cols, max_rows, mode="half", cell_px=None, fit=False):
+    """Dimensões escaladas do vídeo e padding de centralização no terminal.
+    Com fit=True (redimensionamento durante a reprodução) o vídeo é limitado ao tamanho atual
+    do terminal (colunas e linhas), para não quebrar linhas; sem ele a geometria depende só de
+    cols/max_rows e as chaves do cache compilado não mudam com o terminal.
+    Retorna (info, w, h, left_pad, top_pad); w x h em pixels do modo de renderização
+    (RENDER_MODES) ou de cell_px (pixels por célula das saídas gráficas), isto é, o tamanho
+    pedido ao scaler do ffmpeg.
+    """
+    term_cols, term_rows = _terminal_size()
+    if fit:
+        cols = max(2, min(int(cols), term_cols))
+        max_rows = min(int(max_rows), term_rows) if max_rows and max_rows > 0 else term_rows
     info = _ffprobe_info(npath)
     dims = _probe_scaled_dimensions(npath, cols) if not info else None
     if dims:
@@ -1122,16 +3485,312 @@ def play_video_file(path, cols, fps_limit, audio_enabled, max_rows):
     # Limitar altura por linhas de terminal
     w, h = _cap_dimensions_by_rows(w, h, max_rows)
 
-    truecolor = _truecolor_supported()
-
     # Calcular padding para centralização
-    try:
-        ts = shutil.get_terminal_size(fallback=(80, 24))
-        term_cols, term_rows = ts.columns, ts.lines
-    except Exception:
-        term_cols, term_rows = 80, 24
     left_pad = max(0, (term_cols - w)//2)
     top_pad = max(0, (term_rows - (h//2))//2)
+    cx, cy = cell_px or RENDER_MODES[mode]
+    return info, w*cx, (h//2)*cy, left_pad, top_pad
+
+def _effective_fps(info, fps_limit):
+    """FPS alvo considerando o FPS da fonte para evitar duplicação lenta."""
+    src_fps = (info.get("fps", 0.0) if info else 0.0)
+    try:
+        sfps = int(round(src_fps))
+    except Exception:
+        sfps = 0
+    if sfps > 0:
+        return min(max(1, int(fps_limit)), sfps)
+    return max(1, int(fps_limit))
+
+# ---------- Cache ANSI pré-renderizado (compilação de vídeos) ----------
+ANSI_CACHE_DIR = os.path.join(CACHE_DIR, "ansi")
+_RTV_MAGIC = b"RTV1"
+# magic, largura, altura, frames, intervalo de keyframes, fps, offset do índice
+_RTV_HEADER = struct.Struct("<4sIIIIdQ")
+
+def _ansi_cache_path(npath, w, h, fps, truecolor, mode="half"):
+    """Arquivo do cache para o vídeo e parâmetros de renderização (inclui tamanho/mtime da fonte).
+    Só a geometria do vídeo entra na chave: o padding de centralização depende do terminal e é
+    aplicado na saída (_offset_payload).
+    """
+    try:
+        st = os.stat(npath)
+    except OSError:
+        return None
+    params = [os.path.abspath(npath), st.st_size, st.st_mtime_ns, w, h, int(fps), bool(truecolor)]
+    if mode != "half":
+        params.append(mode)
+    key = json.dumps(params)
+    return os.path.join(ANSI_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".rtv")
+
+# Posicionamentos de cursor emitidos por _compose_frame/_compose_damage sem padding
+_CURSOR_MOVES = re.compile(rb"\x1b\[(\d+);(\d+)H|\x1b\[(\d+)G|\x1b\[H|\n")
+
+def _offset_payload(data, left_pad, top_pad):
+    """Desloca um payload do cache (compilado sem padding) para a centralização atual: CUP e
+    CHA absolutos dos deltas e o início de cada linha dos keyframes.
+    """
+    left_pad, top_pad = max(0, int(left_pad)), max(0, int(top_pad))
+    if not left_pad and not top_pad:
+        return data
+    col = b"\x1b[%dG" % (left_pad + 1)
+    home = b"\x1b[%d;%dH" % (top_pad + 1, left_pad + 1)
+
+    def move(m):
+        if m.group(1):
+            return b"\x1b[%d;%dH" % (int(m.group(1)) + top_pad, int(m.group(2)) + left_pad)
+        if m.group(3):
+            return b"\x1b[%dG" % (int(m.group(3)) + left_pad)
+        return b"\n" + col if m.group(0) == b"\n" else home
+    return _CURSOR_MOVES.sub(move, data)
+
+class AnsiCacheWriter:
+    """Grava o container: cabeçalho, payloads ANSI comprimidos (zlib) e índice no final."""
+    def __init__(self, path, w, h, fps, keyint):
+        self.path = path
+        self.tmp = path + ".tmp"
+        self.w, self.h, self.fps, self.keyint = w, h, fps, keyint
+        self.index = []
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.f = open(self.tmp, "wb")
+        self.f.write(b"\0" * _RTV_HEADER.size)
+
+    def add(self, payload, keyframe):
+        data = zlib.compress(payload, 6)
+        self.index.append((self.f.tell(), len(data), 1 if keyframe else 0))
+        self.f.write(data)
+
+    def close(self):
+        index_offset = self.f.tell()
+        # Alinhado a 8 bytes para o índice ser lido direto do mmap como uint64
+        pad = (-index_offset) % 8
+        self.f.write(b"\0" * pad)
+        index_offset += pad
+        self.f.write(np.array(self.index, dtype=np.uint64).reshape(-1, 3).tobytes())
+        self.f.seek(0)
+        self.f.write(_RTV_HEADER.pack(_RTV_MAGIC, self.w, self.h, len(self.index), self.keyint,
+                                      float(self.fps), index_offset))
+        self.f.close()
+        os.replace(self.tmp, self.path)
+
+    def abort(self):
+        try:
+            self.f.close()
+            os.remove(self.tmp)
+        except Exception:
+            pass
+
+class AnsiCacheReader:
+    """Leitura do container via mmap: o índice é uma view uint64 sobre o arquivo mapeado."""
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.w, self.h, self.frames, self.keyint, self.fps, off = _RTV_HEADER.unpack_from(self._mm, 0)
+            if magic != _RTV_MAGIC:
+                raise ValueError("cache ANSI inválido")
+            self.index = np.frombuffer(self._mm, dtype=np.uint64, count=self.frames*3, offset=off).reshape(-1, 3)
+            self.keyframes = np.flatnonzero(self.index[:, 2])
+        except Exception:
+            self._f.close()
+            raise
+
+    @classmethod
+    def open(cls, path):
+        if not path or not os.path.isfile(path):
+            return None
+        try:
+            reader = cls(path)
+        except Exception:
+            return None
+        try:
+            # Marca como usado recentemente (política LRU do cache)
+            os.utime(path)
+        except OSError:
+            pass
+        return reader
+
+    def payload(self, i):
+        off, length = int(self.index[i, 0]), int(self.index[i, 1])
+        return zlib.decompress(self._mm[off:off+length])
+
+    def replay(self, i):
+        """Payloads do keyframe anterior até o frame i (exclusive): numa tela limpa deixa o
+        frame i-1 desenhado, base do delta do frame i.
+        """
+        i = min(int(i), self.frames)
+        kf = self.keyframe_in(0, i)
+        return b"".join(self.payload(j) for j in range(kf or 0, i))
+
+    def keyframe_in(self, lo, hi):
+        """Maior keyframe em [lo, hi], ou None."""
+        j = np.searchsorted(self.keyframes, hi, side="right") - 1
+        if j >= 0 and self.keyframes[j] >= lo:
+            return int(self.keyframes[j])
+        return None
+
+    def close(self):
+        self.index = None
+        self.keyframes = None
+        try:
+            self._mm.close()
+        finally:
+            self._f.close()
+
+def compile_video(path, cols, fps_limit, max_rows, budget_mb=512, render_mode="half"):
+    """Renderiza o vídeo uma vez para o cache ANSI (frames delta + keyframes a cada ~2 s).
+    Depois disso play_video_file com os mesmos parâmetros toca direto do cache.
+    Retorna o caminho do cache ou None.
+    """
+    npath = _normalize_path(path)
+    if not _find_ffmpeg():
+        sys.stderr.write(Fore.RED+"ffmpeg não encontrado para compilar vídeo.\n"+Style.RESET_ALL)
+        return None
+    info, w, h, _, _ = _video_geometry(npath, cols, max_rows, render_mode)
+    truecolor = _truecolor_supported()
+    fps = _effective_fps(info, fps_limit)
+    out_path = _ansi_cache_path(npath, w, h, fps, truecolor, render_mode)
+    if out_path is None:
+        return None
+    if os.path.isfile(out_path):
+        print("Vídeo já compilado para estas configurações.")
+        return out_path
+    proc = _build_ffmpeg_video_proc(npath, w, h, fps)
+    if proc is None:
+        return None
+    total = int((info or {}).get("duration", 0) * fps)
+    keyint = max(1, int(fps*2))
+    writer = AnsiCacheWriter(out_path, w, h, fps, keyint)
+    reader = FrameReader(proc.stdout, w, h)
+    prev = None
+    n = 0
+    try:
+        while True:
+            rgb = reader.read()
+            if rgb is None:
+                break
+            cells = _frame_cells(rgb, w, h, truecolor, render_mode)
+            key = n % keyint == 0
+            # Sem padding: a centralização é aplicada na reprodução (_offset_payload)
+            out = _compose_damage(cells[0], cells[1], truecolor, None if key else prev)
+            writer.add(out if isinstance(out, bytes) else out.encode("utf-8"), key)
+            prev = cells
+            n += 1
+            if n % 30 == 0:
+                pct = f"{min(100, 100*n//total)}%" if total else f"{n} frames"
+                sys.stdout.write(f"\rCompilando: {pct}")
+                sys.stdout.flush()
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        try:
+            proc.kill()
+        except Exception:
+            pass
+    if n == 0:
+        writer.abort()
+        sys.stderr.write(Fore.RED+"Falha ao decodificar vídeo para compilação.\n"+Style.RESET_ALL)
+        return None
+    writer.close()
+    _evict_cache_dir(ANSI_CACHE_DIR, ".rtv", budget_mb, keep=out_path)
+    sys.stdout.write(f"\rCompilado: {n} frames ({os.path.getsize(out_path)/1e6:.1f} MB)\n")
+    return out_path
+
+class ResizeWatcher:
+    """Detecta mudanças no tamanho do terminal: SIGWINCH onde existe (POSIX, thread principal),
+    senão consulta periódica. Rajadas de eventos (arrastar a janela) são agrupadas: poll() só
+    retorna True depois de debounce segundos sem novos eventos e se o tamanho mudou de fato.
+    """
+    def __init__(self, debounce=0.15, poll_interval=0.5):
+        self.size = _terminal_size()
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._flag = False
+        self._pending_since = None
+        self._last_poll = time.perf_counter()
+        self._use_signal = False
+        self._prev_handler = None
+        if hasattr(signal, "SIGWINCH") and threading.current_thread() is threading.main_thread():
+            try:
+                self._prev_handler = signal.signal(signal.SIGWINCH, self._on_signal)
+                self._use_signal = True
+            except (ValueError, OSError):
+                self._use_signal = False
+
+    def _on_signal(self, signum, frame):
+        self._flag = True
+
+    def poll(self):
+        now = time.perf_counter()
+        if self._use_signal:
+            if self._flag:
+                self._flag = False
+                self._pending_since = now
+        elif now - self._last_poll >= self.poll_interval:
+            self._last_poll = now
+            if self._pending_since is None and _terminal_size() != self.size:
+                self._pending_since = now
+        if self._pending_since is None or now - self._pending_since < self.debounce:
+            return False
+        self._pending_since = None
+        size = _terminal_size()
+        if size == self.size:
+            return False
+        self.size = size
+        return True
+
+    def close(self):
+        if self._use_signal:
+            try:
+                signal.signal(signal.SIGWINCH, self._prev_handler or signal.SIG_DFL)
+            except (ValueError, OSError):
+                pass
+            self._use_signal = False
+
+def play_video_file(path, cols, fps_limit, audio_enabled, max_rows, render_workers=0,
+                    av_tolerance=AV_SYNC_TOLERANCE, use_cache=True, adaptive_quality=True, trace_path=None,
+                    render_mode="half", graphics="ansi", color_tolerance=0, color_hysteresis=0,
+                    decode_process=False):
+    """Reproduz um arquivo de vídeo com fallback robusto de resolução.
+    adaptive_quality liga o QualityGovernor (colunas, profundidade de cor e FPS ajustados
+    para manter o prazo de cada frame). Cada frame exibido é medido num FrameTrace: a tecla I
+    mostra o HUD e trace_path (.csv ou .json) grava o trace ao sair.
+    Se existir um cache ANSI compilado (compile_video) para os mesmos parâmetros, toca a partir dele.
+    render_workers > 0 codifica os frames em faixas num pool de processos (ParallelRenderer).
+    render_mode escolhe o glifo por célula: "half" (▄), "quadrant" (2x2) ou "braille" (2x4).
+    graphics ("auto", "kitty", "sixel") troca o renderer ANSI por uma saída gráfica do terminal;
+    os frames vão inteiros, sem cache ANSI nem workers.
+    color_tolerance/color_hysteresis (0 = desligado) ligam o ColorStabilizer antes do renderer.
+    decode_process leva leitura do pipe, estabilização e renderização para um RenderProcess;
+    este processo só agenda e escreve os bytes (render_workers é ignorado).
+    O vídeo segue o relógio do áudio, descartando ou segurando frames para manter o
+    desvio dentro de av_tolerance (segundos).
+    """
+    npath = _normalize_path(path)
+    if not _find_ffmpeg():
+        sys.stderr.write(Fore.RED+"ffmpeg não encontrado para reproduzir vídeo. Instale ou coloque o binário ao lado do script.\n"+Style.RESET_ALL)
+        return
+
+    render_mode = render_mode if render_mode in RENDER_MODES else "half"
+    # Detecção antes do KeyInput: a resposta do terminal chega pelo stdin
+    bitmap = _graphics_backend(graphics) if graphics in GRAPHICS_BACKENDS else None
+    cell_px = bitmap.cell_pixels if bitmap is not None else None
+    cx, cy = cell_px or RENDER_MODES[render_mode]
+    if bitmap is not None:
+        use_cache = False
+        render_workers = 0
+    if decode_process:
+        render_workers = 0
+    info, w, h, left_pad, top_pad = _video_geometry(npath, cols, max_rows, render_mode, cell_px)
+    truecolor = _truecolor_supported()
+    fps_limit = _effective_fps(info, fps_limit)
+    if bitmap is None:
+        # Backend de cada modo de cor resolvido antes de tocar (o governador pode trocar de modo):
+        # o micro-benchmark, quando não está em cache, não cai no primeiro frame
+        for tc in (True, False):
+            _encoder(tc)
 
     signal.signal(signal.SIGINT, lambda s, f: (_show_cursor(), sys.exit(0)))
     atexit.register(_show_cursor)
@@ -1141,33 +3800,47 @@ def play_video_file(path, cols, fps_limit, audio_enabled, max_rows):
 
     ki = KeyInput()
 
+    # Vídeo já compilado para estes parâmetros: toca direto do cache ANSI
+    cache = AnsiCacheReader.open(_ansi_cache_path(npath, w, h, fps_limit, truecolor, render_mode)) if use_cache else None
+    worker = None
+    if decode_process and cache is None:
+        try:
+            tcols, trows = _terminal_size()
+            worker = RenderProcess(_payload_budget(max(tcols, w // cx), max(trows, h // cy), bitmap))
+            worker.open(npath, w, h, fps_limit, 0.0, 0, truecolor, render_mode, left_pad, top_pad,
+                        bitmap, color_tolerance, color_hysteresis)
+            # Subir o processo leva algumas centenas de ms: o áudio e o relógio só partem com o 1º frame pronto
+            worker.wait_ready()
+        except Exception as e:
+            print(f"[AVISO] Processo de decodificação desativado: {e}")
+            if worker is not None:
+                worker.close()
+            worker = None
+
     audio_tmp_dir = None
+    audio_wav = None
     audio = None
+    if info is not None and not info.get("has_audio", True):
+        audio_enabled = False
     if audio_enabled:
         try:
-            wav, audio_tmp_dir = _convert_audio_to_wav(npath)
-            audio = AudioPlayer(wav)
+            if AudioPlayer.supports_pcm():
+                # Streaming direto do ffmpeg: a reprodução começa sem converter o arquivo inteiro
+                audio = AudioPlayer(pcm=PcmStream.open(npath))
+            else:
+                # winsound/pygame exigem arquivo: WAV temporário como fallback
+                audio_wav, audio_tmp_dir = _convert_audio_to_wav(npath)
+                audio = AudioPlayer(audio_wav)
             audio.start()
         except Exception as e:
             print(f"[AVISO] Áudio desativado: {e}")
             audio = None
 
     prev_lines = None
-    # Ajustar FPS alvo considerando FPS da fonte para evitar duplicação lenta
-    src_fps = (info.get("fps", 0.0) if info else 0.0)
-    try:
-        sfps = int(round(src_fps))
-    except Exception:
-        sfps = 0
-    if sfps > 0:
-        fps_limit = min(max(1, int(fps_limit)), sfps)
-    else:
-        fps_limit = max(1, int(fps_limit))
-    base_frame_time = 1.0 / fps_limit
-    next_frame_time = time.perf_counter()
+    prev_cells = None
 
-    proc = _build_ffmpeg_video_proc(npath, w, h, fps_limit)
-    if proc is None:
+    proc = _build_ffmpeg_video_proc(npath, w, h, fps_limit) if cache is None and worker is None else None
+    if proc is None and cache is None and worker is None:
         sys.stderr.write(Fore.RED+"Não foi possível iniciar decodificação de vídeo (ffmpeg).\n"+Style.RESET_ALL)
         ki.stop()
         if audio:
@@ -1180,59 +3853,331 @@ def play_video_file(path, cols, fps_limit, audio_enabled, max_rows):
                 pass
         return
 
-    frame_bytes = w * h * 3
+    renderer = None
+    if render_workers and render_workers > 0 and cache is None:
+        try:
+            renderer = ParallelRenderer(w, h, truecolor, render_workers, render_mode)
+        except Exception as e:
+            print(f"[AVISO] Renderização paralela desativada: {e}")
+            renderer = None
+
+    ring = FrameRing(proc, w, h).start() if proc is not None else None
+    clock = MediaClock(audio)
+    sched = VideoScheduler(clock, fps_limit, av_tolerance)
+    duration = (info.get("duration", 0.0) if info else 0.0)
+    if cache is None:
+        # Índice de keyframes montado em segundo plano para o primeiro seek já ser rápido
+        threading.Thread(target=_keyframe_index, args=(npath,), daemon=True).start()
+    gov = QualityGovernor(1.0 / fps_limit, truecolor, enabled=adaptive_quality and cache is None)
+    writer = FrameWriter()
+    if bitmap is not None:
+        writer.write(bitmap.begin())
+    stab = ColorStabilizer(color_tolerance, color_hysteresis)
+    stab = stab if stab.enabled and worker is None else None
+    # Com dump pedido o anel guarda a sessão inteira (até ~36 min a 30 fps); senão só o HUD
+    trace = FrameTrace(65536 if trace_path else 1024)
+    slept = 0.0
+    skipped = 0
+    resize = ResizeWatcher()
+    resizes = 0
+    need_geometry = False
+    cur_scale = gov.state[0]
+    overlay_shown = False
+    force_top = False
+    retired = []
+    seek_t0 = None
+    seek_lat = []
     frame_index = 0
+    paused = False
     try:
         while True:
             if ki.quit:
                 break
+            req = ki.take_seek()
+            if req is not None and (duration > 0 or req[0] == "rel"):
+                seek_t0 = time.perf_counter()
+                cur = sched.frame_no * sched.frame_dt
+                t = cur + req[1] if req[0] == "rel" else duration * req[1] / 100.0
+                if cache is not None:
+                    kf = cache.keyframe_in(0, min(cache.frames - 1, int(round(max(0.0, t) * fps_limit))))
+                    start_frame = kf or 0
+                    t = start_frame / float(fps_limit)
+                else:
+                    # Só consulta o índice já pronto: não bloqueia o seek esperando o ffprobe
+                    with _MEDIA_CACHE_LOCK:
+                        e = _media_entry(npath)
+                        kfs = e.get("keyframes") if e is not None else None
+                    t = _seek_target(kfs, t, duration, cur)
+                    start_frame = int(round(t * fps_limit))
+                if worker is not None:
+                    worker.open(npath, w, h, fps_limit, t, start_frame, truecolor, render_mode, left_pad, top_pad,
+                                bitmap, color_tolerance, color_hysteresis)
+                elif cache is None:
+                    retired.append(ring.stats())
+                    proc, ring = _restart_video(ring, proc, npath, w, h, fps_limit, t)
+                    if proc is None:
+                        break
+                if audio is not None:
+                    was_pcm = audio.pcm is not None
+                    audio.stop()
+                    try:
+                        if was_pcm:
+                            audio = AudioPlayer(pcm=PcmStream.open(npath, t))
+                        else:
+                            audio = AudioPlayer(_trim_wav(audio_wav, t, os.path.join(audio_tmp_dir, f"seek{len(seek_lat)}.wav")))
+                        audio.start()
+                        if paused:
+                            audio.pause()
+                    except Exception:
+                        audio = None
+                clock.seek(t, audio)
+                sched.seek(start_frame)
+                if stab is not None:
+                    stab.reset()
+                prev_cells = None
+                prev_lines = None
             if ki.pause:
-                if audio:
-                    audio.pause()
+                if not paused:
+                    paused = True
+                    clock.pause()
+                    if audio and not audio.paused:
+                        audio.pause()
                 time.sleep(0.02)
-                # Resetar agendamento para evitar acúmulo de atraso
-                next_frame_time = time.perf_counter()
                 continue
-            else:
+            elif paused:
+                paused = False
                 if audio and audio._paused:
                     audio.resume()
+                clock.resume()
+            if ki.speed != clock.speed:
+                clock.set_speed(ki.speed)
 
-            target_dt = base_frame_time / ki.speed
-            now = time.perf_counter()
-            if now < next_frame_time:
-                time.sleep(max(0, next_frame_time - now))
-                now = time.perf_counter()
+            if resize.poll():
+                resizes += 1
+                need_geometry = True
+            if need_geometry:
+                # Terminal redimensionado ou degrau de colunas do governador: recalcula a geometria,
+                # reinicia o scaler do ffmpeg na posição atual se o tamanho mudou e repinta a tela.
+                # O áudio segue tocando.
+                need_geometry = False
+                old = (w, h)
+                _, nw, nh, left_pad, top_pad = _video_geometry(npath, max(20, int(cols * gov.state[0])), max_rows,
+                                                               render_mode, cell_px, fit=True)
+                pos = sched.frame_no * sched.frame_dt
+                if worker is not None:
+                    # A tela é limpa abaixo: o worker recomeça na posição atual com um frame completo
+                    w, h = nw, nh
+                    worker.open(npath, w, h, fps_limit, pos, sched.frame_no, truecolor, render_mode, left_pad,
+                                top_pad, bitmap, color_tolerance, color_hysteresis)
+                elif cache is not None and (nw, nh) != old:
+                    # Deltas do cache têm o tamanho antigo embutido: segue decodificando ao vivo
+                    cache.close()
+                    cache = None
+                    w, h = nw, nh
+                    proc = _build_ffmpeg_video_proc(npath, w, h, fps_limit, start=pos)
+                    if proc is None:
+                        break
+                    ring = FrameRing(proc, w, h).start()
+                elif cache is None and (nw, nh) != (w, h):
+                    w, h = nw, nh
+                    retired.append(ring.stats())
+                    proc, ring = _restart_video(ring, proc, npath, w, h, fps_limit, pos)
+                    if proc is None:
+                        break
+                    if renderer is not None:
+                        renderer.close()
+                        try:
+                            renderer = ParallelRenderer(w, h, truecolor, render_workers, render_mode)
+                        except Exception:
+                            renderer = None
+                writer.write(b"\x1b[0m\x1b[2J")
+                if cache is not None:
+                    # Mesma geometria: o cache segue valendo, basta redesenhar a base do próximo delta
+                    writer.write(_offset_payload(cache.replay(sched.frame_no), left_pad, top_pad))
+                prev_cells = None
+                prev_lines = None
+                overlay_shown = False
+
+            if ring is not None and sched.frame_no % gov.fps_div:
+                # FPS reduzido pelo governador: consome o frame sem exibir
+                item = ring.get()
+                if item is None:
+                    break
+                ring.release(item[0])
+                sched.seek(sched.frame_no + 1)
+                skipped += 1
+                continue
+
+            wait, drop = sched.plan()
+            if wait > 0:
+                # Vídeo adiantado em relação ao relógio mestre: segurar o frame
+                t0 = time.perf_counter()
+                time.sleep(min(wait, 0.05))
+                slept += time.perf_counter() - t0
+                continue
+            if cache is not None:
+                if drop > 0:
+                    # Deltas não podem ser pulados: salta para o keyframe mais distante ao alcance
+                    kf = cache.keyframe_in(sched.frame_no + 1, sched.frame_no + drop)
+                    if kf is not None:
+                        skipped += kf - sched.frame_no
+                        sched.skip(kf - sched.frame_no)
+                if sched.frame_no >= cache.frames:
+                    break
+                t0 = time.perf_counter()
+                data = _offset_payload(cache.payload(sched.frame_no), left_pad, top_pad)
+                t1 = time.perf_counter()
+                if (ki.overlay or overlay_shown) and top_pad > 0:
+                    # Os deltas do cache supõem a tela intacta: o HUD só cabe no padding superior
+                    data += (("\x1b[1;1H\x1b[0m" + trace.hud(w // cx, h // cy, gov, fps_limit).ljust(72)) if ki.overlay
+                             else "\x1b[1;1H\x1b[0m\x1b[2K").encode("utf-8")
+                    overlay_shown = ki.overlay
+                writer.write(data)
+                t2 = time.perf_counter()
+                frame_no = sched.frame_no
+                sched.present()
+                frame_index += 1
+                trace.record(frame_no, 0.0, 0.0, 0.0, t1 - t0, t2 - t1, slept, skipped,
+                             len(data), sched.last_drift, gov.level)
+                slept, skipped = 0.0, 0
+                if seek_t0 is not None:
+                    seek_lat.append(time.perf_counter() - seek_t0)
+                    seek_t0 = None
+                continue
+            if worker is not None:
+                if drop > 0:
+                    # Os deltas do anel dependem do frame anterior: o worker descarta antes de renderizar
+                    worker.drop_until(sched.frame_no + drop)
+                t0 = time.perf_counter()
+                item = worker.get()
+                if item is None:
+                    break
+                frame, data, late, read_time, t_render = item
+                t1 = t_cells = time.perf_counter()
+                if frame > sched.frame_no:
+                    # Frames descartados pelo worker (atraso) ou pulados pelo divisor de FPS
+                    skipped += frame - sched.frame_no
+                    sched.skip(min(late, frame - sched.frame_no))
+                    sched.seek(frame)
+                    wait = sched.plan()[0]
+                    if wait > 0:
+                        time.sleep(min(wait, 0.25))
+                        slept += time.perf_counter() - t1
+                        t1 = t_cells = time.perf_counter()
+                # No trace o render do worker aparece na coluna de renderização
+                t_cells -= t_render
             else:
-                behind = now - next_frame_time
-                if behind > target_dt:
-                    # Pular frames para alcançar o tempo alvo
-                    skip_n = int(behind / target_dt)
-                    if skip_n > 0:
-                        skip_n = min(skip_n, 5)
-                        for _ in range(skip_n):
-                            raw_skip = _read_exact(proc, frame_bytes)
-                            if raw_skip is None:
-                                skip_n = 0
-                                break
-                        next_frame_time += target_dt * skip_n
-
-            raw = _read_exact(proc, frame_bytes)
-            if raw is None:
-                break
-            next_frame_time += target_dt
-            arr = np.frombuffer(raw, dtype=np.uint8)
-            arr = arr.reshape((h, w, 3))
-            rgb = arr
-            out, lines = _render_frame(rgb, w, h, truecolor, prev_lines, left_pad=left_pad, top_pad=top_pad)
-            sys.stdout.write(out)
-            sys.stdout.flush()
-            prev_lines = lines
+                if drop > 0:
+                    # Atrasado além da tolerância: descarta slots já decodificados
+                    n = ring.drop(drop)
+                    sched.skip(n)
+                    skipped += n
+
+                t0 = time.perf_counter()
+                item = ring.get()
+                if item is None:
+                    break
+                slot, rgb = item
+                t1 = time.perf_counter()
+                t_cells = t1
+                read_time = ring.read_times[slot]
+                try:
+                    if stab is not None:
+                        rgb = stab.apply(rgb)
+                    if bitmap is not None:
+                        out = bitmap.frame(rgb, w // cx, h // cy, left_pad, top_pad)
+                    elif renderer is not None:
+                        out, prev_lines = renderer.render(rgb, prev_lines, left_pad=left_pad, top_pad=top_pad)
+                    else:
+                        cells = _frame_cells(rgb, w, h, truecolor, render_mode)
+                        t_cells = time.perf_counter()
+                        out = _compose_damage(cells[0], cells[1], truecolor, prev_cells, left_pad, top_pad,
+                                              force_rows=(0,) if force_top else None)
+                        prev_cells = cells
+                        force_top = False
+                finally:
+                    ring.release(slot)
+                data = out if isinstance(out, bytes) else out.encode("utf-8")
+            if ki.overlay or overlay_shown:
+                if ki.overlay:
+                    data += ("\x1b[1;1H\x1b[0m" + trace.hud(w // cx, h // cy, gov, fps_limit).ljust(72)).encode("utf-8")
+                else:
+                    data += b"\x1b[1;1H\x1b[0m\x1b[2K"
+                overlay_shown = ki.overlay
+                if top_pad == 0:
+                    # A linha de status cobre a 1ª linha do vídeo: força reescrevê-la no próximo frame
+                    if prev_lines is not None:
+                        prev_lines[0] = None
+                    force_top = True
+                    if worker is not None:
+                        worker.invalidate_top()
+            t2 = time.perf_counter()
+            writer.write(data)
+            t3 = time.perf_counter()
+            frame_no = sched.frame_no
+            sched.present()
             frame_index += 1
+            trace.record(frame_no, read_time, t1 - t0, max(0.0, t_cells - t1), t2 - t_cells, t3 - t2, slept, skipped,
+                         len(data), sched.last_drift, gov.level)
+            slept, skipped = 0.0, 0
+            if gov.record(t1 - t0, t2 - t1, t3 - t2, len(data), late=drop > 0, speed=clock.speed):
+                scale, tc, _ = gov.state
+                if tc != truecolor:
+                    truecolor = tc
+                    prev_cells = None
+                    prev_lines = None
+                    if renderer is not None:
+                        renderer.truecolor = tc
+                if worker is not None:
+                    worker.quality(truecolor, gov.fps_div)
+                if scale != cur_scale:
+                    cur_scale = scale
+                    need_geometry = True
+            if seek_t0 is not None:
+                # Latência do seek: do pedido até o primeiro frame exibido na nova posição
+                seek_lat.append(time.perf_counter() - seek_t0)
+                seek_t0 = None
     finally:
+        resize.close()
+        if bitmap is not None:
+            writer.write(bitmap.end())
+        if cache is not None:
+            cache.close()
+        elif ring is not None:
+            ring.stop()
+            try:
+                proc.kill()
+            except Exception:
+                pass
+        if renderer is not None:
+            renderer.close()
+        if worker is not None:
+            worker.close()
+    if ring is not None:
+        stats = ring.stats()
+    else:
+        stats = worker.stats() if worker is not None else {"ansi_cache": True}
+    for r in retired:
+        for k in ("decoded", "dropped", "decode_stall", "render_stall"):
+            stats[k] += r[k]
+        stats["max_depth"] = max(stats["max_depth"], r["max_depth"])
+    stats.update(sched.stats())
+    stats.update(writer.stats())
+    if trace_path:
         try:
-            proc.kill()
-        except Exception:
-            pass
+            trace.dump(trace_path)
+            stats["trace"] = trace_path
+        except OSError as e:
+            print(f"[AVISO] Falha ao gravar o trace: {e}")
+    stats["quality_level"] = gov.level
+    stats["quality_changes"] = gov.changes
+    stats["resizes"] = resizes
+    stats["graphics"] = bitmap.name if bitmap is not None else "ansi"
+    stats["decode_process"] = worker is not None
+    stats["seeks"] = len(seek_lat)
+    stats["seek_latency_max"] = max(seek_lat) if seek_lat else 0.0
+    stats["seek_latency_mean"] = sum(seek_lat) / len(seek_lat) if seek_lat else 0.0
+    stats["frames"] = frame_index
 
     # Se nenhum quadro foi renderizado e não há áudio, informe falha mais clara
     if frame_index == 0 and audio is None:
@@ -1247,25 +4192,199 @@ def play_video_file(path, cols, fps_limit, audio_enabled, max_rows):
             shutil.rmtree(audio_tmp_dir)
         except Exception:
             pass
+    return stats
+
+def bench_video(path, cols, fps_limit, max_rows=0, frames=0, truecolor=None, render_mode="half",
+                color_tolerance=0, color_hysteresis=0):
+    """Decodifica e renderiza o vídeo o mais rápido possível, escrevendo em /dev/null.
+    Retorna um dicionário com tempos médios por etapa (ms), bytes por frame e fps.
+    """
+    npath = _normalize_path(path)
+    if not _find_ffmpeg():
+        raise RuntimeError("ffmpeg não encontrado")
+    info, w, h, left_pad, top_pad = _video_geometry(npath, cols, max_rows, render_mode)
+    fps = _effective_fps(info, fps_limit)
+    if truecolor is None:
+        truecolor = _truecolor_supported()
+    try:
+        proc = _build_ffmpeg_video_proc(npath, w, h, fps)
+    except OSError as e:
+        raise RuntimeError(f"falha ao iniciar o ffmpeg: {e}")
+    if proc is None:
+        raise RuntimeError("falha ao iniciar o ffmpeg")
+    reader = FrameReader(proc.stdout, w, h)
+    stab = ColorStabilizer(color_tolerance, color_hysteresis)
+    fd = os.open(os.devnull, os.O_WRONLY)
+    writer = FrameWriter(fd)
+    t_dec = t_ren = t_wr = 0.0
+    n = 0
+    prev = None
+    start = time.perf_counter()
+    try:
+        while not frames or n < frames:
+            t0 = time.perf_counter()
+            rgb = reader.read()
+            if rgb is None:
+                break
+            t1 = time.perf_counter()
+            if stab.enabled:
+                rgb = stab.apply(rgb)
+            out, prev = _render_frame_damage(rgb, w, h, truecolor, prev, left_pad=left_pad, top_pad=top_pad, mode=render_mode)
+            t2 = time.perf_counter()
+            writer.write(out)
+            t3 = time.perf_counter()
+            t_dec += t1 - t0
+            t_ren += t2 - t1
+            t_wr += t3 - t2
+            n += 1
+    finally:
+        os.close(fd)
+        try:
+            proc.kill()
+        except Exception:
+            pass
+    total = time.perf_counter() - start
+    per = lambda t: (t / n * 1000.0) if n else 0.0
+    return {
+        "file": npath, "width": w // RENDER_MODES[render_mode][0], "rows": h // RENDER_MODES[render_mode][1],
+        "mode": render_mode, "fps_target": fps,
+        "color_tolerance": stab.tolerance, "color_hysteresis": stab.hysteresis,
+        "truecolor": bool(truecolor), "encoder": _encoder(truecolor), "frames": n,
+        "decode_ms": per(t_dec), "render_ms": per(t_ren), "write_ms": per(t_wr),
+        "bytes_per_frame": writer.bytes_written / n if n else 0.0,
+        "render_fps": n / t_ren if t_ren else 0.0,
+        "total_fps": n / total if total else 0.0,
+    }
+
+def _build_cli():
+    import argparse
+    ap = argparse.ArgumentParser(prog="reprodT", description="Player de vídeo e imagens no terminal (ANSI). "
+                                 "Sem argumentos abre o menu interativo.")
+    sub = ap.add_subparsers(dest="command")
+
+    p = sub.add_parser("play", help="reproduz um vídeo")
+    p.add_argument("file")
+    p.add_argument("--cols", type=int, help="colunas (padrão: settings.json)")
+    p.add_argument("--fps", type=int, help="FPS limite")
+    p.add_argument("--rows", type=int, help="altura máxima em linhas (0 = ilimitado)")
+    p.add_argument("--no-audio", action="store_true", help="sem áudio")
+    p.add_argument("--workers", type=int, help="processos de renderização (0 = desativado)")
+    p.add_argument("--no-cache", action="store_true", help="ignora o cache ANSI compilado")
+    p.add_argument("--no-adaptive", action="store_true", help="desliga a qualidade adaptativa")
+    p.add_argument("--stats", action="store_true", help="imprime as estatísticas (JSON) no stderr ao final")
+    p.add_argument("--trace", metavar="ARQUIVO", help="grava o trace por frame ao sair (.csv ou .json)")
+    p.add_argument("--mode", choices=tuple(RENDER_MODES), help="glifo por célula (padrão: settings.json)")
+    p.add_argument("--graphics", choices=GRAPHICS_BACKENDS, help="saída: blocos ANSI, Kitty ou Sixel (padrão: settings.json)")
+    p.add_argument("--tolerance", type=int, help="quantização de cor em níveis por canal (0 = desligada)")
+    p.add_argument("--hysteresis", type=int, help="mantém a cor do frame anterior abaixo desta diferença (0 = desligada)")
+    p.add_argument("--decode-process", action=argparse.BooleanOptionalAction,
+                   help="decodifica e renderiza num processo separado (anel em memória compartilhada;"
+                        " padrão: settings.json)")
+
+    p = sub.add_parser("show", help="exibe uma imagem")
+    p.add_argument("file")
+    p.add_argument("--cols", type=int)
+    p.add_argument("--rows", type=int)
+    p.add_argument("--wait", action="store_true", help="espera Enter antes de sair")
+    p.add_argument("--mode", choices=tuple(RENDER_MODES))
+    p.add_argument("--graphics", choices=GRAPHICS_BACKENDS)
+    p.add_argument("--no-cache", action="store_true", help="ignora o cache de imagens renderizadas")
+
+    p = sub.add_parser("bench", help="decodifica e renderiza sem exibir; imprime tempos em JSON")
+    p.add_argument("file")
+    p.add_argument("--cols", type=int)
+    p.add_argument("--fps", type=int)
+    p.add_argument("--rows", type=int)
+    p.add_argument("--frames", type=int, default=0, help="limite de frames (0 = vídeo inteiro)")
+    p.add_argument("--color", choices=("auto", "truecolor", "256"), default="auto")
+    p.add_argument("--mode", choices=tuple(RENDER_MODES))
+    p.add_argument("--tolerance", type=int, default=0)
+    p.add_argument("--hysteresis", type=int, default=0)
+
+    p = sub.add_parser("probe", help="metadados do vídeo (ffprobe, com cache) em JSON")
+    p.add_argument("file")
+    p.add_argument("--cols", type=int, help="inclui as dimensões escaladas para estas colunas")
+    p.add_argument("--keyframes", action="store_true", help="inclui o índice de keyframes")
+    return ap
+
+def _run_cli(args):
+    settings = load_settings()
+    pick = lambda v, key: settings[key] if v is None else v
+    if args.command == "probe":
+        npath = _normalize_path(args.file)
+        info = _ffprobe_info(npath)
+        if info is None:
+            sys.stderr.write("Falha ao ler metadados (ffprobe ausente ou arquivo inválido).\n")
+            return 1
+        if args.cols:
+            info["scaled"] = list(_video_geometry(npath, args.cols, 0)[1:3])
+        if args.keyframes:
+            info["keyframes"] = _keyframe_index(npath) or []
+        print(json.dumps(info, indent=2))
+        return 0
+    if args.command == "bench":
+        truecolor = {"auto": None, "truecolor": True, "256": False}[args.color]
+        try:
+            res = bench_video(args.file, pick(args.cols, "cols"), pick(args.fps, "fps_limit"),
+                              pick(args.rows, "max_rows"), args.frames, truecolor, pick(args.mode, "render_mode"),
+                              args.tolerance, args.hysteresis)
+        except RuntimeError as e:
+            sys.stderr.write(f"{e}\n")
+            return 1
+        print(json.dumps(res, indent=2))
+        return 0 if res["frames"] else 1
+    _enable_windows_ansi()
+    if args.command == "show":
+        ok = display_image(args.file, pick(args.cols, "cols"), pick(args.rows, "max_rows"), wait=args.wait,
+                           render_mode=pick(args.mode, "render_mode"), graphics=pick(args.graphics, "graphics"),
+                           cache_mb=0 if args.no_cache else settings.get("image_cache_mb", 64))
+        return 0 if ok else 1
+    if args.command == "play":
+        stats = play_video_file(args.file, pick(args.cols, "cols"), pick(args.fps, "fps_limit"),
+                                settings["audio_enabled"] and not args.no_audio, pick(args.rows, "max_rows"),
+                                render_workers=pick(args.workers, "render_workers"),
+                                av_tolerance=settings.get("av_sync_tolerance_ms", 80)/1000.0,
+                                use_cache=not args.no_cache,
+                                adaptive_quality=settings.get("adaptive_quality", True) and not args.no_adaptive,
+                                trace_path=args.trace, render_mode=pick(args.mode, "render_mode"),
+                                graphics=pick(args.graphics, "graphics"),
+                                color_tolerance=pick(args.tolerance, "color_tolerance"),
+                                color_hysteresis=pick(args.hysteresis, "color_hysteresis"),
+                                decode_process=pick(args.decode_process, "decode_process"))
+        if args.stats and stats:
+            sys.stderr.write(json.dumps(stats, indent=2) + "\n")
+        return 0 if stats and stats.get("frames") else 1
+    return 2
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return _run_cli(_build_cli().parse_args(argv))
     _enable_windows_ansi()
+    # Escolhe o backend de codificação dos frames (micro-benchmark, importa numpy) em segundo
+    # plano enquanto o menu espera a escolha do usuário
+    threading.Thread(target=_encoder, daemon=True).start()
     _clear_screen()
     if not _find_ffmpeg():
         sys.stderr.write(Fore.YELLOW+"ffmpeg não encontrado. Instale e/ou adicione ao PATH, ou coloque o binário em ./bin/ffmpeg(.exe) ao lado do script.\n"+Style.RESET_ALL)
         sys.stderr.write(Fore.YELLOW+"Abra o programa mesmo assim para imagens estáticas e configuração.\n"+Style.RESET_ALL)
     terminal_ui_loop()
-    return
+    return 0
 
 ABOUT_TEXT = (
     "Resumo: cada par de pixels verticais é mapeado para o caractere '▄',\n"
-    "usando a cor inferior como fundo e a superior como frente.\n"
+    "usando a cor inferior como fundo e a superior como frente. Nos modos\n"
+    "quadrantes (2x2) e Braille (2x4) cada célula recebe o glifo e as duas cores\n"
+    "que melhor aproximam seus pixels, com mais detalhe nas mesmas colunas.\n"
     "As cores são emitidas como ANSI truecolor (24-bit) quando suportado,\n"
     "do contrário aproximadas para a paleta ANSI 256. O vídeo é decodificado\n"
-    "via ffmpeg em rawvideo (pipe), o áudio é convertido para WAV e tocado\n"
-    "com simpleaudio. A renderização minimiza códigos de escape reutilizando\n"
-    "cores consecutivas e cacheando linhas idênticas.\n"
+    "via ffmpeg em rawvideo (pipe) e o áudio chega em PCM por outro pipe\n"
+    "(WAV temporário só para winsound/pygame). A renderização minimiza códigos de escape reutilizando\n"
+    "cores consecutivas e reescrevendo só os trechos de células que mudaram.\n"
 )
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Necessário para o pool de renderização em executáveis PyInstaller (Windows)
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
\ No newline at end of file